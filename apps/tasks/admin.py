@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Task
+from .models import Task, TaskArchive
+from .search import get_search_backend
 
 
 class TaskAdmin(admin.ModelAdmin):
@@ -17,7 +18,44 @@ class TaskAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("status", "priority", "due_date")
+    # Searched through the full-text index, see get_search_results().
     search_fields = ("title", "description")
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        backend = get_search_backend(queryset.db)
+        return backend.filter(queryset, search_term), False
+
 
 admin.site.register(Task, TaskAdmin)
+
+
+class TaskArchiveAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the archived tasks.
+    """
+
+    list_display = (
+        "title",
+        "status",
+        "priority",
+        "due_date",
+        "created_at",
+        "archived_at",
+    )
+    list_filter = ("priority", "due_date")
+    search_fields = ("=id",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        # The task counters include the archived tasks.
+        return False
+
+
+admin.site.register(TaskArchive, TaskArchiveAdmin)
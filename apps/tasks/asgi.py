@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve, set_urlconf
+
+from .events import TaskEventStreamResponse, task_event_hub
+from .renderers import EventStreamRenderer
+
+_executor = None
+# The receive channel of the request being handled.
+_receive = contextvars.ContextVar("receive")
+
+
+def get_executor():
+    """
+    The thread pool handling the requests of ``executor_views``. Its size,
+    TASKS_ASYNC_WORKERS, also caps the database connections they use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TASKS_ASYNC_WORKERS, thread_name_prefix="tasks-async"
+        )
+    return _executor
+
+
+def run_request(handler, request):
+    """
+    Handle a request with the synchronous ``handler``, as a request of its
+    own as far as database connections are concerned.
+    """
+    close_old_connections()
+    try:
+        return handler.get_response(request)
+    finally:
+        close_old_connections()
+
+
+# URL names whose requests are handled on the executor under ASGI.
+executor_views = {
+    "tasks:task_list_create_api_view",
+    "tasks:task_detail_api_view",
+    "tasks:task_events_api_view",
+}
+
+
+class TaskASGIHandler(ASGIHandler):
+    """
+    ASGI handler running the task list, detail and event stream requests on
+    a bounded executor.
+
+    Django runs synchronous views under ASGI one at a time on a single
+    thread, and wraps every synchronous middleware in a thread hop of its
+    own. Requests for ``executor_views`` are instead handled exactly as
+    under WSGI, settings.MIDDLEWARE included, on one of the
+    TASKS_ASYNC_WORKERS threads, in a single hop. Every other request is
+    handled as usual.
+
+    The views themselves, authentication included, stay synchronous: DRF
+    has no async APIView and the ORM of Django 3.2 is synchronous, so async
+    views would only move the same work onto the same pool.
+
+    The task event stream is kept open here: its events are sent from the
+    TaskEventHub as they happen, with a heartbeat comment every
+    TASKS_EVENTS_HEARTBEAT seconds of silence, until the client disconnects.
+    """
+
+    async def __call__(self, scope, receive, send):
+        _receive.set(receive)
+        await super().__call__(scope, receive, send)
+
+    def load_middleware(self, is_async=False):
+        super().load_middleware(is_async)
+        if is_async:
+            # The settings.MIDDLEWARE chain, built for synchronous calls.
+            self._sync_handler = BaseHandler()
+            self._sync_handler.load_middleware()
+
+    async def get_response_async(self, request):
+        set_urlconf(settings.ROOT_URLCONF)
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            match = None
+        if match is None or match.view_name not in executor_views:
+            return await super().get_response_async(request)
+
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the request's context, for its context variables.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            get_executor(),
+            functools.partial(context.run, run_request, self._sync_handler, request),
+        )
+
+    async def send_response(self, response, send):
+        if isinstance(response, TaskEventStreamResponse):
+            await self.send_events(response, send, _receive.get())
+        else:
+            await super().send_response(response, send)
+
+    async def send_events(self, response, send, receive):
+        headers = [
+            (header.encode("ascii"), value.encode("latin1"))
+            for header, value in response.items()
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+
+        subscriber = task_event_hub.subscribe(response.subscription)
+
+        async def wait_for_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            subscriber.close()
+
+        disconnect = asyncio.ensure_future(wait_for_disconnect())
+        try:
+            messages = response.subscription.get_messages()
+            messages.extend(await subscriber.replay())
+            message = b"".join(messages)
+            while message is not None:
+                await send(
+                    {"type": "http.response.body", "body": message, "more_body": True}
+                )
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.get(), settings.TASKS_EVENTS_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    message = EventStreamRenderer.render_comment()
+            await send({"type": "http.response.body"})
+        finally:
+            task_event_hub.unsubscribe(subscriber)
+            disconnect.cancel()
+            await sync_to_async(response.close, thread_sensitive=True)()
@@ -0,0 +1,101 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .metrics import CACHE_REQUESTS
+from .timing import timed
+
+
+class UserCache:
+    """
+    Small in-process TTL/LRU cache of users by id.
+
+    Entries expire after TASKS_AUTH_CACHE_TTL seconds and the least recently
+    used ones are dropped past TASKS_AUTH_CACHE_SIZE. User writes in this
+    process invalidate the user at once; other processes see them when their
+    entry expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._users.pop(user_id, None)
+                self.misses += 1
+                entry = None
+            else:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+        CACHE_REQUESTS.inc(cache="auth", result="miss" if entry is None else "hit")
+        if entry is None:
+            return None
+        # A copy, so a request changing its user never affects another one.
+        return copy.copy(entry[1])
+
+    def set(self, user_id, user):
+        expires = time.monotonic() + settings.TASKS_AUTH_CACHE_TTL
+        with self._lock:
+            self._users[user_id] = (expires, copy.copy(user))
+            self._users.move_to_end(user_id)
+            while len(self._users) > settings.TASKS_AUTH_CACHE_SIZE:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+def get_token_user_id(user):
+    """
+    The user id as stored in the claims of the tokens issued for ``user``.
+    """
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    return user_id if isinstance(user_id, int) else str(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication resolving the token's user through ``user_cache``.
+
+    The token signature and claims are verified on every request; only the
+    user lookup is cached. With TASKS_AUTH_TRUST_TOKEN_CLAIMS the user is
+    built from the token claims alone and the database is never queried, so
+    a deactivated or deleted user keeps access until the token expires.
+    """
+
+    @timed("auth")
+    def authenticate(self, request):
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if settings.TASKS_AUTH_TRUST_TOKEN_CLAIMS:
+            return JWTStatelessUserAuthentication.get_user(self, validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            # Raises for unknown and inactive users, which are not cached.
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return user
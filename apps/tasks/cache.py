@@ -0,0 +1,81 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import CACHE_REQUESTS
+
+
+class TaskResponseCache:
+    """
+    Read-through cache for task API responses.
+
+    Keys embed a generation number that every task write bumps, so a write
+    invalidates all cached responses at once without tracking them. Stale
+    entries are never read again and simply expire.
+    """
+
+    generation_key = "tasks:generation"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[settings.TASKS_CACHE_ALIAS]
+
+    def get_generation(self):
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            # Start from the clock so an evicted counter never goes back to a
+            # generation whose entries may still be cached.
+            self.cache.add(self.generation_key, time.time_ns(), timeout=None)
+            generation = self.cache.get(self.generation_key)
+        return generation
+
+    def bump_generation(self):
+        try:
+            self.cache.incr(self.generation_key)
+        except ValueError:
+            self.cache.add(self.generation_key, time.time_ns(), timeout=None)
+
+    def make_key(self, request, kind):
+        """
+        Build the key of a response from the request's host, path and
+        (order-insensitive) query parameters.
+        """
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        digest = hashlib.sha1(
+            repr((request.get_host(), request.path, params)).encode()
+        ).hexdigest()
+        return f"tasks:{self.get_generation()}:{kind}:{digest}"
+
+    def get(self, key):
+        data = self.cache.get(key)
+        self._count(hit=data is not None)
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=settings.TASKS_CACHE_TIMEOUT)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit):
+        CACHE_REQUESTS.inc(cache="response", result="hit" if hit else "miss")
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+task_cache = TaskResponseCache()
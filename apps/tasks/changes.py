@@ -0,0 +1,111 @@
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+# Rows per statement when recording removals.
+TOMBSTONE_BATCH_SIZE = 500
+
+
+def next_change_seq(using):
+    """
+    Hand out the change sequence number of a write, shared by all the rows
+    it changes. Must be called inside the write's transaction.
+
+    The sequence row stays locked until that transaction ends, so writes
+    commit in sequence order: once a reader has seen number N, no row
+    numbered N or below can still be committed after it.
+    """
+    from .models import TaskChangeSequence
+
+    sequence = TaskChangeSequence._base_manager.using(using).filter(pk=1)
+    if not sequence.update(last=models.F("last") + 1):
+        try:
+            with transaction.atomic(using=using):
+                sequence.create(pk=1, last=1)
+        except IntegrityError:
+            # Created concurrently since the update above.
+            sequence.update(last=models.F("last") + 1)
+    return sequence.values_list("last", flat=True).get()
+
+
+def lock_task_writes(using):
+    """
+    Take the lock every task write starts with (see next_change_seq()) for
+    the rest of the current transaction, before reading the rows it is
+    about to write.
+
+    A transaction that reads first holds a shared lock on SQLite: two of
+    them then both fail with "database is locked" when writing, as neither
+    can upgrade its lock while the other holds one. Locking first makes
+    them wait for each other instead.
+    """
+    from .models import TaskChangeSequence
+
+    TaskChangeSequence._base_manager.using(using).filter(pk=1).update(
+        last=models.F("last")
+    )
+
+
+def get_change_sequence(using=None):
+    """
+    Return the last change sequence number handed out and the highest one
+    of the purged tombstones: the changes since an older number can no
+    longer be listed.
+    """
+    from .models import TaskChangeSequence
+
+    sequence = TaskChangeSequence.objects.using(using).values_list("last", "purged")
+    return sequence.first() or (0, 0)
+
+
+def add_tombstones(pks, change_seq, using, archived=False):
+    """
+    Record the removal of the tasks ``pks`` from the Task table, deleted or
+    ``archived``, at ``change_seq``.
+
+    A tombstone is kept per task id, as only the last removal of an id
+    matters: ids can come back on SQLite, whose AUTOINCREMENT counter
+    restarts from the highest id left when a migration rebuilds the table.
+    """
+    from .models import TaskTombstone
+
+    tombstones = TaskTombstone._base_manager.using(using)
+    values = {
+        "change_seq": change_seq,
+        "archived": archived,
+        "removed_at": timezone.now(),
+    }
+    for start in range(0, len(pks), TOMBSTONE_BATCH_SIZE):
+        batch = pks[start : start + TOMBSTONE_BATCH_SIZE]
+        existing = tombstones.filter(pk__in=batch)
+        if existing.update(**values):
+            existing = set(existing.values_list("pk", flat=True))
+            batch = [pk for pk in batch if pk not in existing]
+        tombstones.bulk_create(TaskTombstone(id=pk, **values) for pk in batch)
+
+
+def purge_tombstones(before, using=None, dry_run=False):
+    """
+    Delete the tombstones of the tasks removed before ``before`` and raise
+    the purged change sequence number to the highest one deleted.
+
+    Returns the number of tombstones that were (or, with ``dry_run``, would
+    be) deleted.
+    """
+    from .models import TaskChangeSequence, TaskTombstone
+
+    using = using or TaskTombstone.objects.db
+    with transaction.atomic(using=using):
+        # Taking the sequence lock keeps new removals out until the end.
+        next_change_seq(using)
+        tombstones = TaskTombstone._base_manager.using(using).filter(
+            removed_at__lt=before
+        )
+        purged = tombstones.aggregate(
+            n=models.Count("pk"), change_seq=models.Max("change_seq")
+        )
+        if purged["n"] and not dry_run:
+            tombstones._raw_delete(using)
+            TaskChangeSequence._base_manager.using(using).filter(
+                pk=1, purged__lt=purged["change_seq"]
+            ).update(purged=purged["change_seq"])
+    return purged["n"]
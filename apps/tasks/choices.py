@@ -1,21 +1,38 @@
 from django.db import models
 
 
-class StatusChoices(models.TextChoices):
+class LabeledChoices(models.IntegerChoices):
+    """
+    Integer choices exposed by their labels: the database stores the small
+    integer, the API and the admin show the label.
+    """
+
+    @classmethod
+    def from_label(cls, label):
+        """
+        Return the member labelled ``label``, or None.
+        """
+        for member in cls:
+            if member.label == label:
+                return member
+        return None
+
+
+class StatusChoices(LabeledChoices):
     """
     Choices for status field
     """
 
-    NEW = "new", "new"
-    IN_PROGRESS = "in progress", "in progress"
-    COMPLETED = "completed", "completed"
+    NEW = 1, "new"
+    IN_PROGRESS = 2, "in progress"
+    COMPLETED = 3, "completed"
 
 
-class PriorityChoices(models.TextChoices):
+class PriorityChoices(LabeledChoices):
     """
-    Choices for priority field
+    Choices for priority field, numbered so that higher is more urgent.
     """
 
-    LOW = "low", "low"
-    MEDIUM = "medium", "medium"
-    HIGH = "high", "high"
+    LOW = 1, "low"
+    MEDIUM = 2, "medium"
+    HIGH = 3, "high"
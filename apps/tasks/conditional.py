@@ -0,0 +1,82 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def get_task_version(task):
+    """
+    Row version of a task: its ``updated_at`` in microseconds.
+    """
+    return round(task.updated_at.timestamp() * 1_000_000)
+
+
+def get_task_etag(task):
+    """
+    Strong ETag of a single task, built from its primary key and row version.
+    """
+    return f'"{task.pk}.{get_task_version(task)}"'
+
+
+def get_task_last_modified(task):
+    return int(task.updated_at.timestamp())
+
+
+def get_page_etag(tasks, *extra):
+    """
+    ETag of a page of tasks, built from the ids and row versions of its rows
+    plus ``extra`` values that shape the page (e.g. whether there is a next
+    page), so it can be computed before anything is serialized. Rows may be
+    model instances or named ``values_list()`` rows.
+    """
+    digest = hashlib.sha1(repr(extra).encode())
+    for task in tasks:
+        digest.update(f"{task.id}.{get_task_version(task)},".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def get_variant_etag(etag, variant):
+    """
+    ETag of another representation of the content tagged by ``etag``.
+    """
+    return f'{etag[:-1]}-{variant}"'
+
+
+def get_validator_headers(etag, last_modified=None):
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def has_preconditions(request):
+    """
+    Whether the request is conditional, i.e. sends any of the headers
+    ``evaluate_preconditions()`` evaluates.
+    """
+    return any(
+        header in request.META
+        for header in (
+            "HTTP_IF_MATCH",
+            "HTTP_IF_NONE_MATCH",
+            "HTTP_IF_MODIFIED_SINCE",
+            "HTTP_IF_UNMODIFIED_SINCE",
+        )
+    )
+
+
+def evaluate_preconditions(request, etag, last_modified=None):
+    """
+    Evaluate the If-Match, If-None-Match, If-Modified-Since and
+    If-Unmodified-Since request headers against the validators.
+
+    Returns a 304 (safe methods) or 412 response when a precondition
+    decides the outcome, or None when the request should be processed.
+    """
+    # The 304 response copies its ETag/Last-Modified headers from here.
+    validators = HttpResponse(headers=get_validator_headers(etag, last_modified))
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    return None if response is validators else response
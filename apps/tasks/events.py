@@ -0,0 +1,388 @@
+import asyncio
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+
+from .changes import get_change_sequence
+from .filters import TaskFilter
+from .models import Task, TaskTombstone
+from .pagination import Cursor, CursorExpired, TaskChangesPagination
+from .renderers import EventStreamRenderer
+from .serializers import FastTaskSerializer
+
+logger = logging.getLogger(__name__)
+
+# Reconnection delay sent to the clients, in milliseconds.
+RETRY_MS = 5000
+# Id of the positions at the end of a change sequence number: the position
+# (N, MAX_ID) is after every change numbered N.
+MAX_ID = 2**63 - 1
+
+# A change rendered for the subscribers: ``message`` for those whose filters
+# it matches, ``filtered`` for the others. ``status`` and ``priority`` are
+# None for removals, which are sent to every subscriber.
+TaskEvent = namedtuple(
+    "TaskEvent", ["position", "status", "priority", "message", "filtered"]
+)
+
+# Queue markers: the subscriber fell behind, or is gone.
+RESYNC = object()
+CLOSED = None
+
+
+def encode_position(position):
+    """
+    The event id of a change feed position: a change feed cursor, so a
+    client can switch between the event stream and ``/changes/``.
+    """
+    return TaskChangesPagination().encode_token(Cursor(position, False))
+
+
+def render_resync(since, id=None):
+    """
+    Render the event telling a client it missed events: it should catch up
+    with the change feed from ``since``, or reload everything if it is None.
+    """
+    since = None if since is None else encode_position(since)
+    return EventStreamRenderer.render_event("resync", {"since": since}, id=id)
+
+
+def read_events(position, limit):
+    """
+    Read the first ``limit`` changes after ``position``, in change sequence
+    order, and render them as TaskEvents.
+
+    Unlike the change feed pages, the events are sent in order, so a task
+    written again after its removal needs no special case.
+    """
+    paginator = TaskChangesPagination()
+    # Bound both queries (see TaskChangesPagination).
+    paginator.last, _ = get_change_sequence(Task.objects.db)
+    serializer = FastTaskSerializer()
+    rows = paginator.fetch(
+        [
+            serializer.get_queryset(Task.objects.all(), "change_seq"),
+            TaskTombstone.objects.values_list(
+                "id", "change_seq", "archived", named=True
+            ),
+        ],
+        position,
+        limit,
+    )
+    render_event = EventStreamRenderer.render_event
+    events = []
+    for row in rows:
+        position = paginator.get_position(row)
+        id = encode_position(position)
+        if "archived" in row._fields:
+            reason = "archived" if row.archived else "deleted"
+            message = render_event("delete", {"id": row.id, "reason": reason}, id)
+            events.append(TaskEvent(position, None, None, message, message))
+            continue
+        (item,) = serializer.iter_representation([row])
+        events.append(
+            TaskEvent(
+                position,
+                row.status,
+                row.priority,
+                render_event("task", item, id),
+                render_event("delete", {"id": row.id, "reason": "filtered"}, id),
+            )
+        )
+    return events
+
+
+async def run_blocking(func, *args):
+    """
+    Run ``func`` on the executor of the task requests, as a request of its own
+    as far as database connections are concerned.
+    """
+    from .asgi import get_executor
+
+    def run():
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), run)
+
+
+class TaskEventSubscription:
+    """
+    What a client of the task event stream listens to: the tasks matching
+    the filters, from a position of the change feed.
+    """
+
+    def __init__(self, position, statuses=None, priority=None, resync=False):
+        self.position = position
+        self.statuses = statuses
+        self.priority = priority
+        # The client's position was lost: it must reload its tasks.
+        self.resync = resync
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Read the ``status``, ``status__in`` and ``priority`` filters, as for
+        the task list, and the position from the ``Last-Event-ID`` header of
+        a reconnecting client or else ``?since=`` (a change feed cursor).
+
+        Without a position, the stream starts from the current one. An
+        invalid or expired position cannot be replayed from: the stream
+        starts from the current one too, asking the client to resync.
+        """
+        query_params = request.query_params
+        encoded = request.META.get("HTTP_LAST_EVENT_ID") or query_params.get("since")
+        resync = False
+        cursor = None
+        if encoded:
+            try:
+                cursor = TaskChangesPagination().decode_since(encoded, Task)
+            except (NotFound, CursorExpired):
+                resync = True
+        if cursor is None:
+            last, _ = get_change_sequence(Task.objects.db)
+            position = (last, MAX_ID)
+        else:
+            position = cursor.position
+        return cls(
+            position,
+            statuses=TaskFilter.get_statuses(query_params),
+            priority=TaskFilter.get_priority(query_params),
+            resync=resync,
+        )
+
+    def matches(self, event):
+        if event.status is None:
+            return True
+        if self.statuses is not None and event.status not in self.statuses:
+            return False
+        return self.priority is None or event.priority == self.priority
+
+    def render(self, event):
+        return event.message if self.matches(event) else event.filtered
+
+    def get_messages(self):
+        """
+        The messages opening a stream: the reconnection delay and current
+        position, then a resync event if the position was lost.
+        """
+        messages = [
+            EventStreamRenderer.render_event(
+                id=encode_position(self.position), retry=RETRY_MS
+            )
+        ]
+        if self.resync:
+            messages.append(render_resync(None))
+        return messages
+
+
+class TaskEventStreamResponse(StreamingHttpResponse):
+    """
+    Response of the task event stream.
+
+    The TaskASGIHandler keeps it open and sends the events as they happen.
+    Served over WSGI, where an open stream would hold a worker, it sends the
+    events since the subscription's position and ends: clients reconnect
+    after RETRY_MS with their last event id, polling the change feed.
+    """
+
+    def __init__(self, subscription):
+        self.subscription = subscription
+        super().__init__(
+            self.poll(), content_type=f"{EventStreamRenderer.media_type}; charset=utf-8"
+        )
+        self["Cache-Control"] = "no-cache"
+        # Keep proxies from buffering the stream.
+        self["X-Accel-Buffering"] = "no"
+
+    def poll(self):
+        subscription = self.subscription
+        yield from subscription.get_messages()
+        for event in read_events(subscription.position, settings.TASKS_PAGE_SIZE):
+            yield subscription.render(event)
+
+
+class TaskEventSubscriber:
+    """
+    A stream subscribed to the TaskEventHub: the events for it wait in a
+    queue of TASKS_EVENTS_QUEUE_SIZE events until they are sent.
+
+    A stream falling that far behind loses its pending events: they are
+    replaced by a resync event and the client catches up with the change
+    feed, so a slow client never holds back the others or grows the queue.
+    """
+
+    def __init__(self, subscription, replay_until=None):
+        self.subscription = subscription
+        # Position of the last event taken from the queue.
+        self.position = subscription.position
+        # Position the hub had published up to when subscribing: the
+        # events up to it have to be read by the stream itself.
+        self.replay_until = replay_until
+        self.queue = asyncio.Queue(settings.TASKS_EVENTS_QUEUE_SIZE)
+        self.closed = False
+
+    def publish(self, event):
+        if self.closed or event.position <= self.position:
+            return
+        try:
+            self.queue.put_nowait((event.position, self.subscription.render(event)))
+        except asyncio.QueueFull:
+            self.clear()
+            self.queue.put_nowait(RESYNC)
+
+    def close(self):
+        """
+        Stop the stream, once its client is gone.
+        """
+        self.closed = True
+        self.clear()
+        self.queue.put_nowait(CLOSED)
+
+    def clear(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def replay(self):
+        """
+        Read the messages of the events published before subscribing. When
+        there are more than the queue holds, skip them with a resync event.
+        """
+        until = self.replay_until
+        if until is None or until <= self.position:
+            return []
+        limit = settings.TASKS_EVENTS_QUEUE_SIZE
+        events = await run_blocking(read_events, self.position, limit + 1)
+        events = [event for event in events if event.position <= until]
+        since, self.position = self.position, until
+        if len(events) > limit:
+            return [render_resync(since, id=encode_position(until))]
+        return [self.subscription.render(event) for event in events]
+
+    async def get(self):
+        """
+        Wait for the next messages and return them joined, or None once the
+        stream is closed.
+        """
+        items = [await self.queue.get()]
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        messages = []
+        for item in items:
+            if item is CLOSED:
+                return None
+            if item is RESYNC:
+                messages.append(render_resync(self.position))
+                continue
+            self.position, message = item
+            messages.append(message)
+        return b"".join(messages)
+
+
+class TaskEventHub:
+    """
+    Fans the task changes out to the event streams of this process.
+
+    A single reader follows the change feed, woken by the commits of the
+    task writes of this process (``notify()``) and every
+    TASKS_EVENTS_POLL_INTERVAL seconds for those of other processes. Each
+    change is read and rendered once for all the streams, and the reader
+    only runs while there are any: an idle stream costs a queue and a
+    waiting coroutine.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.wakeup = None
+        # Set while the reader waits for changes, having published all those
+        # it was woken up for, or is stopped.
+        self.idle = None
+        self.reader = None
+        self.position = None
+        self.subscribers = set()
+
+    def subscribe(self, subscription):
+        """
+        Add a stream from ``subscription``; must be called on the event loop
+        of the server.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # The streams of a previous event loop (in tests) are gone.
+            self.loop, self.wakeup, self.reader = loop, asyncio.Event(), None
+            self.idle = asyncio.Event()
+            self.subscribers = set()
+        if self.reader is None:
+            self.position = subscription.position
+            self.idle.clear()
+            self.reader = loop.create_task(self.read())
+        subscriber = TaskEventSubscriber(subscription, self.position)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+        if not self.subscribers and self.wakeup is not None:
+            # Let the reader stop now rather than after its next poll.
+            self.wakeup.set()
+
+    def notify(self):
+        """
+        Wake the reader up after a task write was committed, from any thread.
+        """
+        loop = self.loop
+        if not self.subscribers or loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self.wakeup.set)
+        except RuntimeError:
+            # The loop was closed.
+            pass
+
+    async def read(self):
+        try:
+            while self.subscribers:
+                try:
+                    await self.publish()
+                except Exception as e:
+                    logger.error(
+                        "Something went wrong while reading task events: %s", e
+                    )
+                self.idle.set()
+                try:
+                    await asyncio.wait_for(
+                        self.wakeup.wait(), settings.TASKS_EVENTS_POLL_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self.idle.clear()
+                self.wakeup.clear()
+        finally:
+            if self.reader is asyncio.current_task():
+                self.reader = None
+                self.idle.set()
+
+    async def publish(self):
+        """
+        Read the changes after ``position`` and queue them for every stream.
+        """
+        limit = settings.TASKS_MAX_PAGE_SIZE
+        while self.subscribers:
+            events = await run_blocking(read_events, self.position, limit)
+            for event in events:
+                for subscriber in self.subscribers:
+                    subscriber.publish(event)
+            if events:
+                self.position = events[-1].position
+            if len(events) < limit:
+                return
+
+
+task_event_hub = TaskEventHub()
@@ -1,7 +1,6 @@
 # exceptions.py
 
 import logging
-import traceback
 
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
@@ -15,9 +14,9 @@ def system_general_exception_handler(exc, context):
 
     if response is None:
         # If DRF's exception handler didn't handle the exception, it means it's an unhandled exception.
-        # Log the exception for debugging purposes.
-        traceback_str = traceback.format_exc()
-        logger.error(f"Unhandled Exception: {traceback_str}")
+        # Log the exception for debugging purposes; the traceback is formatted
+        # by the log handler, off the request thread.
+        logger.error("Unhandled Exception: %s", exc, exc_info=exc)
 
         # Return a generic error response to the client.
         return Response(
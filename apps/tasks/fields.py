@@ -0,0 +1,58 @@
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from rest_framework import serializers
+
+
+class LabeledChoicesAttribute(DeferredAttribute):
+    """
+    Store the value of a label assigned to the field, so instances always
+    hold the integer.
+    """
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = self.field.from_label(value)
+
+
+class LabeledChoicesField(models.PositiveSmallIntegerField):
+    """
+    Small integer column for LabeledChoices.
+
+    The labels of the choices are accepted wherever a value is (assignment,
+    ``create()``, lookups), so ``filter(status="new")`` keeps working.
+    """
+
+    descriptor_class = LabeledChoicesAttribute
+
+    def from_label(self, value):
+        if isinstance(value, str):
+            for choice, label in self.flatchoices:
+                if label == value:
+                    return choice
+        return value
+
+    def to_python(self, value):
+        return super().to_python(self.from_label(value))
+
+    def get_prep_value(self, value):
+        return super().get_prep_value(self.from_label(value))
+
+
+class LabeledChoiceField(serializers.ChoiceField):
+    """
+    Serializer field for LabeledChoices: reads and writes the labels of the
+    choices, validates to their integer values.
+    """
+
+    def __init__(self, choices_class, **kwargs):
+        self.choices_class = choices_class
+        self.labels = dict(choices_class.choices)
+        super().__init__(choices=choices_class.labels, **kwargs)
+
+    def to_internal_value(self, data):
+        label = super().to_internal_value(data)
+        return self.choices_class.from_label(label)
+
+    def to_representation(self, value):
+        if value in ("", None):
+            return value
+        return self.labels.get(value, value)
@@ -0,0 +1,192 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from .choices import PriorityChoices, StatusChoices
+from .search import search_tasks
+
+# Orderings accepted by ``?ordering=``: each one is the keyset order of an
+# index of the task tables, alone or after a status or priority equality, so
+# a page is read in index order instead of being sorted. A range filter is
+# only accepted on the leading field of the ordering (see TaskFilter).
+ORDERINGS = {
+    "-created_at": ("-created_at", "-id"),
+    "created_at": ("created_at", "id"),
+    "due_date": ("due_date", "id"),
+    "-due_date": ("-due_date", "-id"),
+    "-priority": ("-priority", "due_date", "id"),
+}
+DEFAULT_ORDERING = "-created_at"
+# Default with a due date range, which the due_date indexes serve in order.
+DEFAULT_DUE_ORDERING = "due_date"
+
+
+class TaskListFilterSerializer(serializers.Serializer):
+    """
+    Serializer validating the list filters that need more than a string.
+    """
+
+    due_after = serializers.DateField(required=False, help_text="Due on or after")
+    due_before = serializers.DateField(required=False, help_text="Due on or before")
+    created_after = serializers.DateField(
+        required=False, help_text="Created on or after"
+    )
+    overdue = serializers.BooleanField(required=False)
+    ordering = serializers.ChoiceField(choices=list(ORDERINGS), required=False)
+
+    lookups = {
+        "due_after": "due_date__gte",
+        "due_before": "due_date__lte",
+        "created_after": "created_at__gte",
+    }
+
+
+class TaskFilter:
+    """
+    The task list query parameter filters, validated once.
+
+    Parameters:
+    - status: Filters tasks based on status.
+    - status__in: Comma-separated statuses (the parameter may be repeated).
+    - priority: Filters tasks based on priority.
+    - due_after, due_before: Due on or after / on or before a date.
+    - created_after: Created on or after a date.
+    - overdue: Only open (not completed) tasks due before today.
+    - q: Full-text search in title and description; the matches are
+      annotated with their ``rank``.
+    - ordering: One of ORDERINGS; by default newest first, or soonest due
+      first when filtering on the due date.
+
+    The range filters (the due date ones and ``created_after``) must be on
+    the leading field of the ordering, after the status and priority
+    equalities: an index then reads the range in order, where any other
+    range would have to be sorted.
+
+    Raises:
+    - ValidationError: Invalid dates or ordering, a range filter on another
+      field than the ordering, or an ordering combined with ``q``.
+    """
+
+    def __init__(self, query_params, today=None):
+        serializer = TaskListFilterSerializer(data=query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        self.search = query_params.get("q", None)
+        if self.search and "ordering" in data:
+            raise serializers.ValidationError(
+                {"ordering": ["Search results are ordered by relevance."]}
+            )
+        default = DEFAULT_ORDERING
+        if {"due_after", "due_before"} & data.keys() or data.get("overdue"):
+            default = DEFAULT_DUE_ORDERING
+        ordering = data.get("ordering", default)
+        self.priority = self.get_priority(query_params)
+        if ordering == "-priority" and self.priority is not None:
+            # Within one priority, the same order without its keyset
+            # condition on the priority, which no index range serves.
+            ordering = "due_date"
+        self.ordering = ORDERINGS[ordering]
+        self.lookups = {
+            lookup: data[name]
+            for name, lookup in TaskListFilterSerializer.lookups.items()
+            if name in data
+        }
+        if data.get("overdue"):
+            self.lookups["due_date__lt"] = today or timezone.localdate()
+        if not self.search:
+            self.check_ranges()
+        self.statuses = self.get_statuses(query_params, data.get("overdue"))
+
+    def check_ranges(self):
+        """
+        Reject the range filters on another field than the one the ordering
+        starts with.
+        """
+        leading = self.ordering[0].lstrip("-")
+        ranged = sorted({lookup.split("__")[0] for lookup in self.lookups})
+        for field in ranged:
+            if field != leading:
+                message = f"A {field} range filter needs the tasks ordered by {field}."
+                raise serializers.ValidationError({"ordering": [message]})
+
+    @staticmethod
+    def get_priority(query_params):
+        """
+        The priority selected by ``priority``, or None when any priority is.
+        Unknown labels give 0, which matches no task, like any unknown value
+        would.
+        """
+        if not query_params.get("priority"):
+            return None
+        return PriorityChoices.from_label(query_params["priority"]) or 0
+
+    @staticmethod
+    def get_statuses(query_params, overdue=False):
+        """
+        The statuses allowed by ``status``, ``status__in`` and ``overdue``
+        together, or None when any status is. Unknown labels are dropped.
+        """
+        statuses = None
+        if query_params.get("status"):
+            statuses = [query_params["status"]]
+        values = [
+            value
+            for param in query_params.getlist("status__in")
+            for value in param.split(",")
+            if value
+        ]
+        if values:
+            statuses = [
+                s for s in (values if statuses is None else statuses) if s in values
+            ]
+        if overdue:
+            statuses = [
+                s
+                for s in (StatusChoices.labels if statuses is None else statuses)
+                if s != StatusChoices.COMPLETED.label
+            ]
+        if statuses is None:
+            return None
+        members = (StatusChoices.from_label(label) for label in statuses)
+        return list(dict.fromkeys(member for member in members if member))
+
+    def filter(self, queryset):
+        """
+        Apply the filters to ``queryset``.
+        """
+        if self.statuses is not None and len(self.statuses) == 1:
+            queryset = queryset.filter(status=self.statuses[0])
+        elif self.statuses is not None:
+            queryset = queryset.filter(status__in=self.statuses)
+        return self.filter_others(queryset)
+
+    def split(self, queryset):
+        """
+        Apply the filters to ``queryset`` as one queryset per selected status,
+        each served by a status index in the keyset order; an IN condition
+        would need the pages sorted. Paginate them together with
+        ``TaskCursorPagination.paginate_querysets()``.
+        """
+        if self.statuses is None or len(self.statuses) < 2:
+            return [self.filter(queryset)]
+        return [
+            self.filter_others(queryset.filter(status=status))
+            for status in self.statuses
+        ]
+
+    def filter_others(self, queryset):
+        if self.priority is not None:
+            queryset = queryset.filter(priority=self.priority)
+        if self.lookups:
+            queryset = queryset.filter(**self.lookups)
+        if self.search:
+            queryset = search_tasks(queryset, self.search)
+        return queryset
+
+
+def filter_tasks(queryset, query_params):
+    """
+    Apply the task list query parameter filters (see TaskFilter) to
+    ``queryset``.
+    """
+    return TaskFilter(query_params).filter(queryset)
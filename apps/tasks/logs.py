@@ -0,0 +1,158 @@
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; any other one was passed in ``extra``.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line, with the ``extra`` fields of
+    the record as keys of their own.
+    """
+
+    def format(self, record):
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "location": f"{record.pathname}:{record.lineno}",
+            "process": record.process,
+        }
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES:
+                data[name] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most ``rate`` records of ``level`` or above per ``per``
+    seconds from each call site (logger, location and message template).
+
+    The first record let through after some were dropped carries their count
+    in ``suppressed``. Records below ``level`` are never limited.
+    """
+
+    def __init__(self, rate=10, per=60, level="ERROR"):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self.level = level if isinstance(level, int) else logging.getLevelName(level)
+        self._lock = threading.Lock()
+        # Call site -> [window start, records let through, records dropped].
+        self._windows = {}
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        key = (record.name, record.pathname, record.lineno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.per:
+                if len(self._windows) > 10000:
+                    self._windows.clear()
+                window = self._windows[key] = [now, 0, window[2] if window else 0]
+            if window[1] >= self.rate:
+                window[2] += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class BlockingSentinelQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room on a full queue, so stopping writes out every record.
+        self.queue.put(self._sentinel)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hand records to a background thread that writes them with ``handlers``
+    (names of configured handlers), so logging never waits on their I/O.
+
+    Records are formatted by the background thread, not by the logging one.
+    When ``maxsize`` records are waiting, new ones are dropped and the count
+    is reported on the next record queued as ``dropped``.
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        try:
+            # What logging.getHandlerByName() does on Python 3.12.
+            self.handlers = [logging._handlers[name] for name in handlers]
+        except KeyError as e:
+            # dictConfig retries handlers failing this way after the others.
+            raise ValueError(f"target not configured yet: {e}") from e
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the listener of this process; a forked process needs its own
+        as threads do not survive the fork.
+        """
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the queue and its locks belong to the parent.
+                self.queue = queue.Queue(self.maxsize)
+            self._listener = BlockingSentinelQueueListener(
+                self.queue, *self.handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def stop(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                self._listener.stop()
+                self._pid = None
+
+    def prepare(self, record):
+        # Keep the record as it is: message and traceback are formatted by
+        # the target handlers, on the listener thread.
+        return record
+
+    def enqueue(self, record):
+        dropped = self.dropped
+        if dropped:
+            record.dropped = dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped -= dropped
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,61 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from django.utils import timezone
+
+from ...choices import StatusChoices
+from ...models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the tasks completed more than N days ago to the archive table in "
+        "primary key batches, committing every batch separately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            required=True,
+            metavar="DAYS",
+            help="Archive completed tasks last updated more than DAYS days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASKS_BULK_BATCH_SIZE,
+            help="Maximum number of tasks moved per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tasks would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than"] < 0:
+            raise CommandError("--older-than must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        cutoff = timezone.now() - datetime.timedelta(days=options["older_than"])
+        tasks = Task.objects.filter(
+            status=StatusChoices.COMPLETED, updated_at__lt=cutoff
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{tasks.count()} tasks would be archived.")
+            return
+
+        archived = 0
+        try:
+            for archived in tasks.archive_in_batches(options["batch_size"]):
+                self.stdout.write(f"Archived {archived} tasks...")
+        except IntegrityError as e:
+            raise CommandError(
+                f"Stopped after archiving {archived} tasks: a task id is already "
+                f"in the archive ({e})."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} tasks."))
@@ -0,0 +1,168 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ...asgi import TaskASGIHandler
+from .bench_tasks import test_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the WSGI and ASGI applications for a task "
+        "endpoint at several numbers of concurrent clients. Requests are made "
+        "in-process, so the numbers exclude the HTTP server and the network. "
+        "Runs on a fresh test database seeded with --tasks tasks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            nargs="+",
+            default=[50, 200, 1000],
+            help="Numbers of concurrent clients to benchmark.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Requests made per run, spread over the clients.",
+        )
+        parser.add_argument(
+            "--wsgi-threads",
+            type=int,
+            default=32,
+            help="Worker threads of the simulated threaded WSGI server.",
+        )
+        parser.add_argument(
+            "--path", default="/api/v1/tasks/", help="Path (and query) to request."
+        )
+        parser.add_argument("--host", default="localhost", help="Host header.")
+        parser.add_argument(
+            "--tasks", type=int, default=1000, help="Tasks seeded before the runs."
+        )
+
+    def handle(self, *args, **options):
+        if min(options["clients"]) < 1 or options["requests"] < 1:
+            raise CommandError("--clients and --requests must be positive integers.")
+        if options["tasks"] < 0:
+            raise CommandError("--tasks must not be negative.")
+
+        with test_database():
+            if options["tasks"]:
+                call_command("seed_tasks", count=options["tasks"], stdout=StringIO())
+            user = User.objects.create_user(username="bench_asgi")
+            token = f"Bearer {AccessToken.for_user(user)}"
+            wsgi, asgi = get_wsgi_application(), TaskASGIHandler()
+            for clients in options["clients"]:
+                for name, run in (("WSGI", self.run_wsgi), ("ASGI", self.run_asgi)):
+                    elapsed, latencies, statuses = run(
+                        wsgi if name == "WSGI" else asgi, clients, token, options
+                    )
+                    self.report(name, clients, elapsed, latencies, statuses)
+
+    def report(self, name, clients, elapsed, latencies, statuses):
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        errors = sum(status >= 400 for status in statuses)
+        self.stdout.write(
+            f"{name} {clients:>5} clients: {len(latencies) / elapsed:8.1f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms, "
+            f"p99 {p99 * 1000:7.1f} ms" + (f", {errors} errors" if errors else "")
+        )
+
+    def run_wsgi(self, application, clients, token, options):
+        """
+        Every client makes its requests back to back; a threaded WSGI server
+        handles at most ``wsgi_threads`` of them at a time.
+        """
+        url = urlsplit(options["path"])
+        server = threading.BoundedSemaphore(options["wsgi_threads"])
+        per_client = self.split(options["requests"], clients)
+        latencies, statuses = [], []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(int(status.split()[0]))
+
+        def client(count):
+            for _ in range(count):
+                environ = {
+                    "REQUEST_METHOD": "GET",
+                    "PATH_INFO": url.path,
+                    "QUERY_STRING": url.query,
+                    "SERVER_NAME": options["host"],
+                    "SERVER_PORT": "80",
+                    "HTTP_HOST": options["host"],
+                    "HTTP_AUTHORIZATION": token,
+                    "wsgi.url_scheme": "http",
+                    "wsgi.input": None,
+                }
+                start = time.perf_counter()
+                with server:
+                    response = application(environ, start_response)
+                    b"".join(response)
+                    response.close()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            list(executor.map(client, per_client))
+        return time.perf_counter() - start, latencies, statuses
+
+    def run_asgi(self, application, clients, token, options):
+        """
+        Every client is a coroutine making its requests back to back.
+        """
+        url = urlsplit(options["path"])
+        per_client = self.split(options["requests"], clients)
+        latencies, statuses = [], []
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", options["host"].encode()),
+                (b"authorization", token.encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (options["host"], 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        async def client(count):
+            for _ in range(count):
+                start = time.perf_counter()
+                await application(scope, receive, send)
+                latencies.append(time.perf_counter() - start)
+
+        async def main():
+            await asyncio.gather(*(client(count) for count in per_client))
+
+        start = time.perf_counter()
+        asyncio.run(main())
+        return time.perf_counter() - start, latencies, statuses
+
+    def split(self, total, parts):
+        return [total // parts + (i < total % parts) for i in range(parts)]
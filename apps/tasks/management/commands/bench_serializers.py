@@ -0,0 +1,85 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from ... import choices
+from ...models import Task
+from ...serializers import FastTaskSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare TaskSerializer(many=True) with the FastTaskSerializer fast path "
+        "on in-memory rows, without touching the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Row counts to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the best one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1 or min(options["rows"]) < 1:
+            raise CommandError("--rows and --repeat must be positive integers.")
+
+        fast = FastTaskSerializer()
+        for count in options["rows"]:
+            tasks = self.make_tasks(count)
+            # Rows as values_list() would return them, minus the namedtuple.
+            rows = [
+                tuple(getattr(task, column) for column in fast.columns)
+                for task in tasks
+            ]
+
+            slow_data = TaskSerializer(tasks, many=True).data
+            fast_data = fast.to_representation(rows)
+            if JSONRenderer().render(slow_data) != JSONRenderer().render(fast_data):
+                raise CommandError(
+                    "FastTaskSerializer output differs from TaskSerializer."
+                )
+
+            slow = self.measure(lambda: TaskSerializer(tasks, many=True).data, options)
+            quick = self.measure(lambda: fast.to_representation(rows), options)
+            self.stdout.write(
+                f"{count} rows: TaskSerializer {slow * 1000:.1f} ms, "
+                f"FastTaskSerializer {quick * 1000:.1f} ms "
+                f"({slow / quick:.1f}x faster)"
+            )
+
+    def make_tasks(self, count):
+        statuses = choices.StatusChoices.values
+        priorities = choices.PriorityChoices.values
+        today = datetime.date.today()
+        return [
+            Task(
+                id=i + 1,
+                title=f"Task {i}",
+                description="task description",
+                status=statuses[i % len(statuses)],
+                priority=priorities[i % len(priorities)],
+                due_date=today + datetime.timedelta(days=i % 365),
+                created_at=today,
+            )
+            for i in range(count)
+        ]
+
+    def measure(self, func, options):
+        best = None
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,371 @@
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ...models import Task
+from ...pagination import Cursor, TaskCursorPagination
+
+# Tasks written by the write scenarios are due on or before this date, far
+# away from the seeded ones, and are removed after every run.
+BENCH_DUE_DATE = datetime.date(2999, 12, 31)
+BENCH_DUE_AFTER = datetime.date(2900, 1, 1)
+
+# Tasks per request of the bulk scenarios.
+BULK_ITEMS = 10
+
+Scenario = namedtuple(
+    "Scenario", ["name", "method", "make_request", "setup", "share"], defaults=(None, 1)
+)
+
+
+def task_data(title="Bench task", due_date=BENCH_DUE_DATE):
+    return {
+        "title": title,
+        "status": "new",
+        "priority": "medium",
+        "description": "Created by bench_tasks.",
+        "due_date": str(due_date),
+    }
+
+
+def bench_due_date(index):
+    return BENCH_DUE_DATE - datetime.timedelta(days=index)
+
+
+@contextmanager
+def test_database():
+    """
+    Run on a fresh test database, like the test runner does. SQLite gets a
+    file instead of an in-memory database so the client threads share it.
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings["NAME"]
+    tmpdir = None
+    if connection.vendor == "sqlite" and not old_test_name:
+        tmpdir = tempfile.mkdtemp(prefix="bench_tasks")
+        test_settings["NAME"] = os.path.join(tmpdir, "db.sqlite3")
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+        if tmpdir:
+            os.rmdir(tmpdir)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every task endpoint in-process at several dataset sizes and "
+        "concurrency levels, on a throwaway test database. Prints a JSON "
+        "report with latency percentiles, throughput, query counts and peak "
+        "memory per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1000, 10000],
+            help="Numbers of seeded tasks to benchmark with.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 8, 32],
+            help="Numbers of concurrent clients to benchmark with.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per endpoint and run (exports make a twentieth of them).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed of the seeded tasks."
+        )
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Keep the response cache on; by default every read hits the database.",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report to this file instead of stdout."
+        )
+
+    def handle(self, *args, **options):
+        if min(options["sizes"]) < 1 or min(options["concurrency"]) < 1:
+            raise CommandError("--sizes and --concurrency must be positive integers.")
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2.")
+
+        report = {"meta": self.get_meta(options), "results": []}
+        # Failed requests are counted in the report, not logged one by one.
+        logging.disable(logging.ERROR)
+        try:
+            with test_database(), self.bench_settings(options["with_cache"]):
+                user = User.objects.create_user(username="bench_tasks")
+                self.token = f"Bearer {AccessToken.for_user(user)}"
+                for size in sorted(set(options["sizes"])):
+                    self.seed(size, options["seed"])
+                    report["results"].extend(self.bench_size(size, options))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def bench_size(self, size, options):
+        """
+        Run every scenario at every concurrency on ``size`` tasks.
+        """
+        results = []
+        for scenario in self.get_scenarios():
+            for concurrency in options["concurrency"]:
+                result = self.run(
+                    scenario, max(options["requests"] // scenario.share, 2), concurrency
+                )
+                result.update(size=size, concurrency=concurrency)
+                results.append(result)
+                self.stderr.write(
+                    f"{size:>8} tasks {concurrency:>3} clients "
+                    f"{scenario.name:<16} {result['throughput']:8.1f} req/s, "
+                    f"p99 {result['latency_ms']['p99']:7.1f} ms"
+                )
+        return results
+
+    def get_meta(self, options):
+        return {
+            "started_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "requests": options["requests"],
+            "cache": options["with_cache"],
+            "seed": options["seed"],
+        }
+
+    def bench_settings(self, with_cache):
+        overrides = {"ALLOWED_HOSTS": ["testserver"], "DEBUG": False}
+        if not with_cache:
+            overrides["CACHES"] = {
+                **settings.CACHES,
+                "bench_tasks": {
+                    "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+                },
+            }
+            overrides["TASKS_CACHE_ALIAS"] = "bench_tasks"
+        return override_settings(**overrides)
+
+    def seed(self, size, seed):
+        # The write scenarios of a smaller size may have left more tasks.
+        missing = size - Task.objects.count()
+        if missing > 0:
+            self.stderr.write(f"Seeding {missing} tasks...")
+            call_command(
+                "seed_tasks", count=missing, seed=seed + size, stdout=StringIO()
+            )
+        self.task_ids = list(Task.objects.values_list("pk", flat=True))
+
+    def get_scenarios(self):
+        list_url = reverse("tasks:task_list_create_api_view")
+        bulk_create_url = reverse("tasks:task_bulk_create_api_view")
+        bulk_update_url = reverse("tasks:task_bulk_update_api_view")
+        bulk_delete_url = reverse("tasks:task_bulk_delete_api_view")
+
+        def detail_url(pk):
+            return reverse("tasks:task_detail_api_view", args=[pk])
+
+        def seeded_id(index):
+            return self.task_ids[index * 7919 % len(self.task_ids)]
+
+        # A cursor halfway through the list, to check that deep pages cost
+        # the same as the first one.
+        middle = (
+            Task.objects.order_by(*TaskCursorPagination.ordering)
+            .values_list("created_at", "id")
+            .get(pk=seeded_id(len(self.task_ids) // 2))
+        )
+        paginator = TaskCursorPagination()
+        paginator.base_url = list_url
+        deep_page = paginator.encode_cursor(Cursor(position=middle, reverse=False))
+
+        def create_bench_tasks(count):
+            Task.objects.bulk_create(
+                [
+                    Task(**task_data(due_date=bench_due_date(index // BULK_ITEMS)))
+                    for index in range(count)
+                ]
+            )
+            return list(
+                Task.objects.filter(due_date__gte=BENCH_DUE_AFTER)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+
+        def setup_single(requests):
+            self.bench_ids = create_bench_tasks(requests)
+
+        def setup_bulk(requests):
+            create_bench_tasks(requests * BULK_ITEMS)
+
+        def bulk_filter(index):
+            due_date = str(bench_due_date(index))
+            return {"due_after": due_date, "due_before": due_date}
+
+        return [
+            Scenario("list", "get", lambda i: (list_url, None)),
+            Scenario(
+                "list_filtered",
+                "get",
+                lambda i: (list_url, {"status": "new", "priority": "high"}),
+            ),
+            Scenario("list_deep_page", "get", lambda i: (deep_page, None)),
+            Scenario("list_search", "get", lambda i: (list_url, {"q": "report"})),
+            Scenario(
+                "list_columnar", "get", lambda i: (list_url, {"format": "columnar"})
+            ),
+            Scenario("detail", "get", lambda i: (detail_url(seeded_id(i)), None)),
+            Scenario(
+                "stats", "get", lambda i: (reverse("tasks:task_stats_api_view"), None)
+            ),
+            Scenario(
+                "export",
+                "get",
+                lambda i: (reverse("tasks:task_export_api_view"), None),
+                share=20,
+            ),
+            Scenario("create", "post", lambda i: (list_url, task_data())),
+            Scenario(
+                "update",
+                "put",
+                lambda i: (detail_url(self.bench_ids[i]), task_data("Updated")),
+                setup_single,
+            ),
+            Scenario(
+                "delete",
+                "delete",
+                lambda i: (detail_url(self.bench_ids[i]), None),
+                setup_single,
+            ),
+            Scenario(
+                "bulk_create",
+                "post",
+                lambda i: (bulk_create_url, [task_data()] * BULK_ITEMS),
+            ),
+            Scenario(
+                "bulk_update",
+                "patch",
+                lambda i: (
+                    bulk_update_url,
+                    {"filter": bulk_filter(i), "set": {"priority": "high"}},
+                ),
+                setup_bulk,
+            ),
+            Scenario(
+                "bulk_delete",
+                "post",
+                lambda i: (bulk_delete_url, bulk_filter(i)),
+                setup_bulk,
+            ),
+        ]
+
+    def request(self, client, scenario, index):
+        path, data = scenario.make_request(index)
+        if scenario.method == "get":
+            response = client.get(path, data)
+        else:
+            response = getattr(client, scenario.method)(
+                path, json.dumps(data), content_type="application/json"
+            )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        response.close()
+        return response.status_code
+
+    def run(self, scenario, requests, concurrency):
+        """
+        Make ``requests`` requests from ``concurrency`` client threads, after
+        a first request that counts the queries and the peak memory.
+        """
+        if scenario.setup:
+            scenario.setup(requests + 1)
+
+        client = Client(HTTP_AUTHORIZATION=self.token)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self.request(client, scenario, 0)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        indexes = itertools.count(1)
+        latencies, statuses = [], Counter()
+
+        def run_client(count):
+            client = Client(HTTP_AUTHORIZATION=self.token)
+            try:
+                for _ in range(count):
+                    index = next(indexes)
+                    start = time.perf_counter()
+                    status_code = self.request(client, scenario, index)
+                    latencies.append(time.perf_counter() - start)
+                    statuses[status_code] += 1
+            finally:
+                connections.close_all()
+
+        per_client = [
+            requests // concurrency + (i < requests % concurrency)
+            for i in range(concurrency)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run_client, per_client))
+        elapsed = time.perf_counter() - start
+
+        Task.objects.filter(due_date__gte=BENCH_DUE_AFTER).delete()
+
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {
+            "endpoint": scenario.name,
+            "requests": len(latencies),
+            "statuses": dict(statuses),
+            "throughput": round(len(latencies) / elapsed, 1),
+            "latency_ms": {
+                name: round(percentiles[p - 1] * 1000, 2)
+                for name, p in (("p50", 50), ("p95", 95), ("p99", 99))
+            },
+            "queries": len(queries),
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+        }
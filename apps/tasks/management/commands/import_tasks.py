@@ -0,0 +1,215 @@
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...models import TaskImportCheckpoint
+from ...serializers import TaskSerializer
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks from a CSV or NDJSON file, streaming it in batches. Rows "
+        "are validated like API input; invalid ones go to a reject file. An "
+        "interrupted import resumes from its checkpoint when run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV (with a header row) or NDJSON file.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="File format; guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASKS_BULK_BATCH_SIZE,
+            help="Rows validated and inserted per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Name of the checkpoint saved in the database, the absolute path "
+            "of the file by default. It is removed once the import is complete.",
+        )
+        parser.add_argument(
+            "--rejects", help="Reject file (NDJSON), <file>.rejects by default."
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and import from the start.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        file_format = options["format"] or FORMATS.get(os.path.splitext(path)[1])
+        if file_format is None:
+            raise CommandError("Unknown file format, use --format.")
+        if not 0 < options["batch_size"] <= settings.TASKS_BULK_MAX_ITEMS:
+            raise CommandError(
+                f"--batch-size must be between 1 and {settings.TASKS_BULK_MAX_ITEMS}."
+            )
+        rejects_path = options["rejects"] or f"{path}.rejects"
+
+        name = options["checkpoint"] or os.path.abspath(path)
+        if options["restart"]:
+            TaskImportCheckpoint.objects.filter(name=name).delete()
+        checkpoint = TaskImportCheckpoint.objects.filter(name=name).first()
+        if checkpoint is None:
+            checkpoint = TaskImportCheckpoint(name=name)
+        else:
+            self.stdout.write(f"Resuming after row {checkpoint.rows}.")
+
+        try:
+            source = open(path, "rb")
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e.strerror}.")
+        start = time.perf_counter()
+        with source, open(rejects_path, "a" if checkpoint.offset else "w") as rejects:
+            # Drop the rejected rows of a batch that was not committed.
+            if rejects.tell() > checkpoint.rejects_size:
+                rejects.truncate(checkpoint.rejects_size)
+            source.seek(checkpoint.offset)
+            reader_class = CSVReader if file_format == "csv" else NDJSONReader
+            reader = reader_class(source, checkpoint.rows, checkpoint.header)
+            for batch, offset in self.batches(reader.read(), options["batch_size"]):
+                serializer, rejected = self.validate_batch(batch)
+                for row in rejected:
+                    rejects.write(json.dumps(row) + "\n")
+                rejects.flush()
+                checkpoint.offset = offset
+                checkpoint.rows = batch[-1][0]
+                checkpoint.rejected += len(rejected)
+                checkpoint.rejects_size = rejects.tell()
+                checkpoint.header = reader.header
+                # The checkpoint is committed with the tasks, or not at all.
+                with transaction.atomic():
+                    if serializer is not None:
+                        checkpoint.imported += len(serializer.save())
+                    checkpoint.save()
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"Imported {checkpoint.imported} tasks, rejected "
+                        f"{checkpoint.rejected} rows..."
+                    )
+
+        if checkpoint.pk is not None:
+            checkpoint.delete()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {checkpoint.imported} tasks, rejected "
+                f"{checkpoint.rejected} rows in {elapsed:.1f} s "
+                f"({checkpoint.rows / max(elapsed, 1e-9):.0f} rows/s)."
+            )
+        )
+        if checkpoint.rejected:
+            self.stdout.write(f"Rejected rows were written to {rejects_path}.")
+
+    def batches(self, rows, batch_size):
+        """
+        Group ``(row number, data, errors, offset)`` items into batches,
+        yielded with the file offset following their last row.
+        """
+        batch = []
+        for number, data, errors, offset in rows:
+            batch.append((number, data, errors))
+            if len(batch) == batch_size:
+                yield batch, offset
+                batch = []
+        if batch:
+            yield batch, offset
+
+    def validate_batch(self, batch):
+        """
+        Validate the rows of ``batch`` and return the serializer saving the
+        valid ones (None if there are none) with the rejected rows.
+        """
+        rejected = [
+            {"row": number, "data": data, "errors": errors}
+            for number, data, errors in batch
+            if errors
+        ]
+        parsed = [(number, data) for number, data, errors in batch if not errors]
+        if not parsed:
+            return None, rejected
+
+        serializer = TaskSerializer(
+            data=[data for _, data in parsed],
+            many=True,
+            context={"partial_success": True},
+        )
+        serializer.is_valid()
+        for (number, data), errors in zip(parsed, serializer.item_errors):
+            if errors:
+                rejected.append({"row": number, "data": data, "errors": errors})
+        rejected.sort(key=lambda row: row["row"])
+        return serializer, rejected
+
+
+class Reader:
+    """
+    Stream the rows of a binary file from its current position, numbered
+    from ``rows + 1``, as ``(row number, data, errors, offset)``. ``errors``
+    is set for rows that cannot be parsed; ``offset`` is the file position
+    following the row.
+    """
+
+    def __init__(self, source, rows=0, header=None):
+        self.source = source
+        self.rows = rows
+        self.header = header
+        self.offset = source.tell()
+
+    def lines(self):
+        for line in self.source:
+            if self.offset == 0 and line.startswith(b"\xef\xbb\xbf"):
+                line = line[3:]
+            self.offset = self.source.tell()
+            yield line.decode("utf-8", errors="replace")
+
+
+class NDJSONReader(Reader):
+    def read(self):
+        number = self.rows
+        for line in self.lines():
+            if not line.strip():
+                continue
+            number += 1
+            data, errors = None, None
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                errors = {"non_field_errors": [f"Invalid JSON: {e}"]}
+            else:
+                if not isinstance(data, dict):
+                    errors = {"non_field_errors": ["Expected a JSON object."]}
+            yield number, data, errors, self.offset
+
+
+class CSVReader(Reader):
+    def read(self):
+        reader = csv.reader(self.lines())
+        if self.header is None:
+            self.header = next(reader, None)
+        number = self.rows
+        for values in reader:
+            if not values:
+                continue
+            number += 1
+            if len(values) != len(self.header):
+                errors = {
+                    "non_field_errors": [
+                        f"Expected {len(self.header)} columns, got {len(values)}."
+                    ]
+                }
+                yield number, values, errors, self.offset
+            else:
+                yield number, dict(zip(self.header, values)), None, self.offset
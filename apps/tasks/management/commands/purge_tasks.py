@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Task
+from ...serializers import TaskBulkFilterSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tasks matching a filter in primary key batches, "
+        "committing every batch separately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--status", help="Only tasks with this status.")
+        parser.add_argument("--priority", help="Only tasks with this priority.")
+        parser.add_argument(
+            "--due-after", help="Only tasks due on or after this date (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--due-before", help="Only tasks due on or before this date (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASKS_BULK_BATCH_SIZE,
+            help="Maximum number of tasks deleted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tasks would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        filters = {
+            name: options[name]
+            for name in ("status", "priority", "due_after", "due_before")
+            if options[name] is not None
+        }
+        serializer = TaskBulkFilterSerializer(data=filters)
+        if not serializer.is_valid():
+            raise CommandError(
+                "; ".join(
+                    f"{field}: {' '.join(errors)}"
+                    for field, errors in serializer.errors.items()
+                )
+            )
+
+        tasks = TaskBulkFilterSerializer.filter_queryset(
+            Task.objects.all(), serializer.validated_data
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{tasks.count()} tasks would be deleted.")
+            return
+
+        deleted = 0
+        for deleted in tasks.delete_in_batches(options["batch_size"]):
+            self.stdout.write(f"Deleted {deleted} tasks...")
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} tasks."))
@@ -0,0 +1,39 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...changes import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the change feed tombstones of the tasks removed more than N "
+        "days ago. Clients that last synced before them get a 410 and sync "
+        "again from scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            required=True,
+            metavar="DAYS",
+            help="Purge tombstones of tasks removed more than DAYS days ago.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tombstones would be purged.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than"] < 0:
+            raise CommandError("--older-than must not be negative.")
+
+        cutoff = timezone.now() - datetime.timedelta(days=options["older_than"])
+        purged = purge_tombstones(cutoff, dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(f"{purged} tombstones would be purged.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Purged {purged} tombstones."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from ...stats import rebuild_task_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the task statistics counters from the tasks table with a "
+        "single GROUP BY and fix the ones that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many counters are out of date.",
+        )
+
+    def handle(self, *args, **options):
+        corrected = rebuild_task_stats(dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(f"{corrected} counters are out of date.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} counters."))
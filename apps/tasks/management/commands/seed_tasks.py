@@ -0,0 +1,130 @@
+import datetime
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...choices import PriorityChoices, StatusChoices
+from ...models import Task
+
+# Share of tasks per status and priority.
+STATUS_WEIGHTS = {
+    StatusChoices.NEW: 30,
+    StatusChoices.IN_PROGRESS: 20,
+    StatusChoices.COMPLETED: 50,
+}
+PRIORITY_WEIGHTS = {
+    PriorityChoices.LOW: 30,
+    PriorityChoices.MEDIUM: 50,
+    PriorityChoices.HIGH: 20,
+}
+
+VERBS = [
+    "Review",
+    "Fix",
+    "Write",
+    "Update",
+    "Deploy",
+    "Plan",
+    "Test",
+    "Refactor",
+    "Document",
+    "Migrate",
+    "Prepare",
+    "Investigate",
+    "Schedule",
+    "Archive",
+]
+OBJECTS = [
+    "quarterly report",
+    "login page",
+    "billing service",
+    "release notes",
+    "onboarding guide",
+    "database backup",
+    "search index",
+    "customer feedback",
+    "API documentation",
+    "team meeting",
+    "budget proposal",
+    "error dashboard",
+]
+DETAILS = [
+    "Coordinate with the team before starting.",
+    "Blocked until the previous step is merged.",
+    "See the notes from last week's meeting.",
+    "Customer reported this twice already.",
+    "Keep the scope small and ship it early.",
+    "Needs sign-off from the product owner.",
+    "Check the logs for related errors first.",
+    "Low risk, but touches a lot of files.",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert generated tasks with realistic status, priority and due date "
+        "distributions, using batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, required=True, help="Number of tasks to insert."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASKS_BULK_BATCH_SIZE,
+            help="Tasks per bulk insert.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Random seed, for repeatable data."
+        )
+
+    def handle(self, *args, **options):
+        if options["count"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--count and --batch-size must be positive integers.")
+
+        rng = random.Random(options["seed"])
+        today = timezone.localdate()
+        start = time.perf_counter()
+        created = 0
+        while created < options["count"]:
+            size = min(options["batch_size"], options["count"] - created)
+            Task.objects.bulk_create(self.generate(rng, today, size))
+            created += size
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Inserted {created} tasks...")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {created} tasks in {elapsed:.1f} s "
+                f"({created / elapsed:.0f} tasks/s)."
+            )
+        )
+
+    def generate(self, rng, today, count):
+        statuses = rng.choices(
+            list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=count
+        )
+        priorities = rng.choices(
+            list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()), k=count
+        )
+        tasks = []
+        for status, priority in zip(statuses, priorities):
+            # Completed tasks are mostly in the past, open ones mostly ahead.
+            mean = -30 if status == StatusChoices.COMPLETED else 14
+            due_date = today + datetime.timedelta(days=round(rng.gauss(mean, 30)))
+            tasks.append(
+                Task(
+                    title=f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}",
+                    description=" ".join(rng.sample(DETAILS, rng.randint(1, 3))),
+                    status=status,
+                    priority=priority,
+                    due_date=due_date,
+                )
+            )
+        return tasks
@@ -0,0 +1,405 @@
+import asyncio
+import glob
+import ipaddress
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .timing import query_count
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Request methods labelled as such; any other is labelled "other", so clients
+# cannot grow the number of series.
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE"}
+
+
+class MemoryStore:
+    """
+    Metric values of this process, for single-process servers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def inc(self, items):
+        with self._lock:
+            for key, amount in items:
+                self._values[key] += amount
+
+    def read(self):
+        """
+        Yield ``(key, value, live)`` for every value of every process.
+        """
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield key, value, True
+
+
+class MmapStore:
+    """
+    Metric values of this process in a memory-mapped file of ``directory``,
+    for servers running several worker processes.
+
+    Every process only writes its own file, named after its pid, so updates
+    never wait on another process. Reading sums the files of all the
+    processes. The layout is a used-bytes header followed by entries of a key
+    length, the key (padded to 8 bytes) and a double.
+    """
+
+    header = struct.Struct("<I4x")
+    length = struct.Struct("<I")
+    value = struct.Struct("<d")
+    initial_size = 64 * 1024
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._offsets = {}
+        path = os.path.join(directory, f"metrics_{os.getpid()}.db")
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.initial_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = self.header.unpack_from(self._map, 0)[0] or self.header.size
+        for key, _, offset in self.read_file(self._map):
+            self._offsets[key] = offset
+
+    @classmethod
+    def read_file(cls, data):
+        used = cls.header.unpack_from(data, 0)[0]
+        position = cls.header.size
+        while position < used:
+            (size,) = cls.length.unpack_from(data, position)
+            start = position + cls.length.size
+            key = bytes(data[start : start + size]).decode()
+            offset = start + size + (-(start + size) % 8)
+            yield key, cls.value.unpack_from(data, offset)[0], offset
+            position = offset + cls.value.size
+
+    def _add_key(self, key):
+        encoded = key.encode()
+        start = self._used + self.length.size
+        offset = start + len(encoded) + (-(start + len(encoded)) % 8)
+        end = offset + self.value.size
+        if end > len(self._map):
+            self._map.resize(max(end, 2 * len(self._map)))
+        self.length.pack_into(self._map, self._used, len(encoded))
+        self._map[start : start + len(encoded)] = encoded
+        self.value.pack_into(self._map, offset, 0.0)
+        # Publish the entry only once it is complete, for concurrent readers.
+        self._used = end
+        self.header.pack_into(self._map, 0, end)
+        self._offsets[key] = offset
+        return offset
+
+    def inc(self, items):
+        with self._lock:
+            for key, amount in items:
+                offset = self._offsets.get(key)
+                if offset is None:
+                    offset = self._add_key(key)
+                current = self.value.unpack_from(self._map, offset)[0]
+                self.value.pack_into(self._map, offset, current + amount)
+
+    def read(self):
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.db")):
+            pid = int(os.path.basename(path)[len("metrics_") : -len(".db")])
+            live = is_process_alive(pid)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) >= self.header.size:
+                for key, value, _ in self.read_file(data):
+                    yield key, value, live
+
+
+def is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+_store = None
+
+
+def get_store():
+    """
+    The store of this process: a MmapStore in TASKS_METRICS_DIR if it is set,
+    else a MemoryStore. A forked worker opens a store of its own.
+    """
+    global _store
+    directory = settings.TASKS_METRICS_DIR
+    if (
+        _store is None
+        or _store[0] != os.getpid()
+        or getattr(_store[1], "directory", "") != directory
+    ):
+        store = MmapStore(directory) if directory else MemoryStore()
+        _store = (os.getpid(), store)
+    return _store[1]
+
+
+class Metric:
+    """
+    A metric family. Values are updated with the labels as keyword arguments.
+    """
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._keys = {}
+
+    def key(self, suffix, labels, extra=()):
+        cache_key = (suffix, tuple(labels.items()), extra)
+        key = self._keys.get(cache_key)
+        if key is None:
+            values = [str(labels[name]) for name in self.labelnames]
+            key = json.dumps([self.name + suffix, values, *extra])
+            self._keys[cache_key] = key
+        return key
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        get_store().inc([(self.key("_total", labels), amount)])
+
+
+class Gauge(Metric):
+    """
+    A gauge summed over the live processes.
+    """
+
+    type = "gauge"
+
+    def inc(self, amount=1, **labels):
+        get_store().inc([(self.key("", labels), amount)])
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        for bound in self.buckets:
+            if value <= bound:
+                break
+        get_store().inc(
+            [
+                (self.key("_bucket", labels, (bound,)), 1),
+                (self.key("_sum", labels), value),
+            ]
+        )
+
+
+REQUEST_LATENCY = Histogram(
+    "tms_http_request_duration_seconds",
+    "Time spent handling requests, per URL name.",
+    ("view", "method"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "tms_http_requests",
+    "Requests handled, per URL name and status code.",
+    ("view", "method", "status"),
+)
+RESPONSE_SIZE = Histogram(
+    "tms_http_response_size_bytes",
+    "Size of the (non-streaming) response bodies, per URL name.",
+    ("view",),
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+REQUEST_QUERIES = Histogram(
+    "tms_http_request_queries",
+    "Database queries made per request, per URL name.",
+    ("view",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUESTS_IN_FLIGHT = Gauge("tms_http_requests_in_flight", "Requests being handled.", ())
+CACHE_REQUESTS = Counter(
+    "tms_cache_requests",
+    "Cache lookups, per cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+registry = [
+    REQUEST_LATENCY,
+    REQUESTS,
+    RESPONSE_SIZE,
+    REQUEST_QUERIES,
+    REQUESTS_IN_FLIGHT,
+    CACHE_REQUESTS,
+]
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    escaped = (
+        str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+        for value in values
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def generate_latest():
+    """
+    Render the metrics of all the processes in the Prometheus text format.
+    """
+    samples = defaultdict(float)
+    for key, value, live in get_store().read():
+        name, *labels = json.loads(key)
+        if name == REQUESTS_IN_FLIGHT.name and not live:
+            continue
+        samples[(name, tuple(map(str, labels[0])), *labels[1:])] += value
+
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if isinstance(metric, Histogram):
+            lines.extend(format_histogram(metric, samples))
+            continue
+        suffix = "_total" if isinstance(metric, Counter) else ""
+        for (name, labels, *_), value in sorted(samples.items()):
+            if name == metric.name + suffix:
+                lines.append(
+                    f"{name}{format_labels(metric.labelnames, labels)} "
+                    f"{format_value(value)}"
+                )
+    return "\n".join(lines) + "\n"
+
+
+def format_histogram(metric, samples):
+    series = defaultdict(dict)
+    for (name, labels, *bound), value in samples.items():
+        if name == metric.name + "_bucket":
+            series[labels][bound[0]] = value
+        elif name == metric.name + "_sum":
+            series[labels]["sum"] = value
+
+    names = (*metric.labelnames, "le")
+    for labels, values in sorted(series.items()):
+        count = 0
+        for bound in metric.buckets:
+            count += values.get(bound, 0)
+            yield (
+                f"{metric.name}_bucket"
+                f"{format_labels(names, (*labels, format_value(bound)))} "
+                f"{format_value(count)}"
+            )
+        label_text = format_labels(metric.labelnames, labels)
+        yield f"{metric.name}_sum{label_text} {format_value(values.get('sum', 0))}"
+        yield f"{metric.name}_count{label_text} {format_value(count)}"
+
+
+def is_allowed_address(address):
+    """
+    Whether ``address`` is in one of the TASKS_METRICS_ALLOWED_IPS networks.
+    """
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.TASKS_METRICS_ALLOWED_IPS
+    )
+
+
+def metrics_view(request):
+    """
+    Expose the metrics in the Prometheus text exposition format, to the
+    clients of TASKS_METRICS_ALLOWED_IPS only: the metrics reveal the URLs
+    and the load of the server.
+    """
+    if not is_allowed_address(request.META.get("REMOTE_ADDR", "")):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status, response size and query count of every
+    request, per URL name, and the number of requests in flight.
+
+    The queries are only counted: timing them is left to the sample of
+    requests instrumented by the ServerTimingMiddleware.
+
+    The middleware is natively async as well, so Django serves the requests
+    going through it under ASGI without a thread hop. List it first, to time
+    the whole request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Mark the instance as a coroutine function for Django.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            with query_count() as queries:
+                response = self.get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            with query_count() as queries:
+                response = await self.get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    def record(self, request, response, duration, queries):
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unmatched"
+        method = request.method if request.method in HTTP_METHODS else "other"
+        REQUEST_LATENCY.observe(duration, view=view, method=method)
+        REQUESTS.inc(view=view, method=method, status=response.status_code)
+        REQUEST_QUERIES.observe(queries.count, view=view)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), view=view)
@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-18 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_alter_task_created_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={"ordering": ("-created_at", "-id")},
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["-created_at", "-id"], name="task_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="task_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="task_priority_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "priority", "-created_at", "-id"],
+                name="task_status_prio_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date"], name="task_due_date_idx"),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 3.2 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+def count_tasks(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskCounter = apps.get_model("tasks", "TaskCounter")
+    TaskDueDateCounter = apps.get_model("tasks", "TaskDueDateCounter")
+    db = schema_editor.connection.alias
+
+    tasks = Task.objects.using(db).order_by()
+    TaskCounter.objects.using(db).bulk_create(
+        TaskCounter(status=status, priority=priority, count=count)
+        for status, priority, count in tasks.values_list("status", "priority")
+        .annotate(count=models.Count("pk"))
+        .values_list("status", "priority", "count")
+    )
+    TaskDueDateCounter.objects.using(db).bulk_create(
+        TaskDueDateCounter(due_date=due_date, count=count)
+        for due_date, count in tasks.exclude(status="completed")
+        .values_list("due_date")
+        .annotate(count=models.Count("pk"))
+        .values_list("due_date", "count")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0004_task_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status", models.CharField(max_length=100)),
+                ("priority", models.CharField(max_length=100)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TaskDueDateCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("due_date", models.DateField(unique=True)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="taskcounter",
+            constraint=models.UniqueConstraint(
+                fields=("status", "priority"), name="task_counter_unique"
+            ),
+        ),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
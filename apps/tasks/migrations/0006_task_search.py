@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from apps.tasks.search import get_search_backend
+
+
+def install_search(apps, schema_editor):
+    get_search_backend(schema_editor.connection.alias).install(schema_editor)
+
+
+def uninstall_search(apps, schema_editor):
+    get_search_backend(schema_editor.connection.alias).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0005_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
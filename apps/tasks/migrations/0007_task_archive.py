@@ -0,0 +1,62 @@
+# Generated by Django 3.2 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0006_task_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskArchive",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=100)),
+                ("description", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("new", "new"),
+                            ("in progress", "in progress"),
+                            ("completed", "completed"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "low"),
+                            ("medium", "medium"),
+                            ("high", "high"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                ("due_date", models.DateField()),
+                ("created_at", models.DateField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ("-created_at", "-id"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="taskarchive",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="archive_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskarchive",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="archive_priority_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_task_archive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_due_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "due_date", "id"], name="task_status_due_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "due_date", "id"], name="task_priority_due_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskarchive",
+            index=models.Index(fields=["due_date", "id"], name="archive_due_date_idx"),
+        ),
+    ]
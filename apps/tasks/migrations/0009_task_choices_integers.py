@@ -0,0 +1,142 @@
+# Generated by Django 3.2 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+import apps.tasks.fields
+from apps.tasks.search import get_search_backend
+
+STATUSES = {"new": 1, "in progress": 2, "completed": 3}
+PRIORITIES = {"low": 1, "medium": 2, "high": 3}
+MODELS = ("Task", "TaskArchive", "TaskCounter")
+
+
+# Unknown values listed in the error of check_labels().
+MAX_LISTED_ROWS = 20
+
+
+def check_labels(apps, using):
+    """
+    Refuse to convert rows whose status or priority is not one of the
+    labels: they would stay text in an integer column on SQLite and make
+    the column type change fail on other databases.
+    """
+    unknown = []
+    for model_name in MODELS:
+        manager = apps.get_model("tasks", model_name)._base_manager.using(using)
+        for name, values in (("status", STATUSES), ("priority", PRIORITIES)):
+            rows = manager.exclude(**{f"{name}__in": list(values)})
+            for pk, value in rows.values_list("pk", name)[:MAX_LISTED_ROWS]:
+                unknown.append(f"{model_name} {pk}: {name}={value!r}")
+    if unknown:
+        raise ValueError(
+            "Cannot convert the status and priority of these rows to numbers, "
+            f"the known values being {', '.join(STATUSES)} and "
+            f"{', '.join(PRIORITIES)}. Update the tasks to known values (through "
+            "the ORM, which moves the counters too) and migrate again.\n"
+            + "\n".join(unknown)
+        )
+
+
+def convert(apps, schema_editor, to_numbers):
+    # Runs while the columns are text, before (or after, when reversed) they
+    # become integers; the numbers are converted along with the column type.
+    using = schema_editor.connection.alias
+    if to_numbers:
+        check_labels(apps, using)
+    for model_name in MODELS:
+        manager = apps.get_model("tasks", model_name)._base_manager.using(using)
+        for name, values in (("status", STATUSES), ("priority", PRIORITIES)):
+            for label, value in values.items():
+                old, new = (label, str(value)) if to_numbers else (str(value), label)
+                manager.filter(**{name: old}).update(**{name: new})
+
+
+def labels_to_numbers(apps, schema_editor):
+    convert(apps, schema_editor, to_numbers=True)
+
+
+def numbers_to_labels(apps, schema_editor):
+    convert(apps, schema_editor, to_numbers=False)
+
+
+def install_search(apps, schema_editor):
+    # Altering the columns of tasks_task rebuilds the table on SQLite, which
+    # drops the triggers keeping the search index up to date.
+    get_search_backend(schema_editor.connection.alias).install(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, install_search),
+        migrations.RunPython(labels_to_numbers, numbers_to_labels),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_priority_due_idx",
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "low"), (2, "medium"), (3, "high")]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="status",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "new"), (2, "in progress"), (3, "completed")]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskarchive",
+            name="priority",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "low"), (2, "medium"), (3, "high")]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskarchive",
+            name="status",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "new"), (2, "in progress"), (3, "completed")]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskcounter",
+            name="priority",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "low"), (2, "medium"), (3, "high")]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskcounter",
+            name="status",
+            field=apps.tasks.fields.LabeledChoicesField(
+                choices=[(1, "new"), (2, "in progress"), (3, "completed")]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "-due_date", "-id"], name="task_priority_due_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "priority", "-due_date", "-id"],
+                name="task_status_prio_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskarchive",
+            index=models.Index(
+                fields=["priority", "-due_date", "-id"], name="archive_priority_due_idx"
+            ),
+        ),
+        migrations.RunPython(install_search, migrations.RunPython.noop),
+    ]
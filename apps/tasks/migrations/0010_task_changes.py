@@ -0,0 +1,69 @@
+# Generated by Django 3.2 on 2026-10-18 18:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+from apps.tasks.search import get_search_backend
+
+
+def create_sequence(apps, schema_editor):
+    TaskChangeSequence = apps.get_model("tasks", "TaskChangeSequence")
+    TaskChangeSequence.objects.using(schema_editor.connection.alias).create(pk=1)
+
+
+def install_search(apps, schema_editor):
+    # Adding a column to tasks_task rebuilds the table on SQLite, which drops
+    # the triggers keeping the search index up to date.
+    get_search_backend(schema_editor.connection.alias).install(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_task_choices_integers"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, install_search),
+        migrations.CreateModel(
+            name="TaskChangeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last", models.BigIntegerField(default=0)),
+                ("purged", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("change_seq", models.BigIntegerField()),
+                ("archived", models.BooleanField(default=False)),
+                ("removed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["change_seq", "id"], name="task_change_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tasktombstone",
+            index=models.Index(
+                fields=["change_seq", "id"], name="tombstone_change_idx"
+            ),
+        ),
+        migrations.RunPython(create_sequence, migrations.RunPython.noop),
+        migrations.RunPython(install_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0010_task_changes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="taskarchive",
+            name="id",
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
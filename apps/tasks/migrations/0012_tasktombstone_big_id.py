@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0011_taskarchive_big_id"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tasktombstone",
+            name="id",
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0012_tasktombstone_big_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskImportCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=500, unique=True)),
+                ("offset", models.BigIntegerField(default=0)),
+                ("rows", models.BigIntegerField(default=0)),
+                ("imported", models.BigIntegerField(default=0)),
+                ("rejected", models.BigIntegerField(default=0)),
+                ("rejects_size", models.BigIntegerField(default=0)),
+                ("header", models.JSONField(null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,18 +1,258 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 
 from . import choices
+from .changes import add_tombstones, next_change_seq
+from .fields import LabeledChoicesField
+from .querysets import TaskQuerySet
+from .stats import COUNTED_FIELDS, TaskStatsDelta
 
 
 class Task(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField()
-    status = models.CharField(max_length=100, choices=choices.StatusChoices.choices)
-    priority = models.CharField(max_length=100, choices=choices.PriorityChoices.choices)
+    status = LabeledChoicesField(choices=choices.StatusChoices.choices)
+    priority = LabeledChoicesField(choices=choices.PriorityChoices.choices)
     due_date = models.DateField()
     created_at = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Sequence number of the last write to the task (see ``changes``).
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("-created_at", "-id")
+        indexes = [
+            # List endpoint: optional status/priority equality filters followed
+            # by the (-created_at, -id) keyset ordering used for pagination.
+            models.Index(fields=["-created_at", "-id"], name="task_created_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="task_status_created_idx",
+            ),
+            models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="task_priority_created_idx",
+            ),
+            models.Index(
+                fields=["status", "priority", "-created_at", "-id"],
+                name="task_status_prio_created_idx",
+            ),
+            # Admin due_date list filter (date ranges) and the list endpoint
+            # due_date orderings, alone or after a status or priority equality.
+            models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+            models.Index(
+                fields=["status", "due_date", "id"], name="task_status_due_idx"
+            ),
+            # Read backwards for the -priority ordering (most urgent first,
+            # then soonest due), alone or after a status equality.
+            models.Index(
+                fields=["priority", "-due_date", "-id"], name="task_priority_due_idx"
+            ),
+            models.Index(
+                fields=["status", "priority", "-due_date", "-id"],
+                name="task_status_prio_due_idx",
+            ),
+            # Change feed: the tasks written since a change sequence number.
+            models.Index(fields=["change_seq", "id"], name="task_change_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.title
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task with a new change sequence number and update the task
+        counters in the same transaction.
+        """
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        update_fields = kwargs.get("update_fields")
+        counted = update_fields is None or set(COUNTED_FIELDS) & set(update_fields)
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "change_seq"}
+
+        with transaction.atomic(using=using):
+            self.change_seq = next_change_seq(using)
+            if not counted:
+                return super().save(*args, **kwargs)
+
+            delta = TaskStatsDelta()
+            if self.pk is not None:
+                # The stored row, not the loaded one, is what was counted.
+                self.count_stored(delta, using)
+            super().save(*args, **kwargs)
+            delta.add(self.status, self.priority, self.due_date)
+            delta.apply(using)
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        Delete the task, leaving a tombstone, and update the task counters in
+        the same transaction.
+        """
+        using = using or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using):
+            change_seq = next_change_seq(using)
+            delta = TaskStatsDelta()
+            self.count_stored(delta, using)
+            pk = self.pk
+            deleted = super().delete(using=using, keep_parents=keep_parents)
+            if deleted[0]:
+                add_tombstones([pk], change_seq, using)
+            delta.apply(using)
+        return deleted
+
+    def count_stored(self, delta, using):
+        """
+        Lock the stored row of the task and remove it from ``delta``.
+
+        The row is read as is: PostgreSQL rejects FOR UPDATE on the GROUP BY
+        of ``TaskStatsDelta.add_queryset()``.
+        """
+        stored = (
+            Task._base_manager.using(using)
+            .filter(pk=self.pk)
+            .select_for_update()
+            .values_list(*COUNTED_FIELDS)
+            .first()
+        )
+        if stored is not None:
+            delta.add(*stored, n=-1)
+
+
+class TaskArchive(models.Model):
+    """
+    Completed tasks moved out of the Task table by ``manage.py archive_tasks``,
+    so the hot table only holds the tasks that are still worked on.
+
+    Archived tasks keep their id and timestamps and are read-only.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField()
+    status = LabeledChoicesField(choices=choices.StatusChoices.choices)
+    priority = LabeledChoicesField(choices=choices.PriorityChoices.choices)
+    due_date = models.DateField()
+    created_at = models.DateField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
 
     class Meta:
-        ordering = ("-created_at",)
+        ordering = ("-created_at", "-id")
+        indexes = [
+            # Same keyset ordering as Task, for lists including archived tasks.
+            models.Index(fields=["-created_at", "-id"], name="archive_created_idx"),
+            models.Index(
+                fields=["priority", "-created_at", "-id"],
+                name="archive_priority_created_idx",
+            ),
+            models.Index(fields=["due_date", "id"], name="archive_due_date_idx"),
+            models.Index(
+                fields=["priority", "-due_date", "-id"],
+                name="archive_priority_due_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks per status and priority, archived tasks included.
+
+    Maintained by every Task write path, in the write's own transaction;
+    ``manage.py rebuild_task_stats`` reconciles it with the tasks table.
+    """
+
+    status = LabeledChoicesField(choices=choices.StatusChoices.choices)
+    priority = LabeledChoicesField(choices=choices.PriorityChoices.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["status", "priority"], name="task_counter_unique"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.get_status_display()} / {self.get_priority_display()}: {self.count}"
+        )
+
+
+class TaskDueDateCounter(models.Model):
+    """
+    Number of open (not completed) tasks per due date, maintained like
+    TaskCounter.
+    """
+
+    due_date = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.due_date}: {self.count}"
+
+
+class TaskChangeSequence(models.Model):
+    """
+    Single row holding the last change sequence number handed out to a task
+    write, and the highest one of the purged tombstones (see ``changes``).
+    """
+
+    last = models.BigIntegerField(default=0)
+    purged = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.last} (purged up to {self.purged})"
+
+
+class TaskTombstone(models.Model):
+    """
+    Trace of a task removed from the Task table, deleted or archived, so the
+    change feed can tell clients to drop it. Keyed by the task id.
+
+    Kept until ``manage.py purge_tombstones`` deletes it.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    change_seq = models.BigIntegerField()
+    archived = models.BooleanField(default=False)
+    removed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Same keyset ordering as the Task change feed index.
+            models.Index(fields=["change_seq", "id"], name="tombstone_change_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id} ({'archived' if self.archived else 'deleted'})"
+
+
+class TaskImportCheckpoint(models.Model):
+    """
+    Progress of a ``manage.py import_tasks`` run, saved in the transaction of
+    every batch it inserts: an interrupted import resumes right after the
+    last batch committed, never inserting one twice.
+
+    Deleted once the import is complete.
+    """
+
+    # The absolute path of the imported file, unless named otherwise.
+    name = models.CharField(max_length=500, unique=True)
+    # File position and number of the last row imported.
+    offset = models.BigIntegerField(default=0)
+    rows = models.BigIntegerField(default=0)
+    imported = models.BigIntegerField(default=0)
+    rejected = models.BigIntegerField(default=0)
+    # Size of the reject file once the batch's rejected rows were written.
+    rejects_size = models.BigIntegerField(default=0)
+    # Column names of a CSV file.
+    header = models.JSONField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} (row {self.rows})"
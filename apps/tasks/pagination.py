@@ -0,0 +1,341 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict, namedtuple
+from functools import reduce
+from operator import attrgetter, or_
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .changes import get_change_sequence
+
+Cursor = namedtuple("Cursor", ["position", "reverse"])
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "The changes since this cursor are no longer available; "
+        "sync again without a cursor."
+    )
+    default_code = "cursor_expired"
+
+
+def _positive_int(integer_string, cutoff=None):
+    """
+    Cast a string to a strictly positive integer, capped at ``cutoff``.
+    """
+    ret = int(integer_string)
+    if ret <= 0:
+        raise ValueError()
+    if cutoff:
+        return min(ret, cutoff)
+    return ret
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Keyset pagination for tasks.
+
+    The cursor is an opaque token holding the ordering values of the row
+    that bounds the page, so each page is fetched with an indexed range
+    condition and a LIMIT instead of an OFFSET. Page N costs the same as
+    page 1.
+
+    ``ordering`` may be set on the instance to any keyset ordering ending
+    with a unique field.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate the union of ``querysets`` (e.g. the hot and archive task
+        tables) as one list.
+
+        Each queryset fetches its own keyset page with its own index; the
+        pages are merged in memory, so no UNION query is needed.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, querysets[0].model)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+        # Fetch one extra row to find out whether there is a following page.
+        results = self.fetch(querysets, position, self.page_size + 1, reverse)
+
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        # A page that ran past the end of the data has no row to anchor on.
+        if not self.page:
+            self.has_next = self.has_previous = False
+
+        return self.page
+
+    def fetch(self, querysets, position, limit, reverse=False):
+        """
+        Return the first ``limit`` rows of ``querysets`` merged in the
+        (possibly reversed) ordering, after ``position`` if it is not None.
+        """
+        ordering = self.get_ordering(reverse)
+        results = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*ordering)
+            if position is not None:
+                queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+            results.extend(queryset[:limit])
+        if len(querysets) > 1:
+            self.sort(results, ordering)
+            del results[limit:]
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                cutoff=settings.TASKS_MAX_PAGE_SIZE,
+            )
+        except (KeyError, ValueError):
+            return settings.TASKS_PAGE_SIZE
+
+    def get_ordering(self, reverse=False):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith("-") else "-" + field
+            for field in self.ordering
+        )
+
+    def sort(self, rows, ordering):
+        # Stable sorts from the last ordering field to the first.
+        for field in reversed(ordering):
+            rows.sort(key=attrgetter(field.lstrip("-")), reverse=field.startswith("-"))
+
+    def get_keyset_filter(self, position, reverse=False):
+        """
+        Build the row-value comparison ``(a, b, ...) > (x, y, ...)`` that
+        selects rows after ``position`` in the (possibly reversed) ordering.
+
+        The expanded OR is prefixed with an inclusive range on the leading
+        column so the planner can seek into the ordering index instead of
+        merging several index lookups and sorting the result.
+        """
+        clauses = []
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            lookup = "%s__%s" % (name, "lt" if descending else "gt")
+            equal = {
+                f.lstrip("-"): position[i] for i, f in enumerate(self.ordering[:index])
+            }
+            clauses.append(Q(**equal, **{lookup: position[index]}))
+
+        leading = self.ordering[0]
+        descending = leading.startswith("-") != reverse
+        bound = "%s__%s" % (leading.lstrip("-"), "lte" if descending else "gte")
+        return Q(**{bound: position[0]}) & reduce(or_, clauses)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(self.get_position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(self.get_position(self.page[0]), True))
+
+    def get_position_fields(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def get_position(self, instance):
+        return tuple(getattr(instance, field) for field in self.get_position_fields())
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        return self.parse_cursor(encoded, model)
+
+    def parse_cursor(self, encoded, model):
+        """
+        Decode a cursor token, as found in the links and ``encode_token()``.
+
+        Raises:
+        - NotFound: Invalid token.
+        """
+        try:
+            tokens = self.decode_tokens(encoded)
+            values = tokens["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError()
+            position = tuple(
+                self.to_python(model, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+            )
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(position=position, reverse=reverse)
+
+    def decode_tokens(self, encoded):
+        querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+        return parse.parse_qs(querystring, keep_blank_values=True)
+
+    def to_python(self, model, name, value):
+        """
+        Convert a cursor value back to the type of the ordering field ``name``.
+        """
+        return model._meta.get_field(name).to_python(value)
+
+    def encode_cursor(self, cursor):
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_token(cursor)
+        )
+
+    def encode_token(self, cursor, **extra):
+        tokens = {"p": [str(value) for value in cursor.position], **extra}
+        if cursor.reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens, doseq=True)
+        return b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+class TaskSearchPagination(TaskCursorPagination):
+    """
+    Keyset pagination for search results: best match first, then newest.
+
+    Requires the ``rank`` annotation added by ``search.search_tasks()``.
+    """
+
+    ordering = ("rank", "-created_at", "-id")
+
+    def to_python(self, model, name, value):
+        if name == "rank":
+            return float(value)
+        return super().to_python(model, name, value)
+
+
+class TaskChangesPagination(TaskCursorPagination):
+    """
+    Keyset pagination of the change feed, in change sequence order, forward
+    only.
+
+    The cursor goes in ``?since=``. Every page returns the cursor to send
+    next, even past the last change, so a client syncs again from where it
+    stopped. A cursor older than the purged tombstones gets a 410.
+
+    A first sync (without a cursor) only needs the tombstones of the tasks
+    removed after it started, so its cursors carry the sequence number it
+    started at as a ``floor`` and do not expire before reaching it.
+
+    The task and tombstone tables are read by two queries, and a write can
+    commit between them. Both are bounded by the sequence number read before
+    them, ``last``, so a page never lists a change without the earlier ones
+    it could have missed.
+    """
+
+    cursor_query_param = "since"
+    ordering = ("change_seq", "id")
+    floor = 0
+    last = None
+
+    def fetch(self, querysets, position, limit, reverse=False):
+        if self.last is not None:
+            querysets = [
+                queryset.filter(change_seq__lte=self.last) for queryset in querysets
+            ]
+        return super().fetch(querysets, position, limit, reverse)
+
+    def decode_cursor(self, request, model):
+        return self.decode_since(
+            request.query_params.get(self.cursor_query_param), model
+        )
+
+    def decode_since(self, encoded, model):
+        """
+        Decode a ``since`` cursor, or return None without one.
+
+        Raises:
+        - NotFound: Invalid cursor.
+        - CursorExpired: The cursor is older than the purged tombstones.
+        """
+        self.last, purged = get_change_sequence(model.objects.db)
+        if encoded is None:
+            self.floor = self.last
+            return None
+        cursor = self.parse_cursor(encoded, model)
+        try:
+            tokens = self.decode_tokens(encoded)
+            self.floor = int(tokens.get("f", ["0"])[0])
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if max(cursor.position[0], self.floor) < purged:
+            raise CursorExpired()
+        return cursor._replace(reverse=False)
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("since", self.get_since()),
+                ("next", self.get_next_link()),
+                *data.items(),
+            ]
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.get_since()
+        )
+
+    def get_since(self):
+        """
+        Cursor following the page: its last change, or the request's cursor
+        when there were no changes.
+        """
+        if self.page:
+            position = self.get_position(self.page[-1])
+        elif self.cursor is not None:
+            position = self.cursor.position
+        else:
+            position = (0, 0)
+        extra = {"f": str(self.floor)} if self.floor > position[0] else {}
+        return self.encode_token(Cursor(position, False), **extra)
@@ -0,0 +1,241 @@
+from django.db import models, transaction
+from django.utils import timezone
+
+from .changes import add_tombstones, next_change_seq
+from .signals import tasks_bulk_changed
+from .stats import COUNTED_FIELDS, TaskStatsDelta, rebuild_task_stats
+
+
+class TaskQuerySet(models.QuerySet):
+    """
+    QuerySet for the Task model.
+
+    The bulk write methods bypass the per-instance ``post_save`` and
+    ``post_delete`` signals, so each of them sends a single
+    ``tasks_bulk_changed`` signal instead. Updates also refresh
+    ``updated_at``, which ``auto_now`` only does on ``save()``.
+
+    Every write also updates the task counters (see ``stats``) and gives the
+    rows it changes a new change sequence number, or tombstones for the rows
+    it removes (see ``changes``), in its own transaction.
+    """
+
+    # Cleared on the queryset that Django's bulk_update() runs its update()
+    # on, since bulk_update() already counted the change.
+    _count_stats = True
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._count_stats = self._count_stats
+        return clone
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            change_seq = next_change_seq(self.db)
+            for obj in objs:
+                obj.change_seq = change_seq
+            objs = super().bulk_create(objs, *args, **kwargs)
+            delta = TaskStatsDelta()
+            for obj in objs:
+                delta.add(obj.status, obj.priority, obj.due_date)
+            delta.apply(self.db)
+        if objs:
+            self._send_bulk_changed("create", objs=objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        fields = {*fields, "updated_at", "change_seq"}
+        with transaction.atomic(using=self.db):
+            change_seq = next_change_seq(self.db)
+            for obj in objs:
+                obj.change_seq = change_seq
+            delta = TaskStatsDelta()
+            if fields & set(COUNTED_FIELDS):
+                self._count_bulk_update(delta, objs, fields)
+            queryset = self._chain()
+            queryset._count_stats = False
+            super(TaskQuerySet, queryset).bulk_update(objs, fields, *args, **kwargs)
+            delta.apply(self.db)
+        if objs:
+            self._send_bulk_changed("update", objs=objs, fields=list(fields))
+
+    bulk_update.alters_data = True
+
+    def _count_bulk_update(self, delta, objs, fields, batch_size=500):
+        """
+        Move the counts of ``objs`` from their stored values to the values
+        ``bulk_update(objs, fields)`` is about to write.
+        """
+        objs = {obj.pk: obj for obj in objs}
+        pks = list(objs)
+        for start in range(0, len(pks), batch_size):
+            rows = (
+                self.model._base_manager.using(self.db)
+                .filter(pk__in=pks[start : start + batch_size])
+                .select_for_update()
+                .values_list("pk", *COUNTED_FIELDS)
+            )
+            for pk, *values in rows:
+                values = dict(zip(COUNTED_FIELDS, values))
+                delta.add(n=-1, **values)
+                for field in fields & values.keys():
+                    values[field] = getattr(objs[pk], field)
+                delta.add(**values)
+
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", timezone.now())
+        if not self._count_stats:
+            return super().update(**kwargs)
+        for name in ("status", "priority"):
+            if name in kwargs:
+                # Count the stored value, not the label it may be given as.
+                field = self.model._meta.get_field(name)
+                kwargs[name] = field.from_label(kwargs[name])
+        changes = {field: kwargs[field] for field in COUNTED_FIELDS if field in kwargs}
+        with transaction.atomic(using=self.db):
+            kwargs["change_seq"] = next_change_seq(self.db)
+            delta = TaskStatsDelta()
+            rebuild = any(
+                hasattr(value, "resolve_expression") for value in changes.values()
+            )
+            if changes and not rebuild:
+                delta.move_queryset(self, **changes)
+            rows = super().update(**kwargs)
+            delta.apply(self.db)
+            if rows and rebuild:
+                # Expressions cannot be evaluated here; recount everything.
+                rebuild_task_stats(using=self.db)
+        if rows:
+            self._send_bulk_changed("update", fields=[*kwargs])
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        """
+        Delete the records in a single statement.
+
+        Tasks have no dependent rows, so the collector, which would otherwise
+        load every row to send ``post_delete`` for it, is skipped.
+        """
+        assert not self.query.is_sliced, "Cannot use 'limit' or 'offset' with delete."
+        if self.query.distinct or self.query.distinct_fields:
+            raise TypeError("Cannot call delete() after .distinct().")
+        if self._fields is not None:
+            raise TypeError("Cannot call delete() after .values() or .values_list()")
+
+        del_query = self._chain()
+        del_query._for_write = True
+        del_query.query.select_for_update = False
+        del_query.query.select_related = False
+        del_query.query.clear_ordering(force_empty=True)
+
+        with transaction.atomic(using=del_query.db):
+            change_seq = next_change_seq(del_query.db)
+            pks = list(del_query.values_list("pk", flat=True))
+            delta = TaskStatsDelta()
+            delta.add_queryset(del_query, n=-1)
+            deleted = del_query._raw_delete(del_query.db)
+            add_tombstones(pks, change_seq, del_query.db)
+            delta.apply(del_query.db)
+        self._result_cache = None
+        if deleted:
+            self._send_bulk_changed("delete")
+        return deleted, {self.model._meta.label: deleted}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def delete_in_batches(self, batch_size):
+        """
+        Delete the tasks of this queryset in primary key ranges of at most
+        ``batch_size`` rows, committing each range in its own transaction so a
+        large delete never holds long locks or builds one huge transaction.
+
+        Yields the running total of deleted tasks after every batch.
+        """
+        queryset = self.order_by()
+        last_pk = None
+        total = 0
+
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            # The upper bound of the next range is the pk of its last row.
+            upper = batch.order_by("pk").values_list("pk", flat=True)[
+                batch_size - 1 : batch_size
+            ]
+            upper = next(iter(upper), None)
+
+            with transaction.atomic(using=self.db):
+                if upper is None:
+                    deleted, _ = batch.delete()
+                else:
+                    deleted, _ = batch.filter(pk__lte=upper).delete()
+
+            total += deleted
+            if deleted:
+                yield total
+            if upper is None:
+                break
+            last_pk = upper
+
+    def archive_in_batches(self, batch_size):
+        """
+        Move the tasks of this queryset to the TaskArchive table in primary
+        key order, at most ``batch_size`` rows per transaction.
+
+        Archived tasks keep their id and stay in the task counters; they
+        leave tombstones marked ``archived`` in the change feed. Task ids are
+        never reused, but a rebuild of the task table can reset their
+        counter: a task whose id is already archived raises an IntegrityError
+        and its batch is rolled back, leaving the task in place.
+
+        Yields the running total of archived tasks after every batch.
+        """
+        from .models import TaskArchive
+
+        queryset = self.order_by()
+        fields = [
+            field.attname
+            for field in TaskArchive._meta.concrete_fields
+            if field.attname != "archived_at"
+        ]
+        last_pk = 0
+        total = 0
+
+        while True:
+            with transaction.atomic(using=self.db):
+                change_seq = next_change_seq(self.db)
+                rows = list(
+                    queryset.filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .select_for_update()
+                    .values(*fields)[:batch_size]
+                )
+                if not rows:
+                    break
+                archived_at = timezone.now()
+                TaskArchive.objects.using(self.db).bulk_create(
+                    TaskArchive(archived_at=archived_at, **row) for row in rows
+                )
+                pks = [row["id"] for row in rows]
+                # A move, not a delete: the counters are left as they are.
+                self.model._base_manager.using(self.db).filter(pk__in=pks)._raw_delete(
+                    self.db
+                )
+                add_tombstones(pks, change_seq, self.db, archived=True)
+
+            total += len(rows)
+            last_pk = pks[-1]
+            self._send_bulk_changed("archive")
+            yield total
+
+    def _send_bulk_changed(self, action, **kwargs):
+        tasks_bulk_changed.send(
+            sender=self.model, action=action, using=self.db, **kwargs
+        )
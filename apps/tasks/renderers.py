@@ -0,0 +1,212 @@
+import itertools
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+from .choices import PriorityChoices, StatusChoices
+
+# Rows are grouped into writes of roughly this many bytes when streaming, so a
+# large export is not flushed to the socket one tiny chunk per row.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def buffered(chunks, size=STREAM_BUFFER_SIZE):
+    """
+    Regroup an iterable of byte strings into chunks of at least ``size`` bytes.
+    """
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b"".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that can also write a list as an incrementally built array.
+    """
+
+    def render_stream(self, rows, renderer_context=None):
+        """
+        Render an iterable of rows into a JSON array, one chunk at a time.
+        """
+        render_row = super().render
+
+        def chunks():
+            yield b"["
+            for index, row in enumerate(rows):
+                if index:
+                    yield b","
+                yield render_row(row, renderer_context=renderer_context)
+            yield b"]"
+
+        return buffered(chunks())
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Renderer for newline delimited JSON: one compact JSON document per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, list):
+            data = [data]
+        return b"".join(self.render_stream(data, renderer_context))
+
+    def render_stream(self, rows, renderer_context=None):
+        """
+        Render an iterable of rows into NDJSON, one chunk at a time.
+        """
+        render_row = super().render
+        return buffered(
+            render_row(row, renderer_context=renderer_context) + b"\n" for row in rows
+        )
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for Server-Sent Events (``text/event-stream``). The views
+    stream their events themselves with ``render_event()``; data rendered
+    through the renderer (errors) is sent as a single ``error`` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return self.render_event("error", data)
+
+    @staticmethod
+    def render_event(event=None, data=None, id=None, retry=None):
+        """
+        Render an event; ``data`` is sent as compact JSON. Without an event
+        name or data, the fields only update the client's last event id or
+        reconnection delay.
+        """
+        lines = []
+        if retry is not None:
+            lines.append(f"retry: {retry}")
+        if id is not None:
+            lines.append(f"id: {id}")
+        if event is not None:
+            lines.append(f"event: {event}")
+        if data is not None:
+            lines.append(
+                "data: "
+                + json.dumps(data, separators=(",", ":"), cls=encoders.JSONEncoder)
+            )
+        return ("\n".join(lines) + "\n\n").encode()
+
+    @staticmethod
+    def render_comment(text=""):
+        """
+        Render a comment line, ignored by clients: a heartbeat.
+        """
+        return f": {text}\n\n".encode()
+
+
+class ColumnarRenderer(JSONRenderer):
+    """
+    Compact JSON renderer writing a list of tasks as a table: the column names
+    once, then one array of values per row. Status and priority are written
+    as indexes into the ``dictionaries`` sent along with the columns; values
+    missing from a dictionary are written as they are.
+
+    Lists are rendered as ``{"columns", "dictionaries", "rows"}`` and
+    paginated responses get their ``results`` rendered that way. Anything
+    else (single tasks, errors) is rendered as plain JSON.
+    """
+
+    media_type = "application/vnd.tms.columnar+json"
+    format = "columnar"
+    dictionaries = {
+        "status": StatusChoices.labels,
+        "priority": PriorityChoices.labels,
+    }
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list):
+            data = self.get_table(data, renderer_context)
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {
+                **data,
+                "results": self.get_table(data["results"], renderer_context),
+            }
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def render_stream(self, rows, renderer_context=None):
+        """
+        Render an iterable of rows into a table, one chunk at a time.
+        """
+        render_row = super().render
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is not None:
+            rows = itertools.chain([first], rows)
+        columns = self.get_columns(first, renderer_context)
+
+        def chunks():
+            # Drop the closing brace of the header to append the rows to it.
+            header = render_row(
+                self.get_header(columns), renderer_context=renderer_context
+            )
+            yield header[:-1] + b',"rows":['
+            for index, values in enumerate(self.encode_rows(rows, columns)):
+                if index:
+                    yield b","
+                yield render_row(values, renderer_context=renderer_context)
+            yield b"]}"
+
+        return buffered(chunks())
+
+    def get_columns(self, row, renderer_context=None):
+        """
+        Column names: the fields of the view's ``list_serializer`` if it has
+        one, otherwise the keys of ``row``.
+        """
+        view = (renderer_context or {}).get("view")
+        serializer = getattr(view, "list_serializer", None)
+        if serializer is not None:
+            return list(serializer.field_names)
+        return list(row) if row else []
+
+    def get_header(self, columns):
+        return {
+            "columns": columns,
+            "dictionaries": {
+                name: values
+                for name, values in self.dictionaries.items()
+                if name in columns
+            },
+        }
+
+    def get_table(self, rows, renderer_context=None):
+        columns = self.get_columns(rows[0] if rows else None, renderer_context)
+        table = self.get_header(columns)
+        table["rows"] = list(self.encode_rows(rows, columns))
+        return table
+
+    def encode_rows(self, rows, columns):
+        encoders = [
+            (columns.index(name), {value: index for index, value in enumerate(values)})
+            for name, values in self.dictionaries.items()
+            if name in columns
+        ]
+        for row in rows:
+            values = [row.get(column) for column in columns]
+            for position, indexes in encoders:
+                values[position] = indexes.get(values[position], values[position])
+            yield values
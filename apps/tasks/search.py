@@ -0,0 +1,205 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Longer queries are cut to this many terms.
+MAX_TERMS = 16
+
+
+def get_terms(query):
+    """
+    Split a free text query into the word terms that are searched for.
+
+    Everything but word characters is dropped, so the terms are safe to put
+    in a backend query syntax and a query can never be a syntax error.
+    """
+    return re.findall(r"\w+", query or "")[:MAX_TERMS]
+
+
+class SearchBackend:
+    """
+    Full-text search over the title and description of tasks.
+
+    Every term must match the start of a word of the title or description.
+    ``search()`` also annotates ``rank``, the relevance of each match, where a
+    lower rank is a better match.
+    """
+
+    def install(self, schema_editor):
+        """
+        Create the text index and whatever keeps it in sync with task writes.
+        Safe to run again, e.g. after a migration rebuilt the tasks table.
+        """
+
+    def uninstall(self, schema_editor):
+        """
+        Drop what ``install()`` created.
+        """
+
+    def filter(self, queryset, query):
+        """
+        Return the tasks of ``queryset`` that match ``query``.
+        """
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        return self.filter_terms(queryset, terms)
+
+    def search(self, queryset, query):
+        """
+        Like ``filter()``, with the matches annotated with their ``rank``.
+        """
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+        return self.filter_terms(queryset, terms).annotate(
+            rank=self.get_rank(queryset, terms)
+        )
+
+    def filter_terms(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+    def get_rank(self, queryset, terms):
+        return Value(0.0, output_field=FloatField())
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Search backed by an external content FTS5 table, kept in sync with the
+    tasks table by triggers and ranked with bm25 (title matches weigh more).
+    """
+
+    table = "tasks_task_fts"
+    install_sql = [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            title, description, content='tasks_task', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON tasks_task
+        BEGIN
+            INSERT INTO {table}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON tasks_task
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_update
+        AFTER UPDATE OF id, title, description ON tasks_task
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {table}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """,
+        # Index the rows that were written while the triggers were missing.
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+    uninstall_sql = [
+        f"DROP TRIGGER IF EXISTS {table}_insert",
+        f"DROP TRIGGER IF EXISTS {table}_delete",
+        f"DROP TRIGGER IF EXISTS {table}_update",
+        f"DROP TABLE IF EXISTS {table}",
+    ]
+
+    def install(self, schema_editor):
+        for sql in self.install_sql:
+            schema_editor.execute(sql)
+
+    def uninstall(self, schema_editor):
+        for sql in self.uninstall_sql:
+            schema_editor.execute(sql)
+
+    def get_match(self, terms):
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def filter_terms(self, queryset, terms):
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s",
+                (self.get_match(terms),),
+            )
+        )
+
+    def get_rank(self, queryset, terms):
+        return RawSQL(
+            f"SELECT bm25({self.table}, 5.0, 1.0) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = {queryset.model._meta.db_table}.id",
+            (self.get_match(terms),),
+            output_field=FloatField(),
+        )
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    Search backed by a GIN index on the English text search vector of the
+    title and description, ranked with ts_rank.
+    """
+
+    index = "tasks_task_search_idx"
+    document = "to_tsvector('english', title || ' ' || description)"
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.index} ON tasks_task "
+            f"USING GIN (({self.document}))"
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {self.index}")
+
+    def get_tsquery(self, terms):
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def filter_terms(self, queryset, terms):
+        return queryset.alias(
+            matches=RawSQL(
+                f"{self.document} @@ to_tsquery('english', %s)",
+                (self.get_tsquery(terms),),
+                output_field=BooleanField(),
+            )
+        ).filter(matches=True)
+
+    def get_rank(self, queryset, terms):
+        return RawSQL(
+            f"-ts_rank({self.document}, to_tsquery('english', %s))",
+            (self.get_tsquery(terms),),
+            output_field=FloatField(),
+        )
+
+
+backends = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend(using="default"):
+    """
+    Return the search backend for the database ``using``. Databases without a
+    dedicated backend fall back to (unindexed) ``icontains`` lookups.
+    """
+    return backends.get(connections[using].vendor, SearchBackend)()
+
+
+def search_tasks(queryset, query):
+    """
+    Filter ``queryset`` to the tasks matching ``query``, annotated with their
+    ``rank`` (lower is better).
+    """
+    return get_search_backend(queryset.db).search(queryset, query)
@@ -1,13 +1,102 @@
-from rest_framework import serializers
+from django.conf import settings
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
+from . import choices
+from .fields import LabeledChoiceField
 from .models import Task
+from .timing import timed
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    List serializer for the Task model.
+
+    Every item is validated independently and the per-item errors are kept in
+    ``item_errors``. When the ``partial_success`` context flag is set, invalid
+    items are dropped instead of failing the whole list. Valid items are
+    inserted with batched ``bulk_create`` calls.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(
+                input_type=type(data).__name__
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list"
+            )
+
+        if not data:
+            message = self.error_messages["empty"]
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="empty"
+            )
+
+        max_length = settings.TASKS_BULK_MAX_ITEMS
+        if len(data) > max_length:
+            message = self.error_messages["max_length"].format(max_length=max_length)
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="max_length"
+            )
+
+        ret = []
+        self.item_errors = []
+
+        for item in data:
+            try:
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                self.item_errors.append(exc.detail)
+            else:
+                ret.append(validated)
+                self.item_errors.append({})
+
+        if any(self.item_errors) and not self.context.get("partial_success"):
+            raise serializers.ValidationError(self.item_errors)
+
+        return ret
+
+    def create(self, validated_data):
+        tasks = [Task(**attrs) for attrs in validated_data]
+        return Task.objects.bulk_create(
+            tasks, batch_size=settings.TASKS_BULK_BATCH_SIZE
+        )
+
+    def update(self, instance, validated_data):
+        """
+        Apply one payload per task; ``instance`` is the list of tasks in the
+        same order as the submitted items.
+        """
+        fields = set()
+        for task, attrs in zip(instance, validated_data):
+            for attr, value in attrs.items():
+                setattr(task, attr, value)
+            fields.update(attrs)
+
+        if fields:
+            Task.objects.bulk_update(
+                instance, fields, batch_size=settings.TASKS_BULK_BATCH_SIZE
+            )
+        return instance
 
 
 class TaskSerializer(serializers.ModelSerializer):
     """
     Serializer for the Task model.
+
+    ``fields`` restricts the serialized fields to the given names.
     """
 
+    status = LabeledChoiceField(choices.StatusChoices)
+    priority = LabeledChoiceField(choices.PriorityChoices)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Task
         fields = (
@@ -20,3 +109,187 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_at",
         )
         read_only_fields = ("id", "created_at")
+        list_serializer_class = TaskListSerializer
+
+    @timed("serialize")
+    def to_internal_value(self, data):
+        return super().to_internal_value(data)
+
+    @timed("serialize")
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+def _none_safe(convert):
+    def to_representation(value):
+        return None if value is None else convert(value)
+
+    return to_representation
+
+
+class FastTaskSerializer:
+    """
+    Read-only fast path producing exactly the output of ``serializer_class``.
+
+    Rows come from ``values_list()`` instead of model instances and are
+    turned into dicts with a single ``dict(zip())`` each; only the columns
+    whose representation differs from the database value (dates, non-trivial
+    choices) go through a converter.
+    """
+
+    def __init__(self, serializer_class=None, fields=None):
+        fields = (serializer_class or TaskSerializer)(fields=fields)._readable_fields
+        self.field_names = []
+        self.columns = []
+        self.converters = []
+        for field in fields:
+            self.field_names.append(field.field_name)
+            self.columns.append(field.source)
+            converter = self.get_converter(field)
+            if converter is not None:
+                self.converters.append((field.field_name, _none_safe(converter)))
+
+    def get_converter(self, field):
+        """
+        Return a function mapping a column value to its representation, or
+        None when the value is already its own representation.
+        """
+        if isinstance(field, LabeledChoiceField):
+            labels = field.labels
+            return lambda value: labels.get(value, value)
+        if isinstance(field, serializers.ChoiceField):
+            mapping = field.choice_strings_to_values
+            if all(key == value for key, value in mapping.items()):
+                return None
+            return lambda value: mapping.get(str(value), value)
+        if type(field) in (serializers.IntegerField, serializers.CharField):
+            return None
+        if type(field) is serializers.DateField:
+            output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                return lambda value: value.isoformat()
+        return field.to_representation
+
+    def get_queryset(self, queryset, *extra):
+        """
+        Turn ``queryset`` into named rows holding the serialized columns
+        followed by the ``extra`` ones (which are not serialized). Only these
+        columns are selected.
+        """
+        extra = [name for name in dict.fromkeys(extra) if name not in self.columns]
+        return queryset.values_list(*self.columns, *extra, named=True)
+
+    @timed("serialize")
+    def to_representation(self, rows):
+        return list(self.iter_representation(rows))
+
+    def iter_representation(self, rows):
+        field_names = self.field_names
+        converters = self.converters
+        for row in rows:
+            item = dict(zip(field_names, row))
+            for name, convert in converters:
+                item[name] = convert(item[name])
+            yield item
+
+
+def get_sparse_fields(query_params):
+    """
+    Parse the ``fields`` and ``exclude`` query parameters (comma-separated
+    TaskSerializer field names) into the tuple of fields to return, in their
+    declared order, or None when neither is given.
+
+    Raises:
+    - ValidationError: Unknown field names, or no field left.
+    """
+    declared = TaskSerializer.Meta.fields
+    requested = {}
+    for param in ("fields", "exclude"):
+        value = query_params.get(param)
+        if value is None:
+            continue
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = sorted(names - set(declared))
+        if unknown:
+            raise serializers.ValidationError(
+                {param: [f"Unknown fields: {', '.join(unknown)}."]}
+            )
+        requested[param] = names
+    if not requested:
+        return None
+
+    selected = requested.get("fields", declared)
+    excluded = requested.get("exclude", ())
+    fields = tuple(
+        name for name in declared if name in selected and name not in excluded
+    )
+    if not fields:
+        raise serializers.ValidationError(
+            {"fields": ["At least one field must be selected."]}
+        )
+    return fields
+
+
+class TaskBulkFilterSerializer(serializers.Serializer):
+    """
+    Serializer for the filter selecting the tasks of a bulk operation.
+    """
+
+    status = LabeledChoiceField(choices.StatusChoices, required=False)
+    priority = LabeledChoiceField(choices.PriorityChoices, required=False)
+    due_after = serializers.DateField(required=False, help_text="Due on or after")
+    due_before = serializers.DateField(required=False, help_text="Due on or before")
+
+    lookups = {
+        "status": "status",
+        "priority": "priority",
+        "due_after": "due_date__gte",
+        "due_before": "due_date__lte",
+    }
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("At least one filter is required.")
+        if "due_after" in attrs and "due_before" in attrs:
+            if attrs["due_after"] > attrs["due_before"]:
+                raise serializers.ValidationError(
+                    "due_after must not be later than due_before."
+                )
+        return attrs
+
+    @classmethod
+    def filter_queryset(cls, queryset, filters):
+        """
+        Restrict ``queryset`` to the tasks matching the validated ``filters``.
+        """
+        return queryset.filter(
+            **{cls.lookups[name]: value for name, value in filters.items()}
+        )
+
+
+class TaskBulkSetUpdateSerializer(serializers.Serializer):
+    """
+    Serializer for a filter-based bulk update: the tasks matching ``filter``
+    get the field values in ``set``.
+    """
+
+    filter = TaskBulkFilterSerializer()
+    set = serializers.DictField()
+
+    def validate_set(self, value):
+        writable = {
+            name
+            for name, field in TaskSerializer().fields.items()
+            if not field.read_only
+        }
+        if not value:
+            raise serializers.ValidationError("At least one field is required.")
+        unknown = sorted(set(value) - writable)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown or read-only fields: {', '.join(unknown)}."
+            )
+
+        serializer = TaskSerializer(data=value, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
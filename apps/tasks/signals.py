@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import ModelSignal, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import get_token_user_id, user_cache
+from .cache import task_cache
+from .timing import install_query_timer
+
+# Sent once by the TaskQuerySet bulk writes (bulk_create, bulk_update, update
+# and delete) and archive_in_batches(), which do not send the per-instance
+# model signals. Arguments: ``sender`` (the model), ``action`` ("create",
+# "update", "delete" or "archive"), ``using`` and, where available, ``objs``
+# and ``fields``.
+tasks_bulk_changed = ModelSignal(use_caching=True)
+
+
+@receiver(post_save, sender="tasks.Task")
+@receiver(post_delete, sender="tasks.Task")
+@receiver(tasks_bulk_changed, sender="tasks.Task")
+def invalidate_task_cache(sender, using=None, **kwargs):
+    """
+    Bump the cache generation so no cached task response outlives a write.
+
+    The generation is bumped right away, so reads inside the writing
+    transaction miss, and again on commit, so a response cached from the
+    pre-commit state by a concurrent request is dropped as well.
+    """
+    task_cache.bump_generation()
+    transaction.on_commit(task_cache.bump_generation, using=using)
+
+
+@receiver(post_save, sender="tasks.Task")
+@receiver(post_delete, sender="tasks.Task")
+@receiver(tasks_bulk_changed, sender="tasks.Task")
+def notify_task_events(sender, using=None, **kwargs):
+    """
+    Wake the task event streams of this process up once the write commits.
+    """
+    from .events import task_event_hub
+
+    transaction.on_commit(task_event_hub.notify, using=using)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop a saved (e.g. deactivated) or deleted user from the authentication
+    cache. Queryset updates send no signal and wait for the entry to expire.
+    """
+    user_cache.invalidate(get_token_user_id(instance))
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    """
+    Time the queries of the requests sampled by the ServerTimingMiddleware.
+    """
+    install_query_timer(connection)
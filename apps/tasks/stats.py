@@ -0,0 +1,182 @@
+import datetime
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from .choices import PriorityChoices, StatusChoices
+
+# Fields of a task that the counters depend on.
+COUNTED_FIELDS = ("status", "priority", "due_date")
+
+
+def is_open(status):
+    return status != StatusChoices.COMPLETED
+
+
+def to_date(value):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+class TaskStatsDelta:
+    """
+    Pending changes to the task counters, applied in one go with ``apply()``.
+
+    ``counts`` is keyed by (status, priority) and ``due_dates`` by the due
+    date of open (not completed) tasks. Additions and removals of the same
+    key cancel out, so unchanged counters are never written.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.due_dates = Counter()
+
+    def add(self, status, priority, due_date, n=1):
+        self.counts[(status, priority)] += n
+        if is_open(status):
+            self.due_dates[to_date(due_date)] += n
+
+    def add_queryset(self, queryset, n=1):
+        """
+        Add ``n`` times the rows of ``queryset``, counted with one GROUP BY.
+        """
+        for values, count in self.group(queryset):
+            self.add(n=n * count, **values)
+
+    def move_queryset(self, queryset, **changes):
+        """
+        Move the rows of ``queryset`` to the counters they will have after
+        ``queryset.update(**changes)``. Must run before the update.
+        """
+        for values, count in self.group(queryset):
+            self.add(n=-count, **values)
+            self.add(n=count, **{**values, **changes})
+
+    @staticmethod
+    def group(queryset):
+        queryset = queryset.order_by()
+        # GROUP BY cannot lock rows (PostgreSQL rejects FOR UPDATE with it);
+        # the writes counting them hold the change sequence lock instead.
+        queryset.query.select_for_update = False
+        groups = queryset.values_list(*COUNTED_FIELDS).annotate(n=models.Count("pk"))
+        for *values, count in groups:
+            yield dict(zip(COUNTED_FIELDS, values)), count
+
+    def apply(self, using):
+        from .models import TaskCounter, TaskDueDateCounter
+
+        for (status, priority), n in self.counts.items():
+            if n:
+                increment(TaskCounter, n, using, status=status, priority=priority)
+        for due_date, n in self.due_dates.items():
+            if n:
+                increment(TaskDueDateCounter, n, using, due_date=due_date)
+        self.counts.clear()
+        self.due_dates.clear()
+
+
+def increment(model, n, using, **lookup):
+    """
+    Add ``n`` to the counter row matching ``lookup``, creating it if needed.
+    """
+    counters = model._base_manager.using(using).filter(**lookup)
+    if counters.update(count=models.F("count") + n):
+        return
+    try:
+        with transaction.atomic(using=using):
+            counters.create(count=n, **lookup)
+    except IntegrityError:
+        # Created concurrently since the update above.
+        counters.update(count=models.F("count") + n)
+
+
+def get_task_stats(using=None, today=None):
+    """
+    Read the task statistics from the counter tables, keyed by the status
+    and priority labels.
+
+    Overdue tasks are open tasks due before ``today``; tasks due this week are
+    open tasks due from ``today`` up to and including Sunday.
+    """
+    from .models import TaskCounter, TaskDueDateCounter
+
+    today = today or timezone.localdate()
+    end_of_week = today + datetime.timedelta(days=6 - today.weekday())
+
+    status_labels = dict(StatusChoices.choices)
+    priority_labels = dict(PriorityChoices.choices)
+    statuses = dict.fromkeys(StatusChoices.labels, 0)
+    priorities = dict.fromkeys(PriorityChoices.labels, 0)
+    matrix = {status: dict(priorities) for status in statuses}
+    total = 0
+    for status, priority, count in TaskCounter.objects.using(using).values_list(
+        "status", "priority", "count"
+    ):
+        status = status_labels.get(status, status)
+        priority = priority_labels.get(priority, priority)
+        total += count
+        statuses[status] = statuses.get(status, 0) + count
+        priorities[priority] = priorities.get(priority, 0) + count
+        row = matrix.setdefault(status, dict.fromkeys(PriorityChoices.labels, 0))
+        row[priority] = row.get(priority, 0) + count
+
+    due = TaskDueDateCounter.objects.using(using).aggregate(
+        overdue=models.Sum("count", filter=models.Q(due_date__lt=today)),
+        due_this_week=models.Sum(
+            "count", filter=models.Q(due_date__gte=today, due_date__lte=end_of_week)
+        ),
+    )
+    return {
+        "total": total,
+        "status": statuses,
+        "priority": priorities,
+        "status_priority": matrix,
+        "overdue": due["overdue"] or 0,
+        "due_this_week": due["due_this_week"] or 0,
+    }
+
+
+def rebuild_task_stats(using=None, dry_run=False):
+    """
+    Recompute the counters from the tasks and archive tables with a GROUP BY
+    each and replace the stored ones, inside one transaction.
+
+    Returns the number of counters that were (or, with ``dry_run``, would
+    be) corrected.
+    """
+    from .models import Task, TaskArchive, TaskCounter, TaskDueDateCounter
+
+    using = using or Task.objects.db
+    with transaction.atomic(using=using):
+        expected = TaskStatsDelta()
+        expected.add_queryset(Task.objects.using(using))
+        expected.add_queryset(TaskArchive.objects.using(using))
+        tables = (
+            (TaskCounter, ("status", "priority"), expected.counts),
+            (
+                TaskDueDateCounter,
+                ("due_date",),
+                {(due_date,): n for due_date, n in expected.due_dates.items()},
+            ),
+        )
+
+        corrected = 0
+        for model, key_fields, counts in tables:
+            counters = model._base_manager.using(using).select_for_update()
+            stored = {
+                tuple(row[:-1]): row[-1]
+                for row in counters.values_list(*key_fields, "count")
+            }
+            wanted = {key: n for key, n in counts.items() if n}
+            corrected += sum(
+                stored.get(key, 0) != wanted.get(key, 0) for key in {*stored, *wanted}
+            )
+            if not dry_run:
+                counters.delete()
+                model._base_manager.using(using).bulk_create(
+                    model(count=n, **dict(zip(key_fields, key)))
+                    for key, n in wanted.items()
+                )
+        return corrected
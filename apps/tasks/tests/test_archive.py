@@ -0,0 +1,154 @@
+import datetime
+import logging
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task, TaskArchive
+
+
+@override_settings(TASKS_PAGE_SIZE=3)
+class TaskArchiveAPITest(APITestCase):
+    """
+    Test cases for listing and retrieving archived tasks.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_list_create_api_view")
+
+        # Completed and new tasks interleaved, two per day.
+        long_ago = timezone.now() - datetime.timedelta(days=365)
+        for i in range(10):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                status="completed" if i % 2 else "new",
+                priority="low" if i % 3 else "high",
+                description="task description",
+                due_date="2023-07-01",
+            )
+            Task.objects.filter(pk=task.pk).update(
+                created_at=datetime.date(2023, 7, 1) + datetime.timedelta(days=i // 2),
+                updated_at=long_ago,
+            )
+        self.expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.before = {
+            task.pk: self.client.get(self.detail_url(task.pk)).data
+            for task in Task.objects.all()
+        }
+        call_command("archive_tasks", "--older-than", "30", stdout=StringIO())
+        self.archived = set(TaskArchive.objects.values_list("id", flat=True))
+
+    def detail_url(self, pk):
+        return reverse("tasks:task_detail_api_view", kwargs={"pk": pk})
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task["id"] for task in response.data["results"])
+            last_page = response.data
+            url = response.data["next"]
+        return ids, last_page
+
+    def test_list_excludes_archived_tasks(self):
+        """
+        Test that the default list only queries the hot table.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            ids, _ = self.collect(self.url)
+
+        self.assertEqual(ids, [pk for pk in self.expected if pk not in self.archived])
+        self.assertFalse(any("tasks_taskarchive" in q["sql"] for q in queries))
+
+    def test_include_archived(self):
+        """
+        Test walking both tables merged in one ordering, forward and back.
+        """
+        ids, last_page = self.collect(self.url + "?include_archived=1")
+        self.assertEqual(ids, self.expected)
+
+        backward = []
+        url = last_page["previous"]
+        while url:
+            response = self.client.get(url)
+            backward = [task["id"] for task in response.data["results"]] + backward
+            url = response.data["previous"]
+        self.assertEqual(backward + [task["id"] for task in last_page["results"]], ids)
+
+    def test_include_archived_with_filter(self):
+        """
+        Test that the list filters apply to the archived tasks as well.
+        """
+        low = {
+            *Task.objects.filter(priority="low").values_list("id", flat=True),
+            *TaskArchive.objects.filter(priority="low").values_list("id", flat=True),
+        }
+
+        ids, _ = self.collect(self.url + "?include_archived=true&priority=low")
+
+        self.assertEqual(ids, [pk for pk in self.expected if pk in low])
+        self.assertTrue(low & self.archived)
+
+    def test_include_archived_with_search(self):
+        """
+        Test that archived tasks cannot be searched.
+        """
+        response = self.client.get(self.url, {"include_archived": "1", "q": "task"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("include_archived", response.data)
+
+    def test_detail_falls_back_to_archive(self):
+        """
+        Test that archived tasks are still retrieved, unchanged, but are
+        read-only.
+        """
+        pk = min(self.archived)
+
+        response = self.client.get(self.detail_url(pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.before[pk])
+
+        response = self.client.put(self.detail_url(pk), self.before[pk])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.delete(self.detail_url(pk))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.detail_url(max(self.expected) + 1))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_admin_is_read_only(self):
+        """
+        Test that archived tasks cannot be deleted in the admin, which would
+        leave them in the task counters.
+        """
+        pk = min(self.archived)
+        admin = User.objects.create_superuser(username="admin", password="admin")
+        self.client.force_login(admin)
+
+        response = self.client.post(
+            reverse("admin:tasks_taskarchive_delete", args=[pk]), {"post": "yes"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(TaskArchive.objects.filter(pk=pk).exists())
@@ -0,0 +1,157 @@
+import json
+import logging
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..asgi import TaskASGIHandler
+from ..models import Task
+
+
+def tagging_middleware(get_response):
+    def middleware(request):
+        response = get_response(request)
+        response["X-Tagged"] = "1"
+        return response
+
+    return middleware
+
+
+class TaskASGIHandlerTest(TransactionTestCase):
+    """
+    Test cases for the task requests handled on the executor of the
+    TaskASGIHandler.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.task = Task.objects.create(
+            title="Task 1",
+            status="new",
+            priority="high",
+            description="task description",
+            due_date="2023-07-01",
+        )
+
+    async def request(self, path, query="", authenticated=True):
+        headers = [(b"host", b"testserver")]
+        if authenticated:
+            headers.append((b"authorization", f"Bearer {self.token}".encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+        communicator = ApplicationCommunicator(TaskASGIHandler(), scope)
+        await communicator.send_input({"type": "http.request"})
+        start = await communicator.receive_output(timeout=5)
+        body = await communicator.receive_output(timeout=5)
+        return start["status"], dict(start["headers"]), body["body"]
+
+    def test_list(self):
+        """
+        Test that the list returns what it returns under WSGI, through the
+        same middleware.
+        """
+        url = reverse("tasks:task_list_create_api_view")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        expected = client.get(url, {"priority": "high"})
+        cache.clear()
+
+        status, headers, body = async_to_sync(self.request)(url, "priority=high")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b"Content-Type"], b"application/json")
+        self.assertEqual(
+            headers[b"X-Frame-Options"], expected["X-Frame-Options"].encode()
+        )
+        self.assertEqual(json.loads(body), json.loads(expected.content))
+
+    async def test_detail(self):
+        """
+        Test the detail for existing and missing tasks.
+        """
+        status, headers, body = await self.request(
+            reverse("tasks:task_detail_api_view", args=[self.task.pk])
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["title"], "Task 1")
+        self.assertIn(b"ETag", headers)
+
+        status, _, _ = await self.request(
+            reverse("tasks:task_detail_api_view", args=[self.task.pk + 1])
+        )
+        self.assertEqual(status, 404)
+
+    async def test_authentication(self):
+        """
+        Test that the task requests are authenticated.
+        """
+        status, _, _ = await self.request(
+            reverse("tasks:task_list_create_api_view"), authenticated=False
+        )
+
+        self.assertEqual(status, 401)
+
+    async def test_other_views_use_the_middleware(self):
+        """
+        Test that the other views go through MIDDLEWARE as well.
+        """
+        status, headers, _ = await self.request(reverse("admin:login"))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b"X-Frame-Options"], b"DENY")
+
+    @override_settings(TASKS_TIMING_SAMPLE_RATE=1)
+    async def test_server_timing(self):
+        """
+        Test that the timings of the executor thread reach the response and
+        the log.
+        """
+        url = reverse("tasks:task_detail_api_view", args=[self.task.pk])
+
+        with self.assertLogs("apps.tasks.timing", "INFO") as logs:
+            status, headers, _ = await self.request(url)
+
+        self.assertEqual(status, 200)
+        [record] = logs.records
+        self.assertEqual(record.getMessage(), f"request GET {url}")
+        self.assertEqual(record.queries, 2)
+        metrics = dict(
+            metric.split(b";", 1) for metric in headers[b"Server-Timing"].split(b", ")
+        )
+        self.assertEqual(metrics[b"db"].split(b";")[1], b'desc="2 queries"')
+        self.assertNotEqual(metrics[b"render"], b"dur=0.000")
+
+    async def test_added_middleware(self):
+        """
+        Test that middleware added to MIDDLEWARE applies to the task requests.
+        """
+        middleware = [*settings.MIDDLEWARE, f"{__name__}.tagging_middleware"]
+
+        with override_settings(MIDDLEWARE=middleware):
+            status, headers, _ = await self.request(
+                reverse("tasks:task_detail_api_view", args=[self.task.pk])
+            )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b"X-Tagged"], b"1")
@@ -0,0 +1,125 @@
+import logging
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..authentication import user_cache
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    """
+    Test cases for the CachedJWTAuthentication.
+    """
+
+    url = reverse("tasks:task_stats_api_view")
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        user_cache.clear()
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.authenticate(self.user)
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(user))
+        )
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        user_queries = [q for q in queries if '"auth_user"' in q["sql"]]
+        return response, user_queries
+
+    def test_warm_token_skips_user_lookup(self):
+        """
+        Test that only the first request of a user queries auth_user.
+        """
+        response, queries = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_user_save_invalidates(self):
+        """
+        Test that a deactivated user is rejected on the next request.
+        """
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+
+        response, queries = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(queries), 1)
+
+    def test_user_delete_invalidates(self):
+        """
+        Test that a deleted user is rejected on the next request.
+        """
+        self.get()
+        self.user.delete()
+
+        response, _ = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_entries_expire(self):
+        """
+        Test that users are looked up again once their entry expired.
+        """
+        self.get()
+
+        with mock.patch("time.monotonic", return_value=10**9):
+            _, queries = self.get()
+
+        self.assertEqual(len(queries), 1)
+
+    @override_settings(TASKS_AUTH_CACHE_SIZE=1)
+    def test_least_recently_used_are_evicted(self):
+        """
+        Test that the cache holds at most TASKS_AUTH_CACHE_SIZE users.
+        """
+        other = User.objects.create_user(username="other", password="testpassword")
+        self.get()
+        self.authenticate(other)
+        self.get()
+
+        self.authenticate(self.user)
+        _, queries = self.get()
+
+        self.assertEqual(len(queries), 1)
+
+    def test_invalid_token(self):
+        """
+        Test that tokens are still verified for cached users.
+        """
+        self.get()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        response, _ = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TASKS_AUTH_TRUST_TOKEN_CLAIMS=True)
+    def test_trust_token_claims(self):
+        """
+        Test that trusted claims authenticate without any user lookup.
+        """
+        response, queries = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
@@ -0,0 +1,283 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..choices import PriorityChoices, StatusChoices
+from ..models import Task
+from .utils import task_data
+
+
+class BulkAPITestCase(APITestCase):
+    """
+    Base test case for the bulk task endpoints.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.access_token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(self.access_token))
+
+
+@override_settings(TASKS_BULK_BATCH_SIZE=2, TASKS_BULK_MAX_ITEMS=10)
+class TaskBulkCreateAPIViewTest(BulkAPITestCase):
+    """
+    Test cases for the TaskBulkCreateAPIView.
+    """
+
+    url = reverse("tasks:task_bulk_create_api_view")
+
+    def test_bulk_create_with_valid_data(self):
+        """
+        Test creating several tasks in batched inserts.
+        """
+        self.authenticate()
+        data = [task_data(f"Task {i}") for i in range(5)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(response.data["failed"], 0)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]], ["created"] * 5
+        )
+        self.assertEqual(Task.objects.count(), 5)
+        inserts = [
+            q for q in queries if q["sql"].startswith('INSERT INTO "tasks_task"')
+        ]
+        self.assertEqual(len(inserts), 3)
+
+    def test_bulk_create_atomic_with_invalid_item(self):
+        """
+        Test that one invalid item rejects the whole list in atomic mode.
+        """
+        self.authenticate()
+        data = [task_data("Task 1"), task_data("Task 2", status="pending")]
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual(response.data["results"][0]["status"], "skipped")
+        self.assertEqual(response.data["results"][1]["status"], "invalid")
+        self.assertIn("status", response.data["results"][1]["errors"])
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_bulk_create_partial_with_invalid_item(self):
+        """
+        Test that partial mode creates the valid items and reports the rest.
+        """
+        self.authenticate()
+        data = [task_data("Task 1"), task_data(""), task_data("Task 3")]
+
+        response = self.client.post(self.url + "?mode=partial", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["created", "invalid", "created"],
+        )
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", flat=True)), ["Task 1", "Task 3"]
+        )
+
+    def test_bulk_create_rejects_bad_payloads(self):
+        """
+        Test payloads that are not a usable list of tasks.
+        """
+        self.authenticate()
+        payloads = [
+            task_data(),
+            [],
+            [task_data(f"Task {i}") for i in range(11)],
+        ]
+        for payload in payloads:
+            response = self.client.post(self.url, payload, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("non_field_errors", response.data)
+
+        response = self.client.post(self.url + "?mode=all", [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.count(), 0)
+
+
+class TaskBulkUpdateAPIViewTest(BulkAPITestCase):
+    """
+    Test cases for the TaskBulkUpdateAPIView.
+    """
+
+    url = reverse("tasks:task_bulk_update_api_view")
+
+    def setUp(self):
+        super().setUp()
+        self.tasks = [
+            Task.objects.create(
+                **task_data(
+                    f"Task {i}",
+                    status="in progress" if i < 3 else "new",
+                    due_date=f"2023-07-0{i + 1}",
+                )
+            )
+            for i in range(5)
+        ]
+
+    def test_update_by_filter(self):
+        """
+        Test a status transition for every task matching a filter.
+        """
+        self.authenticate()
+        data = {
+            "filter": {"status": "in progress", "due_before": "2023-07-02"},
+            "set": {"status": "completed"},
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("status", flat=True)),
+            [
+                StatusChoices.COMPLETED,
+                StatusChoices.COMPLETED,
+                StatusChoices.IN_PROGRESS,
+                StatusChoices.NEW,
+                StatusChoices.NEW,
+            ],
+        )
+        # One GROUP BY for the task counters, then a single UPDATE.
+        task_queries = [q["sql"] for q in queries if '"tasks_task"' in q["sql"]]
+        self.assertEqual(len(task_queries), 2)
+        self.assertIn("GROUP BY", task_queries[0])
+        self.assertTrue(task_queries[1].startswith("UPDATE"))
+
+    def test_update_by_filter_with_invalid_data(self):
+        """
+        Test filter-based updates with invalid filters or values.
+        """
+        self.authenticate()
+        invalid_data_list = [
+            {"filter": {}, "set": {"status": "completed"}},
+            {"filter": {"status": "pending"}, "set": {"status": "completed"}},
+            {"filter": {"status": "new"}, "set": {}},
+            {"filter": {"status": "new"}, "set": {"status": "pending"}},
+            {"filter": {"status": "new"}, "set": {"created_at": "2023-07-01"}},
+            {
+                "filter": {"due_after": "2023-07-05", "due_before": "2023-07-01"},
+                "set": {"status": "completed"},
+            },
+        ]
+        for data in invalid_data_list:
+            response = self.client.patch(self.url, data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertFalse(Task.objects.filter(status="completed").exists())
+
+    def test_update_by_ids(self):
+        """
+        Test per-row payloads applied with bulk updates.
+        """
+        self.authenticate()
+        data = [
+            {"id": self.tasks[0].pk, "status": "completed"},
+            {"id": self.tasks[3].pk, "title": "Renamed", "priority": "high"},
+        ]
+
+        response = self.client.patch(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 2})
+        self.tasks[0].refresh_from_db()
+        self.tasks[3].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, StatusChoices.COMPLETED)
+        self.assertEqual(self.tasks[0].title, "Task 0")
+        self.assertEqual(self.tasks[3].title, "Renamed")
+        self.assertEqual(self.tasks[3].priority, PriorityChoices.HIGH)
+        self.assertEqual(self.tasks[3].status, StatusChoices.NEW)
+
+    def test_update_by_ids_with_invalid_data(self):
+        """
+        Test that any invalid item rejects the whole id-list update.
+        """
+        self.authenticate()
+        invalid_data_list = [
+            [{"status": "completed"}],
+            [{"id": "x", "status": "completed"}],
+            [{"id": self.tasks[0].pk}, {"id": self.tasks[0].pk}],
+            [{"id": self.tasks[0].pk, "status": "completed"}, {"id": 999999}],
+            [
+                {"id": self.tasks[0].pk, "status": "completed"},
+                {"id": self.tasks[1].pk, "title": ""},
+            ],
+        ]
+        for data in invalid_data_list:
+            response = self.client.patch(self.url, data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertFalse(Task.objects.filter(status="completed").exists())
+
+
+@override_settings(TASKS_BULK_BATCH_SIZE=2)
+class TaskBulkDeleteAPIViewTest(BulkAPITestCase):
+    """
+    Test cases for the TaskBulkDeleteAPIView.
+    """
+
+    url = reverse("tasks:task_bulk_delete_api_view")
+
+    def setUp(self):
+        super().setUp()
+        for i in range(8):
+            Task.objects.create(
+                **task_data(f"Task {i}", status="completed" if i % 4 else "new")
+            )
+
+    def test_delete_by_filter_in_batches(self):
+        """
+        Test that matching tasks are deleted in separate pk-range batches.
+        """
+        self.authenticate()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {"status": "completed"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"deleted": 6})
+        self.assertEqual(
+            list(Task.objects.values_list("status", flat=True)),
+            [StatusChoices.NEW, StatusChoices.NEW],
+        )
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 4)
+
+    def test_delete_with_invalid_filter(self):
+        """
+        Test that an empty or invalid filter deletes nothing.
+        """
+        self.authenticate()
+        for data in ({}, {"status": "pending"}, {"due_before": "yesterday"}):
+            response = self.client.post(self.url, data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(Task.objects.count(), 8)
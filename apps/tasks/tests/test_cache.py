@@ -0,0 +1,168 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..cache import task_cache
+from ..models import Task
+
+
+class TaskResponseCacheTest(APITestCase):
+    """
+    Test cases for the cached task list and detail reads.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.task = self.create_task("Task 1")
+        self.list_url = reverse("tasks:task_list_create_api_view")
+        self.detail_url = reverse("tasks:task_detail_api_view", args=[self.task.pk])
+
+    def create_task(self, title, **kwargs):
+        data = {
+            "title": title,
+            "status": "new",
+            "priority": "high",
+            "description": "task description",
+            "due_date": "2023-07-01",
+        }
+        data.update(kwargs)
+        return Task.objects.create(**data)
+
+    def get(self, url, *args):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, *args)
+        task_queries = [q for q in queries if '"tasks_task"' in q["sql"]]
+        return response, task_queries
+
+    def test_list_is_served_from_cache(self):
+        """
+        Test that a repeated list read does not query the tasks table.
+        """
+        hits, misses = task_cache.hits, task_cache.misses
+
+        response, queries = self.get(self.list_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(queries), 1)
+
+        cached, queries = self.get(self.list_url)
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(queries, [])
+
+        self.assertEqual(task_cache.hits, hits + 1)
+        self.assertEqual(task_cache.misses, misses + 1)
+
+    def test_list_keys_include_filters_and_pagination(self):
+        """
+        Test that different filters or pages are cached separately.
+        """
+        self.create_task("Task 2", priority="low")
+        self.get(self.list_url)
+
+        response, _ = self.get(self.list_url, {"priority": "low"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response, _ = self.get(self.list_url, {"page_size": 1})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_detail_is_served_from_cache(self):
+        """
+        Test that a repeated detail read does not query the tasks table.
+        """
+        self.get(self.detail_url)
+        response, queries = self.get(self.detail_url)
+
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.data["title"], "Task 1")
+        self.assertEqual(queries, [])
+
+    def test_writes_invalidate_cached_responses(self):
+        """
+        Test that single and bulk writes are never followed by stale reads.
+        """
+        writes = [
+            lambda: self.create_task("Task 2"),
+            lambda: Task.objects.filter(pk=self.task.pk).update(title="Renamed"),
+            lambda: Task.objects.bulk_create(
+                [
+                    Task(
+                        title="Bulk",
+                        status="new",
+                        priority="low",
+                        description="task description",
+                        due_date="2023-07-01",
+                    )
+                ]
+            ),
+            lambda: Task.objects.bulk_update(
+                [Task(pk=self.task.pk, title="Bulk renamed")], ["title"]
+            ),
+            lambda: Task.objects.filter(priority="low").delete(),
+            lambda: Task.objects.get(title="Task 2").delete(),
+        ]
+        for write in writes:
+            before, _ = self.get(self.list_url)
+            self.get(self.detail_url)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+
+            after, _ = self.get(self.list_url)
+            self.assertEqual(after["X-Cache"], "MISS")
+            self.assertNotEqual(after.data, before.data)
+            detail, _ = self.get(self.detail_url)
+            self.assertEqual(detail["X-Cache"], "MISS")
+
+    def test_api_update_invalidates_detail(self):
+        """
+        Test that a PUT is visible on the next detail read.
+        """
+        self.get(self.detail_url)
+        data = {
+            "title": "Updated Task",
+            "status": "completed",
+            "priority": "low",
+            "description": "task description",
+            "due_date": "2023-07-01",
+        }
+        self.client.put(self.detail_url, data, format="json")
+
+        response, _ = self.get(self.detail_url)
+        self.assertEqual(response.data["title"], "Updated Task")
+
+    def test_queryset_delete_skips_the_collector(self):
+        """
+        Test that queryset deletes run a single statement, only loading the
+        ids their tombstones need.
+        """
+        self.create_task("Task 2")
+
+        with CaptureQueriesContext(connection) as queries:
+            deleted = Task.objects.all().delete()
+
+        self.assertEqual(deleted, (2, {"tasks.Task": 2}))
+        # The ids, one GROUP BY for the task counters, then a single DELETE.
+        task_queries = [q["sql"] for q in queries if '"tasks_task"' in q["sql"]]
+        self.assertEqual(len(task_queries), 3)
+        self.assertIn('SELECT "tasks_task"."id" FROM', task_queries[0])
+        self.assertIn("GROUP BY", task_queries[1])
+        self.assertTrue(task_queries[2].startswith("DELETE"))
@@ -0,0 +1,261 @@
+import datetime
+import logging
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..changes import add_tombstones, next_change_seq
+from ..models import Task, TaskChangeSequence, TaskTombstone
+from ..pagination import TaskChangesPagination
+from .utils import task_data
+
+
+@override_settings(TASKS_PAGE_SIZE=3)
+class TaskChangesAPITest(APITestCase):
+    """
+    Test cases for the change feed of the TaskChangesAPIView.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_changes_api_view")
+        self.tasks = [Task.objects.create(**task_data(f"Task {i}")) for i in range(5)]
+
+    def sync(self, since=None):
+        """
+        Follow the feed from ``since`` to its end, returning the changes in
+        order and the cursor to sync from next time.
+        """
+        changes = {"tasks": [], "deleted": [], "archived": []}
+        params = {} if since is None else {"since": since}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(sum(len(response.data[key]) for key in changes), 3)
+            for key in changes:
+                changes[key].extend(response.data[key])
+            if response.data["next"] is None:
+                return changes, response.data["since"]
+            params = {"since": response.data["since"]}
+
+    def test_initial_sync(self):
+        """
+        Test that a sync without a cursor lists every task, in pages.
+        """
+        changes, since = self.sync()
+
+        self.assertEqual(
+            [task["id"] for task in changes["tasks"]],
+            [task.pk for task in self.tasks],
+        )
+        self.assertEqual(changes["tasks"][0]["title"], "Task 0")
+        self.assertEqual(changes["tasks"][0]["status"], "new")
+        self.assertEqual((changes["deleted"], changes["archived"]), ([], []))
+
+        # Nothing changed since: an empty page keeps the cursor.
+        response = self.client.get(self.url, {"since": since})
+        self.assertEqual(response.data["tasks"], [])
+        self.assertEqual(response.data["since"], since)
+        self.assertIsNone(response.data["next"])
+
+    def test_changes_since_cursor(self):
+        """
+        Test that only the tasks written or removed since the cursor are
+        listed, whatever the write path.
+        """
+        _, since = self.sync()
+
+        detail = reverse("tasks:task_detail_api_view", args=[self.tasks[1].pk])
+        self.client.put(detail, task_data("Renamed", status="completed"), format="json")
+        self.client.delete(
+            reverse("tasks:task_detail_api_view", args=[self.tasks[2].pk])
+        )
+        created = self.client.post(
+            reverse("tasks:task_list_create_api_view"), task_data("New"), format="json"
+        ).data
+        Task.objects.filter(pk=self.tasks[3].pk).update(priority="high")
+        Task.objects.filter(pk=self.tasks[4].pk).delete()
+
+        changes, since = self.sync(since)
+
+        self.assertEqual(
+            [(task["id"], task["title"]) for task in changes["tasks"]],
+            [
+                (self.tasks[1].pk, "Renamed"),
+                (created["id"], "New"),
+                (self.tasks[3].pk, "Task 3"),
+            ],
+        )
+        self.assertEqual(changes["tasks"][2]["priority"], "high")
+        self.assertEqual(
+            sorted(changes["deleted"]), [self.tasks[2].pk, self.tasks[4].pk]
+        )
+
+        Task.objects.bulk_update([Task(pk=self.tasks[0].pk, title="Bulk")], ["title"])
+        changes, _ = self.sync(since)
+        self.assertEqual([task["title"] for task in changes["tasks"]], ["Bulk"])
+
+    def test_archived_tasks(self):
+        """
+        Test that archived tasks are listed as archived, not deleted.
+        """
+        Task.objects.update(status="completed")
+        _, since = self.sync()
+
+        archived = list(Task.objects.order_by("pk").archive_in_batches(2))
+
+        changes, _ = self.sync(since)
+        self.assertEqual(archived[-1], len(self.tasks))
+        self.assertEqual(changes["tasks"], [])
+        self.assertEqual(changes["deleted"], [])
+        self.assertEqual(sorted(changes["archived"]), [task.pk for task in self.tasks])
+
+    def test_task_supersedes_tombstone(self):
+        """
+        Test that a task written with the id of a removed task replaces its
+        tombstone.
+        """
+        _, since = self.sync()
+        pk = self.tasks[4].pk
+        self.tasks[4].delete()
+        Task.objects.create(id=pk, **task_data("Again"))
+
+        changes, _ = self.sync(since)
+
+        self.assertEqual([task["id"] for task in changes["tasks"]], [pk])
+        self.assertEqual(changes["deleted"], [])
+
+    def test_tombstone_supersedes_task(self):
+        """
+        Test that a tombstone recorded after the last write of a task still
+        in the page, as read by a sync racing with its removal, is sent.
+        """
+        _, since = self.sync()
+        pk = self.tasks[4].pk
+        Task.objects.filter(pk=pk).update(title="Updated")
+        with transaction.atomic():
+            add_tombstones([pk], next_change_seq(Task.objects.db), Task.objects.db)
+
+        changes, _ = self.sync(since)
+
+        self.assertEqual(changes["tasks"], [])
+        self.assertEqual(changes["deleted"], [pk])
+
+    def test_writes_between_the_reads(self):
+        """
+        Test that a page read while tasks are written between its task and
+        tombstone queries does not skip the tasks written first.
+        """
+        _, since = self.sync()
+        get_keyset_filter = TaskChangesPagination.get_keyset_filter
+        deleted = self.tasks[4].pk
+        created = []
+
+        def write_after_the_task_read(paginator, position, reverse):
+            # The tombstones are read second.
+            if paginator.fetch_count == 1:
+                created.append(Task.objects.create(**task_data("New")))
+                self.tasks[4].delete()
+            paginator.fetch_count += 1
+            return get_keyset_filter(paginator, position, reverse)
+
+        with mock.patch.object(
+            TaskChangesPagination, "fetch_count", 0, create=True
+        ), mock.patch.object(
+            TaskChangesPagination, "get_keyset_filter", write_after_the_task_read
+        ):
+            response = self.client.get(self.url, {"since": since})
+        self.assertEqual(response.data["tasks"], [])
+        self.assertEqual(response.data["deleted"], [])
+
+        changes, _ = self.sync(response.data["since"])
+        self.assertEqual([task["id"] for task in changes["tasks"]], [created[0].pk])
+        self.assertEqual(changes["deleted"], [deleted])
+
+    def test_expired_and_invalid_cursors(self):
+        """
+        Test that a cursor older than the purged tombstones gets a 410 and
+        an invalid one a 404.
+        """
+        _, since = self.sync()
+        self.tasks[0].delete()
+        TaskTombstone.objects.update(
+            removed_at=timezone.now() - datetime.timedelta(days=40)
+        )
+
+        call_command("purge_tombstones", "--older-than", "30", stdout=StringIO())
+
+        self.assertFalse(TaskTombstone.objects.exists())
+        response = self.client.get(self.url, {"since": since})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        _, since = self.sync()
+        self.assertEqual(
+            self.client.get(self.url, {"since": since}).status_code,
+            status.HTTP_200_OK,
+        )
+        response = self.client.get(self.url, {"since": "not a cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskChangeSequenceTest(TestCase):
+    """
+    Test cases for the change sequence numbers of the task writes.
+    """
+
+    def test_writes_advance_the_sequence(self):
+        """
+        Test that every write gives its rows one new, higher number.
+        """
+        Task.objects.bulk_create([Task(**task_data(f"Task {i}")) for i in range(3)])
+        pks = list(Task.objects.order_by("pk").values_list("pk", flat=True))
+        seqs = set(Task.objects.values_list("change_seq", flat=True))
+        self.assertEqual(len(seqs), 1)
+        created = seqs.pop()
+
+        Task.objects.filter(pk__in=pks[:2]).update(title=F("title"))
+        task = Task.objects.get(pk=pks[2])
+        task.title = "Saved"
+        task.save(update_fields=["title"])
+
+        seqs = dict(Task.objects.values_list("pk", "change_seq"))
+        updated, saved = seqs[pks[0]], seqs[pks[2]]
+        self.assertEqual(seqs[pks[1]], updated)
+        self.assertLess(created, updated)
+        self.assertLess(updated, saved)
+        self.assertEqual(TaskChangeSequence.objects.get().last, saved)
+
+    def test_cursor_query_plan(self):
+        """
+        Test that a page of changes is an index range of each table.
+        """
+        paginator = TaskChangesPagination()
+        for model, index in (
+            (Task, "task_change_idx"),
+            (TaskTombstone, "tombstone_change_idx"),
+        ):
+            queryset = (
+                model.objects.order_by(*paginator.ordering)
+                .filter(paginator.get_keyset_filter((10, 100)))
+                .values_list("id", "change_seq")[:51]
+            )
+            plan = queryset.explain()
+            self.assertRegex(plan, f"USING (COVERING )?INDEX {index}")
+            self.assertNotIn("USE TEMP B-TREE", plan)
@@ -0,0 +1,395 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..choices import PriorityChoices, StatusChoices
+from ..models import Task, TaskArchive, TaskImportCheckpoint
+from ..stats import get_task_stats, rebuild_task_stats
+
+
+class PurgeTasksCommandTest(TestCase):
+    """
+    Test cases for the purge_tasks management command.
+    """
+
+    def setUp(self):
+        for i in range(7):
+            Task.objects.create(
+                title=f"Task {i}",
+                status="completed" if i % 2 else "new",
+                priority="low",
+                description="task description",
+                due_date=f"2023-07-0{i + 1}",
+            )
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("purge_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def test_purge_in_batches(self):
+        """
+        Test purging with progress reported after every batch.
+        """
+        output = self.call("--status", "completed", "--batch-size", "2")
+
+        self.assertEqual(Task.objects.filter(status="completed").count(), 0)
+        self.assertEqual(Task.objects.count(), 4)
+        self.assertIn("Deleted 2 tasks...", output)
+        self.assertIn("Purged 3 tasks.", output)
+
+    def test_purge_by_due_date(self):
+        """
+        Test purging with a due date range.
+        """
+        self.call("--due-after", "2023-07-02", "--due-before", "2023-07-04")
+
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_dry_run(self):
+        """
+        Test that a dry run deletes nothing.
+        """
+        output = self.call("--status", "completed", "--dry-run")
+
+        self.assertIn("3 tasks would be deleted.", output)
+        self.assertEqual(Task.objects.count(), 7)
+
+    def test_invalid_options(self):
+        """
+        Test that a missing or invalid filter is rejected.
+        """
+        for args in (
+            (),
+            ("--status", "pending"),
+            ("--status", "new", "--batch-size", "0"),
+        ):
+            with self.assertRaises(CommandError):
+                self.call(*args)
+        self.assertEqual(Task.objects.count(), 7)
+
+
+class SeedTasksCommandTest(TestCase):
+    """
+    Test cases for the seed_tasks management command.
+    """
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("seed_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def test_seed_in_batches(self):
+        """
+        Test seeding tasks of every status and priority in batched inserts.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            output = self.call("--count", "250", "--batch-size", "100")
+
+        self.assertIn("Inserted 250 tasks", output)
+        self.assertEqual(Task.objects.count(), 250)
+        self.assertEqual(get_task_stats()["total"], 250)
+        inserts = [
+            q for q in queries if q["sql"].startswith('INSERT INTO "tasks_task"')
+        ]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(
+            set(Task.objects.values_list("status", flat=True)),
+            set(StatusChoices.values),
+        )
+        self.assertEqual(
+            set(Task.objects.values_list("priority", flat=True)),
+            set(PriorityChoices.values),
+        )
+
+    def test_seed_is_repeatable(self):
+        """
+        Test that the same seed generates the same tasks.
+        """
+        fields = ("title", "description", "status", "priority", "due_date")
+        self.call("--count", "20", "--seed", "42")
+        first = list(Task.objects.order_by("pk").values_list(*fields))
+        Task.objects.all().delete()
+        self.call("--count", "20", "--seed", "42")
+
+        self.assertEqual(list(Task.objects.order_by("pk").values_list(*fields)), first)
+
+    def test_invalid_options(self):
+        """
+        Test that non-positive counts are rejected.
+        """
+        for args in (("--count", "0"), ("--count", "10", "--batch-size", "0")):
+            with self.assertRaises(CommandError):
+                self.call(*args)
+        self.assertEqual(Task.objects.count(), 0)
+
+
+class ImportTasksCommandTest(TestCase):
+    """
+    Test cases for the import_tasks management command.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def read_rejects(self, path):
+        with open(f"{path}.rejects") as f:
+            return [json.loads(line) for line in f]
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("import_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        """
+        Test importing a CSV file, with invalid rows written to the reject file.
+        """
+        path = self.write(
+            "tasks.csv",
+            "\ufefftitle,description,status,priority,due_date\n"
+            'Write report,"Quarterly, with charts",new,high,2030-01-31\n'
+            "Bad status,Unknown status,unknown,low,2030-01-31\n"
+            "Call client,About the offer,completed,low,2030-02-01\n"
+            "Too,many,columns,here,2030-01-01,x\n",
+        )
+
+        output = self.call(path, "--batch-size", "2")
+
+        self.assertIn("Imported 2 tasks, rejected 2 rows", output)
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("title", "description")),
+            [
+                ("Write report", "Quarterly, with charts"),
+                ("Call client", "About the offer"),
+            ],
+        )
+        rejects = self.read_rejects(path)
+        self.assertEqual([row["row"] for row in rejects], [2, 4])
+        self.assertIn("status", rejects[0]["errors"])
+        self.assertIn("non_field_errors", rejects[1]["errors"])
+        self.assertFalse(TaskImportCheckpoint.objects.exists())
+
+    def task(self, title, **fields):
+        data = {
+            "title": title,
+            "description": f"About {title}",
+            "status": "new",
+            "priority": "medium",
+            "due_date": "2030-01-31",
+        }
+        return json.dumps({**data, **fields})
+
+    def test_import_ndjson(self):
+        """
+        Test importing an NDJSON file with malformed lines.
+        """
+        lines = [
+            self.task("First"),
+            "",
+            "{not json",
+            "[1, 2]",
+            self.task("Second", priority="urgent"),
+            self.task("Third", status="in progress", due_date="2030-02-01"),
+        ]
+        path = self.write("tasks.ndjson", "\n".join(lines) + "\n")
+
+        output = self.call(path)
+
+        self.assertIn("Imported 2 tasks, rejected 3 rows", output)
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("title", "status")),
+            [("First", StatusChoices.NEW), ("Third", StatusChoices.IN_PROGRESS)],
+        )
+        self.assertEqual([row["row"] for row in self.read_rejects(path)], [2, 3, 4])
+
+    def test_resume_from_checkpoint(self):
+        """
+        Test that an import resumes after the rows of its checkpoint.
+        """
+        lines = [self.task(f"Task {i}") for i in range(1, 6)]
+        path = self.write("tasks.jsonl", "\n".join(lines) + "\n")
+        offset = len(lines[0]) + len(lines[1]) + 2
+        TaskImportCheckpoint.objects.create(
+            name=os.path.abspath(path), offset=offset, rows=2, imported=2
+        )
+
+        output = self.call(path, "--batch-size", "2")
+
+        self.assertIn("Resuming after row 2.", output)
+        self.assertIn("Imported 5 tasks, rejected 0 rows", output)
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("title", flat=True)),
+            ["Task 3", "Task 4", "Task 5"],
+        )
+        self.assertFalse(TaskImportCheckpoint.objects.exists())
+
+    def test_interrupted_batch(self):
+        """
+        Test that a batch whose checkpoint was not saved is rolled back, so
+        resuming imports its tasks and rejects its rows only once.
+        """
+        lines = [
+            self.task("Task 1"),
+            self.task("Task 2"),
+            self.task("Task 3"),
+            self.task("Bad", status="unknown"),
+        ]
+        path = self.write("tasks.ndjson", "\n".join(lines) + "\n")
+        save = TaskImportCheckpoint.save
+
+        def crash_on_second_batch(checkpoint, *args, **kwargs):
+            if checkpoint.rows > 2:
+                raise KeyboardInterrupt
+            save(checkpoint, *args, **kwargs)
+
+        with mock.patch.object(TaskImportCheckpoint, "save", crash_on_second_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                self.call(path, "--batch-size", "2")
+        self.assertEqual(Task.objects.count(), 2)
+
+        output = self.call(path, "--batch-size", "2")
+
+        self.assertIn("Resuming after row 2.", output)
+        self.assertIn("Imported 3 tasks, rejected 1 rows", output)
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("title", flat=True)),
+            ["Task 1", "Task 2", "Task 3"],
+        )
+        self.assertEqual([row["row"] for row in self.read_rejects(path)], [4])
+
+    def test_invalid_options(self):
+        """
+        Test that unknown formats, invalid batch sizes and missing files are
+        rejected.
+        """
+        path = self.write("tasks.txt", "")
+        for args in (
+            (path,),
+            (path, "--format", "csv", "--batch-size", "0"),
+            (os.path.join(self.directory, "missing.csv"),),
+        ):
+            with self.assertRaises(CommandError):
+                self.call(*args)
+
+
+class ArchiveTasksCommandTest(TestCase):
+    """
+    Test cases for the archive_tasks management command.
+    """
+
+    def setUp(self):
+        now = timezone.now()
+        for i, (task_status, age) in enumerate(
+            [
+                ("completed", 90),
+                ("completed", 10),
+                ("new", 90),
+                ("completed", 60),
+                ("in progress", 60),
+                ("completed", 90),
+            ]
+        ):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                description="task description",
+                status=task_status,
+                priority="high",
+                due_date="2023-07-01",
+            )
+            Task.objects.filter(pk=task.pk).update(
+                updated_at=now - datetime.timedelta(days=age)
+            )
+        self.pks = list(Task.objects.order_by("pk").values_list("pk", flat=True))
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("archive_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def test_archive_in_batches(self):
+        """
+        Test moving old completed tasks, keeping their ids and the counters.
+        """
+        stats = get_task_stats()
+        task = Task.objects.get(pk=self.pks[0])
+
+        output = self.call("--older-than", "30", "--batch-size", "1")
+
+        self.assertIn("Archived 3 tasks.", output)
+        self.assertEqual(
+            list(TaskArchive.objects.order_by("pk").values_list("pk", flat=True)),
+            [self.pks[0], self.pks[3], self.pks[5]],
+        )
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("pk", flat=True)),
+            [self.pks[1], self.pks[2], self.pks[4]],
+        )
+        archived = TaskArchive.objects.get(pk=self.pks[0])
+        for field in ("title", "status", "due_date", "created_at", "updated_at"):
+            self.assertEqual(getattr(archived, field), getattr(task, field))
+        self.assertEqual(get_task_stats(), stats)
+        self.assertEqual(rebuild_task_stats(dry_run=True), 0)
+
+    def test_archived_id_collision(self):
+        """
+        Test that a task whose id is already archived stops the command,
+        leaving the task in place.
+        """
+        task = Task.objects.get(pk=self.pks[3])
+        TaskArchive.objects.create(
+            id=task.pk,
+            title="Archived",
+            description="task description",
+            status=task.status,
+            priority=task.priority,
+            due_date=task.due_date,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            archived_at=timezone.now(),
+        )
+
+        with self.assertRaisesMessage(CommandError, "Stopped after archiving 1 tasks"):
+            self.call("--older-than", "30", "--batch-size", "1")
+
+        self.assertEqual(TaskArchive.objects.get(pk=task.pk).title, "Archived")
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+        self.assertFalse(Task.objects.filter(pk=self.pks[0]).exists())
+
+    def test_dry_run(self):
+        """
+        Test that a dry run only counts the tasks.
+        """
+        output = self.call("--older-than", "30", "--dry-run")
+
+        self.assertIn("3 tasks would be archived.", output)
+        self.assertEqual(TaskArchive.objects.count(), 0)
+
+    def test_invalid_options(self):
+        """
+        Test that negative ages and non-positive batch sizes are rejected.
+        """
+        for args in (
+            ("--older-than", "-1"),
+            ("--older-than", "1", "--batch-size", "0"),
+        ):
+            with self.assertRaises(CommandError):
+                self.call(*args)
+        self.assertEqual(TaskArchive.objects.count(), 0)
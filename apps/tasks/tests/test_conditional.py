@@ -0,0 +1,147 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+
+
+class TaskConditionalRequestTest(APITestCase):
+    """
+    Test cases for ETag / Last-Modified handling of the task endpoints.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.task = Task.objects.create(
+            title="Task 1",
+            status="new",
+            priority="high",
+            description="task description",
+            due_date="2023-07-01",
+        )
+        self.list_url = reverse("tasks:task_list_create_api_view")
+        self.detail_url = reverse("tasks:task_detail_api_view", args=[self.task.pk])
+        self.data = {
+            "title": "Updated Task",
+            "status": "completed",
+            "priority": "low",
+            "description": "task description",
+            "due_date": "2023-07-01",
+        }
+
+    def test_detail_if_none_match(self):
+        """
+        Test that a matching ETag yields 304, with or without a cached body.
+        """
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        cache.clear()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self):
+        """
+        Test that an unchanged task yields 304 for If-Modified-Since.
+        """
+        response = self.client.get(self.detail_url)
+
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_bulk_update(self):
+        """
+        Test that queryset updates give the row a new version.
+        """
+        etag = self.client.get(self.detail_url)["ETag"]
+        Task.objects.filter(pk=self.task.pk).update(status="completed")
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_if_none_match(self):
+        """
+        Test list ETags and their invalidation by writes.
+        """
+        response = self.client.get(self.list_url)
+        etag = response["ETag"]
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        cache.clear()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            self.list_url, {"status": "completed"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.task.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_put_if_match(self):
+        """
+        Test that PUT only applies when If-Match holds the current ETag.
+        """
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.put(
+            self.detail_url, self.data, format="json", HTTP_IF_MATCH='"stale"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, "Task 1")
+
+        response = self.client.put(
+            self.detail_url, self.data, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, "Updated Task")
+
+        # The previous ETag is stale now.
+        response = self.client.put(
+            self.detail_url, self.data, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_delete_if_match(self):
+        """
+        Test that DELETE only applies when If-Match holds the current ETag.
+        """
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
+
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
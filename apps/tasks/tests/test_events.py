@@ -0,0 +1,345 @@
+import asyncio
+import json
+import logging
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..asgi import TaskASGIHandler
+from ..events import (
+    TaskEvent,
+    TaskEventSubscriber,
+    TaskEventSubscription,
+    encode_position,
+    task_event_hub,
+)
+from ..models import Task
+from ..pagination import TaskChangesPagination
+from .utils import task_data
+
+
+def parse_events(body):
+    """
+    Parse an event stream into (event, id, data) tuples, leaving out the
+    messages without an event name.
+    """
+    events = []
+    for message in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in message.split("\n") if ": " in line
+        )
+        if "event" in fields:
+            data = json.loads(fields["data"])
+            events.append((fields["event"], fields.get("id"), data))
+    return events
+
+
+class TaskEventsAPITest(APITestCase):
+    """
+    Test cases for the TaskEventsAPIView served by WSGI, where the stream
+    sends the events since the client's position and ends.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_events_api_view")
+        self.tasks = [Task.objects.create(**task_data(f"Task {i}")) for i in range(3)]
+
+    def get_events(self, params=None, **headers):
+        response = self.client.get(self.url, params or {}, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream; charset=utf-8")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        body = b"".join(response.streaming_content)
+        last_id = [line for line in body.decode().split("\n") if line.startswith("id")]
+        return parse_events(body), last_id[-1][4:]
+
+    def test_events_since_last_event_id(self):
+        """
+        Test that a reconnecting client gets the changes since its last
+        event id, which it keeps when there were none.
+        """
+        events, last_id = self.get_events()
+        self.assertEqual(events, [])
+
+        Task.objects.filter(pk=self.tasks[0].pk).update(status="completed")
+        deleted = self.tasks[1].pk
+        self.tasks[1].delete()
+
+        events, last_id = self.get_events(HTTP_LAST_EVENT_ID=last_id)
+        self.assertEqual(
+            [(event, data["id"]) for event, _, data in events],
+            [("task", self.tasks[0].pk), ("delete", deleted)],
+        )
+        self.assertEqual(events[0][2]["status"], "completed")
+        self.assertEqual(events[1][2]["reason"], "deleted")
+        self.assertEqual(events[1][1], last_id)
+
+        events, _ = self.get_events(HTTP_LAST_EVENT_ID=last_id)
+        self.assertEqual(events, [])
+
+    def test_filters(self):
+        """
+        Test that the changes of tasks not matching the filters are sent as
+        filtered deletes.
+        """
+        _, last_id = self.get_events()
+        Task.objects.filter(pk=self.tasks[0].pk).update(priority="high")
+        Task.objects.filter(pk=self.tasks[1].pk).update(status="completed")
+
+        events, _ = self.get_events(
+            {"status__in": "new,in progress", "priority": "high"},
+            HTTP_LAST_EVENT_ID=last_id,
+        )
+
+        self.assertEqual(
+            [(event, data["id"], data.get("reason")) for event, _, data in events],
+            [
+                ("task", self.tasks[0].pk, None),
+                ("delete", self.tasks[1].pk, "filtered"),
+            ],
+        )
+
+    def test_since_cursor_and_resync(self):
+        """
+        Test that a change feed cursor is a valid position and that an
+        invalid one asks the client to resync.
+        """
+        since = self.client.get(reverse("tasks:task_changes_api_view")).data["since"]
+        Task.objects.create(**task_data("New"))
+
+        events, _ = self.get_events({"since": since})
+        self.assertEqual([data["title"] for _, _, data in events], ["New"])
+
+        events, _ = self.get_events(HTTP_LAST_EVENT_ID="not a cursor")
+        self.assertEqual(events, [("resync", None, {"since": None})])
+
+    def test_writes_between_the_reads(self):
+        """
+        Test that the events read while tasks are written between the task
+        and tombstone queries do not skip the tasks written first.
+        """
+        _, last_id = self.get_events()
+        get_keyset_filter = TaskChangesPagination.get_keyset_filter
+        deleted = self.tasks[2].pk
+        created = []
+
+        def write_after_the_task_read(paginator, position, reverse):
+            # The tombstones are read second.
+            if paginator.fetch_count == 1:
+                created.append(Task.objects.create(**task_data("New")))
+                self.tasks[2].delete()
+            paginator.fetch_count += 1
+            return get_keyset_filter(paginator, position, reverse)
+
+        with mock.patch.object(
+            TaskChangesPagination, "fetch_count", 0, create=True
+        ), mock.patch.object(
+            TaskChangesPagination, "get_keyset_filter", write_after_the_task_read
+        ):
+            events, last_id = self.get_events(HTTP_LAST_EVENT_ID=last_id)
+        self.assertEqual(events, [])
+
+        events, _ = self.get_events(HTTP_LAST_EVENT_ID=last_id)
+        self.assertEqual(
+            [(event, data["id"]) for event, _, data in events],
+            [("task", created[0].pk), ("delete", deleted)],
+        )
+
+    def test_authentication(self):
+        """
+        Test that the stream requires authentication.
+        """
+        self.client.credentials()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(parse_events(response.content)[0][0], "error")
+
+
+class TaskEventSubscriberTest(SimpleTestCase):
+    """
+    Test cases for the queue of a task event stream.
+    """
+
+    def event(self, seq):
+        return TaskEvent((seq, 1), None, None, f"event {seq}\n\n".encode(), b"")
+
+    @override_settings(TASKS_EVENTS_QUEUE_SIZE=2)
+    async def test_overflow(self):
+        """
+        Test that a subscriber falling behind gets a resync from its last
+        sent event instead of the events it missed.
+        """
+        subscriber = TaskEventSubscriber(TaskEventSubscription((1, 1)))
+        subscriber.publish(self.event(1))
+        subscriber.publish(self.event(2))
+        self.assertEqual(await subscriber.get(), b"event 2\n\n")
+
+        for seq in range(3, 6):
+            subscriber.publish(self.event(seq))
+        subscriber.publish(self.event(6))
+
+        message = await subscriber.get()
+        self.assertEqual(
+            parse_events(message),
+            [("resync", None, {"since": encode_position((2, 1))})],
+        )
+        self.assertTrue(message.endswith(b"event 6\n\n"))
+
+    async def test_close(self):
+        """
+        Test that a closed subscriber drops its events and stops.
+        """
+        subscriber = TaskEventSubscriber(TaskEventSubscription((1, 1)))
+        subscriber.publish(self.event(2))
+        subscriber.close()
+        subscriber.publish(self.event(3))
+
+        self.assertIsNone(await subscriber.get())
+
+
+# The hub reads on the commits of the tests only, not on polls racing them.
+@override_settings(TASKS_EVENTS_POLL_INTERVAL=3600)
+class TaskEventStreamTest(TransactionTestCase):
+    """
+    Test cases for the task event stream kept open by the TaskASGIHandler.
+
+    The test database is in memory, where a read and a write of different
+    threads fail with "database table is locked": the tests only write
+    while the hub is idle, and read the events of a write before the next.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.task = Task.objects.create(**task_data("Task 1"))
+
+    async def connect(self, query="", last_event_id=None):
+        headers = [
+            (b"host", b"testserver"),
+            (b"authorization", f"Bearer {self.token}".encode()),
+        ]
+        if last_event_id is not None:
+            headers.append((b"last-event-id", last_event_id.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": reverse("tasks:task_events_api_view"),
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+        communicator = ApplicationCommunicator(TaskASGIHandler(), scope)
+        await communicator.send_input({"type": "http.request"})
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start["status"], 200)
+        opening = await communicator.receive_output(timeout=5)
+        self.assertTrue(opening["more_body"])
+        return communicator, opening["body"]
+
+    async def write(self, func, *args, **kwargs):
+        """
+        Run the write ``func`` once the hub has published the earlier ones.
+        """
+        await asyncio.wait_for(task_event_hub.idle.wait(), 5)
+        return await sync_to_async(func)(*args, **kwargs)
+
+    async def receive_events(self, communicator, count):
+        events = []
+        while len(events) < count:
+            message = await communicator.receive_output(timeout=5)
+            events.extend(parse_events(message["body"]))
+        return events
+
+    async def disconnect(self, communicator):
+        await communicator.send_input({"type": "http.disconnect"})
+        # The stream ends with an empty message, after any pending events.
+        message = await communicator.receive_output(timeout=5)
+        while message.get("more_body", False):
+            message = await communicator.receive_output(timeout=5)
+        await communicator.wait(timeout=5)
+
+    async def test_live_events(self):
+        """
+        Test that the writes made while connected are pushed, filtered.
+        """
+        communicator, _ = await self.connect("status=new")
+
+        with self.assertNoLogs("apps.tasks.events", "ERROR"):
+            # Wait for each event: writes read together are sent as one event.
+            task = await self.write(Task.objects.create, **task_data("Live"))
+            events = await self.receive_events(communicator, 1)
+            await self.write(Task.objects.filter(pk=task.pk).update, status="completed")
+            events += await self.receive_events(communicator, 1)
+            await self.write(Task.objects.filter(pk=self.task.pk).delete)
+            events += await self.receive_events(communicator, 1)
+
+        self.assertEqual(
+            [(event, data["id"], data.get("reason")) for event, _, data in events],
+            [
+                ("task", task.pk, None),
+                ("delete", task.pk, "filtered"),
+                ("delete", self.task.pk, "deleted"),
+            ],
+        )
+        await self.disconnect(communicator)
+
+    async def test_resume(self):
+        """
+        Test that a stream resuming from an event id first replays the
+        events the other streams already got.
+        """
+        first, opening = await self.connect()
+        last_id = opening.decode().split("id: ")[1].split("\n")[0]
+
+        def create_tasks(*titles):
+            # One commit, so the hub reads both tasks at once.
+            with transaction.atomic():
+                for title in titles:
+                    Task.objects.create(**task_data(title))
+
+        with self.assertNoLogs("apps.tasks.events", "ERROR"):
+            await self.write(create_tasks, "A", "B")
+            await self.receive_events(first, 2)
+
+            second, opening = await self.connect(last_event_id=last_id)
+            events = parse_events(opening)
+            await self.write(create_tasks, "C")
+            events += await self.receive_events(second, 1)
+
+        self.assertEqual([data["title"] for _, _, data in events], ["A", "B", "C"])
+        await self.disconnect(first)
+        await self.disconnect(second)
+
+    @override_settings(TASKS_EVENTS_HEARTBEAT=0.1)
+    async def test_heartbeat(self):
+        """
+        Test that an idle stream gets heartbeat comments.
+        """
+        communicator, _ = await self.connect()
+
+        message = await communicator.receive_output(timeout=5)
+
+        self.assertEqual(message["body"], b": \n\n")
+        await self.disconnect(communicator)
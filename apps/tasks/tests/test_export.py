@@ -0,0 +1,106 @@
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+from ..serializers import TaskSerializer
+
+
+@override_settings(TASKS_EXPORT_CHUNK_SIZE=2)
+class TaskExportAPIViewTest(APITestCase):
+    """
+    Test cases for the TaskExportAPIView.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.access_token = AccessToken.for_user(self.user)
+        self.url = reverse("tasks:task_export_api_view")
+
+        for i in range(5):
+            Task.objects.create(
+                title=f"Task {i}",
+                status="new" if i % 2 else "completed",
+                priority="high",
+                description="task description",
+                due_date="2023-07-01",
+            )
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(self.access_token))
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_export_ndjson(self):
+        """
+        Test that the default export writes one JSON document per line.
+        """
+        self.authenticate()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = self.read(response).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            json.loads(
+                json.dumps(TaskSerializer(Task.objects.order_by("pk"), many=True).data)
+            ),
+        )
+
+    def test_export_json_array(self):
+        """
+        Test exporting as a single JSON array.
+        """
+        self.authenticate()
+        response = self.client.get(self.url, {"format": "json"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(self.read(response))
+        self.assertEqual(
+            [task["title"] for task in data], [f"Task {i}" for i in range(5)]
+        )
+
+    def test_export_json_array_empty(self):
+        """
+        Test that an empty export is still a valid JSON array.
+        """
+        self.authenticate()
+        response = self.client.get(
+            self.url, {"status": "in progress"}, HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(json.loads(self.read(response)), [])
+
+    def test_export_with_filters(self):
+        """
+        Test that the export honours the status and priority filters.
+        """
+        self.authenticate()
+        response = self.client.get(self.url, {"status": "new", "priority": "high"})
+
+        lines = self.read(response).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(json.loads(line)["status"] == "new" for line in lines))
+
+    def test_export_requires_authentication(self):
+        """
+        Test that the export is not available to anonymous users.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,157 @@
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+
+
+@override_settings(TASKS_PAGE_SIZE=2)
+class TaskSparseFieldsTest(APITestCase):
+    """
+    Test cases for the ``fields`` and ``exclude`` query parameters.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.list_url = reverse("tasks:task_list_create_api_view")
+        self.export_url = reverse("tasks:task_export_api_view")
+        for i in range(3):
+            self.task = Task.objects.create(
+                title=f"Task {i}",
+                description="A long description " * 100,
+                status="new",
+                priority="high",
+                due_date="2023-07-01",
+            )
+        self.detail_url = reverse(
+            "tasks:task_detail_api_view", kwargs={"pk": self.task.pk}
+        )
+
+    def selected_columns(self, queries):
+        return [q["sql"] for q in queries if 'FROM "tasks_task"' in q["sql"]]
+
+    def test_list_fields(self):
+        """
+        Test that only the requested fields are returned and selected.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.list_url, {"fields": "id,title,status,due_date"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [list(task) for task in response.data["results"]],
+            [["id", "title", "due_date", "status"]] * 2,
+        )
+        sql = self.selected_columns(queries)
+        self.assertTrue(sql)
+        self.assertFalse(any('"description"' in query for query in sql))
+
+        # The pagination columns are selected even if they are not returned.
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [(task["title"], len(task)) for task in response.data["results"]],
+            [("Task 0", 4)],
+        )
+
+    def test_list_exclude(self):
+        """
+        Test that excluded fields are left out, combined with ``fields``.
+        """
+        response = self.client.get(self.list_url, {"exclude": "description"})
+        self.assertEqual(
+            list(response.data["results"][0]),
+            ["id", "title", "due_date", "status", "priority", "created_at"],
+        )
+
+        response = self.client.get(
+            self.list_url, {"fields": "title,description", "exclude": "description"}
+        )
+        self.assertEqual(list(response.data["results"][0]), ["title"])
+
+    def test_list_fields_etag(self):
+        """
+        Test that every fieldset gets its own ETag.
+        """
+        full = self.client.get(self.list_url)
+        sparse = self.client.get(self.list_url, {"fields": "title"})
+
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+        response = self.client.get(
+            self.list_url, {"fields": "title"}, HTTP_IF_NONE_MATCH=sparse["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_fields_columnar(self):
+        """
+        Test that the columnar format only has the requested columns.
+        """
+        response = self.client.get(
+            self.list_url, {"fields": "id,status", "format": "columnar"}
+        )
+
+        table = json.loads(response.content)["results"]
+        self.assertEqual(table["columns"], ["id", "status"])
+        self.assertEqual(list(table["dictionaries"]), ["status"])
+
+    def test_invalid_fields(self):
+        """
+        Test that unknown field names and empty fieldsets are rejected.
+        """
+        for url in (self.list_url, self.export_url, self.detail_url):
+            for params in (
+                {"fields": "title,secret"},
+                {"exclude": "updated_at"},
+                {"fields": ""},
+                {"fields": "title", "exclude": "title"},
+            ):
+                response = self.client.get(url, params)
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST, (url, params)
+                )
+
+    def test_detail_fields(self):
+        """
+        Test that a task is loaded and returned with the requested fields only.
+        """
+        full = self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, {"fields": "id,title"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"id": self.task.pk, "title": "Task 2"})
+        self.assertFalse(
+            any('"description"' in sql for sql in self.selected_columns(queries))
+        )
+        self.assertNotEqual(response["ETag"], full["ETag"])
+
+    def test_export_fields(self):
+        """
+        Test that the export streams the requested fields only.
+        """
+        response = self.client.get(self.export_url, {"exclude": "description"})
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(rows), 3)
+        self.assertNotIn("description", rows[0])
+        self.assertIn("title", rows[0])
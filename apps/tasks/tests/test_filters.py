@@ -0,0 +1,176 @@
+import datetime
+import logging
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+
+TODAY = datetime.date(2023, 7, 10)
+
+
+@override_settings(TASKS_PAGE_SIZE=2)
+@mock.patch("django.utils.timezone.localdate", lambda: TODAY)
+class TaskListFilterTest(APITestCase):
+    """
+    Test cases for the range, multi-value and ordering parameters of the
+    task list.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_list_create_api_view")
+
+        rows = [
+            # status, priority, due day, created day
+            ("new", "high", 5, 1),
+            ("in progress", "low", 8, 2),
+            ("completed", "high", 3, 3),
+            ("new", "low", 12, 4),
+            ("in progress", "high", 9, 5),
+            ("new", "medium", 9, 6),
+        ]
+        self.tasks = []
+        for i, (task_status, priority, due, created) in enumerate(rows):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                description="task description",
+                status=task_status,
+                priority=priority,
+                due_date=datetime.date(2023, 7, due),
+            )
+            Task.objects.filter(pk=task.pk).update(
+                created_at=datetime.date(2023, 7, created)
+            )
+            self.tasks.append(task.pk)
+
+    def collect(self, params):
+        ids = []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task["id"] for task in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def expected(self, *indexes):
+        return [self.tasks[i] for i in indexes]
+
+    def test_due_date_range(self):
+        """
+        Test due date ranges, soonest due first by default.
+        """
+        self.assertEqual(
+            self.collect({"due_after": "2023-07-05", "due_before": "2023-07-09"}),
+            self.expected(0, 1, 4, 5),
+        )
+        self.assertEqual(
+            self.collect({"due_before": "2023-07-08", "ordering": "-due_date"}),
+            self.expected(1, 0, 2),
+        )
+
+    def test_created_after(self):
+        """
+        Test the created_after filter.
+        """
+        self.assertEqual(
+            self.collect({"created_after": "2023-07-04"}), self.expected(5, 4, 3)
+        )
+
+    def test_status_in(self):
+        """
+        Test several statuses, merged into one ordering across pages.
+        """
+        self.assertEqual(
+            self.collect({"status__in": "new,completed"}), self.expected(5, 3, 2, 0)
+        )
+        self.assertEqual(
+            self.collect({"status__in": ["in progress", "completed"], "status": "new"}),
+            [],
+        )
+
+    def test_overdue(self):
+        """
+        Test that overdue only lists open tasks due before today.
+        """
+        self.assertEqual(self.collect({"overdue": "1"}), self.expected(0, 1, 4, 5))
+        self.assertEqual(
+            self.collect({"overdue": "true", "priority": "high"}), self.expected(0, 4)
+        )
+
+    def test_ordering(self):
+        """
+        Test every ordering, walked forward and back with the cursor.
+        """
+        orderings = {
+            "-created_at": self.expected(5, 4, 3, 2, 1, 0),
+            "created_at": self.expected(0, 1, 2, 3, 4, 5),
+            "due_date": self.expected(2, 0, 1, 4, 5, 3),
+            "-due_date": self.expected(3, 5, 4, 1, 0, 2),
+            "-priority": self.expected(2, 0, 4, 5, 1, 3),
+        }
+        for ordering, expected in orderings.items():
+            self.assertEqual(self.collect({"ordering": ordering}), expected, ordering)
+
+        response = self.client.get(self.url, {"ordering": "due_date"})
+        response = self.client.get(response.data["next"])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [task["id"] for task in response.data["results"]], self.expected(2, 0)
+        )
+
+    def test_priority_ordering_with_status(self):
+        """
+        Test the -priority ordering of several statuses, merged across pages.
+        """
+        self.assertEqual(
+            self.collect({"ordering": "-priority", "status__in": "new,in progress"}),
+            self.expected(0, 4, 5, 1, 3),
+        )
+
+    def test_unknown_choices(self):
+        """
+        Test that unknown status and priority labels match no task.
+        """
+        for params in (
+            {"status": "pending"},
+            {"status__in": "pending,archived"},
+            {"priority": "urgent"},
+            {"priority": "3"},
+        ):
+            self.assertEqual(self.collect(params), [], params)
+        self.assertEqual(
+            self.collect({"status__in": "pending,completed"}), self.expected(2)
+        )
+
+    def test_invalid_filters(self):
+        """
+        Test that invalid dates and orderings, and range filters on another
+        field than the ordering, are rejected.
+        """
+        for params in (
+            {"due_after": "soon"},
+            {"created_after": "2023-13-01"},
+            {"ordering": "title"},
+            {"ordering": "due_date", "q": "task"},
+            {"due_before": "2023-07-08", "ordering": "-created_at"},
+            {"overdue": "1", "ordering": "-priority"},
+            {"created_after": "2023-07-04", "ordering": "due_date"},
+            {"created_after": "2023-07-04", "due_after": "2023-07-05"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
@@ -0,0 +1,144 @@
+import io
+import json
+import logging
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..logs import JSONFormatter, QueueListenerHandler, RateLimitFilter
+
+
+class SlowHandler(logging.Handler):
+    """
+    A handler writing to a disk that takes a while.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.written = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.writing.set()
+        self.written.wait(5)
+        self.records.append(self.format(record))
+
+
+class LoggingPipelineTest(SimpleTestCase):
+    """
+    Test cases for the queue-based JSON logging pipeline.
+    """
+
+    def make_logger(self, *handlers):
+        logger = logging.getLogger(f"apps.tasks.tests.{self._testMethodName}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        for handler in handlers:
+            logger.addHandler(handler)
+            self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def make_queue_handler(self, target, **kwargs):
+        target.set_name(f"target_{self._testMethodName}")
+        logging._handlers[target.name] = target
+        self.addCleanup(logging._handlers.pop, target.name)
+        handler = QueueListenerHandler([target.name], **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_json_records(self):
+        """
+        Test that records are formatted as JSON with their extra fields.
+        """
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(JSONFormatter())
+        logger = self.make_logger(target)
+
+        try:
+            raise ValueError("boom")
+        except ValueError as e:
+            logger.error("Failed in %s: %s", "View", e, exc_info=e, extra={"id": 7})
+
+        data = json.loads(stream.getvalue())
+        self.assertEqual(data["level"], "ERROR")
+        self.assertEqual(data["message"], "Failed in View: boom")
+        self.assertEqual(data["id"], 7)
+        self.assertIn("ValueError: boom", data["exception"])
+
+    def test_slow_handlers_do_not_block(self):
+        """
+        Test that logging returns at once while the writes are still pending,
+        and that the message is only formatted by the listener.
+        """
+        target = SlowHandler()
+        handler = self.make_queue_handler(target)
+        logger = self.make_logger(handler)
+        arg = mock.Mock(__str__=mock.Mock(return_value="arg"))
+
+        logger.error("error %s", arg)
+
+        arg.__str__.assert_not_called()
+        self.assertEqual(target.records, [])
+        target.written.set()
+        handler.stop()
+        self.assertEqual(target.records, ["error arg"])
+
+    def test_full_queue_drops_records(self):
+        """
+        Test that records are dropped, and counted, while the queue is full.
+        """
+        target = SlowHandler()
+        handler = self.make_queue_handler(target, maxsize=1)
+        handler.setFormatter(JSONFormatter())
+        target.setFormatter(JSONFormatter())
+        logger = self.make_logger(handler)
+
+        handler.start()
+        handler.queue.put(logging.makeLogRecord({"msg": "writing", "levelno": 40}))
+        target.writing.wait(5)
+        handler.queue.put(logging.makeLogRecord({"msg": "waiting", "levelno": 40}))
+        for i in range(3):
+            logger.error("error %s", i)
+        self.assertEqual(handler.dropped, 3)
+
+        target.written.set()
+        handler.stop()
+        logger.error("after")
+        handler.stop()
+
+        records = [json.loads(line) for line in target.records]
+        self.assertEqual(
+            [record["message"] for record in records], ["writing", "waiting", "after"]
+        )
+        self.assertEqual(records[-1]["dropped"], 3)
+
+    def test_identical_errors_are_rate_limited(self):
+        """
+        Test that repeated errors from one call site are limited and counted.
+        """
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(JSONFormatter())
+        target.addFilter(RateLimitFilter(rate=2, per=60))
+        logger = self.make_logger(target)
+
+        def log_error(i):
+            logger.error("error %s", i)
+
+        with mock.patch("time.monotonic", return_value=0):
+            for i in range(5):
+                log_error(i)
+            logger.info("not limited")
+            logger.info("not limited")
+        with mock.patch("time.monotonic", return_value=60):
+            log_error(5)
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            [record["message"] for record in records],
+            ["error 0", "error 1", "not limited", "not limited", "error 5"],
+        )
+        self.assertEqual(records[-1]["suppressed"], 3)
@@ -0,0 +1,198 @@
+import logging
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..authentication import user_cache
+from ..metrics import CACHE_REQUESTS, REQUESTS_IN_FLIGHT, Histogram, get_store
+from ..models import Task
+from ..timing import RequestTimings
+
+
+class MetricsTest(APITestCase):
+    """
+    Test cases for the metrics middleware and the /metrics endpoint.
+    """
+
+    url = reverse("metrics")
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+        user_cache.clear()
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(TASKS_METRICS_DIR=directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.task = Task.objects.create(
+            title="Task 1",
+            status="new",
+            priority="high",
+            description="task description",
+            due_date="2023-07-01",
+        )
+
+    def get_metrics(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        return response.content.decode().splitlines()
+
+    def test_request_metrics(self):
+        """
+        Test the request metrics per URL name, including the token views.
+        """
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        list_url = reverse("tasks:task_list_create_api_view")
+        self.client.get(list_url)
+        self.client.get(list_url)
+        self.client.get(reverse("tasks:task_detail_api_view", args=[self.task.pk]))
+        self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "wrong"},
+        )
+
+        lines = self.get_metrics()
+
+        list_view = 'view="tasks:task_list_create_api_view"'
+        self.assertIn(
+            f'tms_http_requests_total{{{list_view},method="GET",status="200"}} 2.0',
+            lines,
+        )
+        self.assertIn(
+            'tms_http_requests_total{view="token_obtain_pair",method="POST",'
+            'status="401"} 1.0',
+            lines,
+        )
+        self.assertIn(
+            f'tms_http_request_duration_seconds_count{{{list_view},method="GET"}} 2.0',
+            lines,
+        )
+        self.assertIn(
+            f'tms_http_request_duration_seconds_bucket{{{list_view},method="GET",'
+            f'le="+Inf"}} 2.0',
+            lines,
+        )
+        self.assertIn(f"tms_http_response_size_bytes_count{{{list_view}}} 2.0", lines)
+        # The user lookup and the page, then a cached response.
+        self.assertIn(
+            f'tms_http_request_queries_bucket{{{list_view},le="0.0"}} 1.0', lines
+        )
+        self.assertIn(
+            f'tms_http_request_queries_bucket{{{list_view},le="2.0"}} 2.0', lines
+        )
+        self.assertIn(
+            'tms_cache_requests_total{cache="response",result="hit"} 1.0', lines
+        )
+        self.assertIn(
+            'tms_cache_requests_total{cache="response",result="miss"} 2.0', lines
+        )
+        self.assertIn('tms_cache_requests_total{cache="auth",result="hit"} 2.0', lines)
+        # The /metrics request itself.
+        self.assertIn("tms_http_requests_in_flight 1.0", lines)
+
+    @override_settings(TASKS_TIMING_SAMPLE_RATE=0)
+    def test_queries_are_not_timed(self):
+        """
+        Test that the queries of the requests not sampled for timing are
+        counted without being timed.
+        """
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        url = reverse("tasks:task_detail_api_view", args=[self.task.pk])
+
+        with mock.patch.object(RequestTimings, "add_query") as add_query:
+            self.client.get(url)
+
+        add_query.assert_not_called()
+        self.assertIn(
+            'tms_http_request_queries_bucket{view="tasks:task_detail_api_view",'
+            'le="2.0"} 1.0',
+            self.get_metrics(),
+        )
+
+    def test_unknown_methods(self):
+        """
+        Test that non-standard request methods share the "other" label.
+        """
+        url = reverse("tasks:task_list_create_api_view")
+        for method in ("FOO", "BAR"):
+            self.client.generic(method, url)
+
+        lines = self.get_metrics()
+
+        self.assertIn(
+            'tms_http_requests_total{view="tasks:task_list_create_api_view",'
+            'method="other",status="401"} 2.0',
+            lines,
+        )
+        self.assertFalse(any('method="FOO"' in line for line in lines))
+
+    @override_settings(TASKS_METRICS_ALLOWED_IPS=["10.0.0.0/8"])
+    def test_allowed_ips(self):
+        """
+        Test that only the clients of TASKS_METRICS_ALLOWED_IPS get the
+        metrics.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(self.url, REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_processes_are_aggregated(self):
+        """
+        Test that the metrics of every worker process are summed, and that
+        only live processes count towards gauges.
+        """
+        CACHE_REQUESTS.inc(cache="auth", result="hit")
+        pid = os.fork()
+        if pid == 0:
+            try:
+                CACHE_REQUESTS.inc(2, cache="auth", result="hit")
+                REQUESTS_IN_FLIGHT.inc()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        lines = self.get_metrics()
+
+        self.assertEqual(len(os.listdir(get_store().directory)), 2)
+        self.assertIn('tms_cache_requests_total{cache="auth",result="hit"} 3.0', lines)
+        self.assertIn("tms_http_requests_in_flight 1.0", lines)
+
+    def test_histogram(self):
+        """
+        Test that histogram buckets are cumulative.
+        """
+        histogram = Histogram("test_histogram", "Test.", ("name",), buckets=(1, 5))
+        for value in (0.5, 3, 4, 10):
+            histogram.observe(value, name="a")
+        store = get_store()
+
+        values = {key: value for key, value, _ in store.read()}
+
+        self.assertEqual(values['["test_histogram_bucket", ["a"], 1]'], 1)
+        self.assertEqual(values['["test_histogram_bucket", ["a"], 5]'], 2)
+        self.assertEqual(values['["test_histogram_sum", ["a"]]'], 17.5)
@@ -0,0 +1,136 @@
+import datetime
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+
+
+@override_settings(TASKS_PAGE_SIZE=3, TASKS_MAX_PAGE_SIZE=5)
+class TaskCursorPaginationTest(APITestCase):
+    """
+    Test cases for the keyset pagination of the task list.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_list_create_api_view")
+
+        # Two tasks per day so the id tie-breaker is exercised.
+        for i in range(8):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                status="new",
+                priority="low" if i % 2 else "high",
+                description="task description",
+                due_date="2023-07-01",
+            )
+            Task.objects.filter(pk=task.pk).update(
+                created_at=datetime.date(2023, 7, 1) + datetime.timedelta(days=i // 2)
+            )
+
+        self.expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def collect_forward(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            ids.extend(task["id"] for task in response.data["results"])
+            url = response.data["next"]
+        return ids, pages
+
+    def test_walk_forward_covers_all_rows_in_order(self):
+        """
+        Test following next links returns every task exactly once in order.
+        """
+        ids, pages = self.collect_forward(self.url)
+
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(page["results"]) for page in pages], [3, 3, 2])
+        self.assertIsNone(pages[0]["previous"])
+        self.assertIsNone(pages[-1]["next"])
+
+    def test_walk_backward_returns_previous_pages(self):
+        """
+        Test following previous links from the last page.
+        """
+        _, pages = self.collect_forward(self.url)
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[1]["results"])
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(response.data["results"], pages[0]["results"])
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_page_size_is_configurable_and_capped(self):
+        """
+        Test the page_size parameter and its hard maximum.
+        """
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(self.url, {"page_size": 100})
+        self.assertEqual(len(response.data["results"]), 5)
+
+        response = self.client.get(self.url, {"page_size": "abc"})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_filters_are_kept_across_pages(self):
+        """
+        Test that filters are preserved in the pagination links.
+        """
+        ids, _ = self.collect_forward(self.url + "?priority=low&page_size=2")
+
+        self.assertEqual(
+            ids,
+            list(
+                Task.objects.filter(priority="low")
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor returns 404.
+        """
+        for cursor in ("garbage", "cD1hYmM=", "cD0yMDIzLTA3LTAx"):
+            response = self.client.get(self.url, {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deep_page_uses_keyset_condition(self):
+        """
+        Test that later pages are fetched without OFFSET.
+        """
+        _, pages = self.collect_forward(self.url)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(pages[-2]["next"])
+
+        task_queries = [q["sql"] for q in queries if '"tasks_task"' in q["sql"]]
+        self.assertEqual(len(task_queries), 1)
+        self.assertNotIn("OFFSET", task_queries[0])
+        self.assertIn("LIMIT 4", task_queries[0])
@@ -0,0 +1,200 @@
+import datetime
+import itertools
+import unittest
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+
+from ..filters import ORDERINGS, TaskFilter
+from ..models import Task, TaskArchive
+from ..pagination import TaskCursorPagination
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+class TaskQueryPlanTest(TestCase):
+    """
+    Regression tests for the query plans of the Task access patterns.
+
+    Every list query must be answered from an index in the keyset order,
+    i.e. without a full table scan and without a temporary sort.
+    """
+
+    position = (datetime.date(2023, 7, 1), 100)
+
+    def get_plan(self, queryset):
+        return queryset.explain()
+
+    def assertIndexed(self, queryset, index_name):
+        plan = self.get_plan(queryset)
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        self.assertNotIn("SCAN tasks_task\n", plan + "\n")
+        self.assertNotIn("USE TEMP B-TREE", plan)
+
+    def list_queryset(self, cursor=None, **filters):
+        paginator = TaskCursorPagination()
+        queryset = Task.objects.filter(**filters).order_by(*paginator.ordering)
+        if cursor is not None:
+            queryset = queryset.filter(paginator.get_keyset_filter(cursor))
+        return queryset[:51]
+
+    def test_unfiltered_list(self):
+        """
+        Test the first and a deep page of the unfiltered list.
+        """
+        self.assertIndexed(self.list_queryset(), "task_created_idx")
+        self.assertIndexed(self.list_queryset(self.position), "task_created_idx")
+
+    def test_status_filtered_list(self):
+        """
+        Test the list filtered on status.
+        """
+        self.assertIndexed(self.list_queryset(status="new"), "task_status_created_idx")
+        self.assertIndexed(
+            self.list_queryset(self.position, status="new"),
+            "task_status_created_idx",
+        )
+
+    def test_priority_filtered_list(self):
+        """
+        Test the list filtered on priority.
+        """
+        self.assertIndexed(
+            self.list_queryset(priority="high"), "task_priority_created_idx"
+        )
+        self.assertIndexed(
+            self.list_queryset(self.position, priority="high"),
+            "task_priority_created_idx",
+        )
+
+    def test_status_and_priority_filtered_list(self):
+        """
+        Test the list filtered on both status and priority.
+        """
+        self.assertIndexed(
+            self.list_queryset(status="new", priority="high"),
+            "task_status_prio_created_idx",
+        )
+        self.assertIndexed(
+            self.list_queryset(self.position, status="new", priority="high"),
+            "task_status_prio_created_idx",
+        )
+
+    def test_previous_page(self):
+        """
+        Test that walking backwards scans the same index in reverse.
+        """
+        paginator = TaskCursorPagination()
+        queryset = (
+            Task.objects.filter(status="new")
+            .order_by(*paginator.get_ordering(reverse=True))
+            .filter(paginator.get_keyset_filter(self.position, reverse=True))
+        )
+        self.assertIndexed(queryset[:51], "task_status_created_idx")
+
+    def test_due_date_filter(self):
+        """
+        Test the admin due_date range filter.
+        """
+        plan = self.get_plan(
+            Task.objects.filter(
+                due_date__gte=datetime.date(2023, 7, 1),
+                due_date__lt=datetime.date(2023, 8, 1),
+            )
+        )
+        self.assertIn("SEARCH tasks_task USING INDEX task_due_date_idx", plan)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+class TaskListFilterQueryPlanTest(TestCase):
+    """
+    Regression tests for the query plans of the list filters and orderings.
+
+    Every accepted combination of the filters and orderings must be read
+    from an index in the keyset order, first and deep pages alike.
+    """
+
+    today = datetime.date(2023, 7, 1)
+    filters = [
+        ("", "status=new", "status__in=new,completed"),
+        ("", "priority=high"),
+        (
+            "",
+            "due_after=2023-07-01&due_before=2023-07-08",
+            "due_before=2023-07-08",
+            "overdue=1",
+        ),
+        ("", "created_after=2023-07-01"),
+        ("", *(f"ordering={ordering}" for ordering in ORDERINGS)),
+    ]
+
+    def get_querysets(self, query, model=Task, deep=False):
+        task_filter = TaskFilter(QueryDict(query), today=self.today)
+        paginator = TaskCursorPagination()
+        paginator.ordering = task_filter.ordering
+        position = {
+            "created_at": self.today,
+            "due_date": self.today,
+            "id": 100,
+            # A cursor of a priority filtered list is within that priority.
+            "priority": task_filter.priority or 2,
+        }
+        for queryset in task_filter.split(model.objects.all()):
+            queryset = queryset.order_by(*paginator.ordering)
+            if deep:
+                cursor = tuple(position[f] for f in paginator.get_position_fields())
+                queryset = queryset.filter(paginator.get_keyset_filter(cursor))
+            yield queryset[:51]
+
+    def assertIndexed(self, query, model=Task):
+        table = model._meta.db_table
+        for deep in (False, True):
+            for queryset in self.get_querysets(query, model, deep):
+                plan = queryset.explain()
+                self.assertIn("USING INDEX", plan, query)
+                self.assertNotIn(f"SCAN {table}\n", plan + "\n", query)
+                self.assertNotIn("USE TEMP B-TREE", plan, query)
+
+    def test_filter_combinations(self):
+        """
+        Test every combination of the filters and orderings on the task
+        table, and the ones without a status filter on the archive table.
+        """
+        accepted = 0
+        for params in itertools.product(*self.filters):
+            query = "&".join(param for param in params if param)
+            try:
+                TaskFilter(QueryDict(query), today=self.today)
+            except ValidationError:
+                continue
+            accepted += 1
+            with self.subTest(query=query):
+                self.assertIndexed(query)
+                if not params[0]:
+                    self.assertIndexed(query, model=TaskArchive)
+        self.assertGreater(accepted, 100)
+
+    def test_ranges_need_the_ordering(self):
+        """
+        Test that a range filter on another field than the ordering is
+        rejected, rather than sorted.
+        """
+        for query in (
+            "due_before=2023-07-08&ordering=-created_at",
+            "created_after=2023-07-01&ordering=due_date",
+            "status=new&created_after=2023-07-01&ordering=-due_date",
+            "overdue=1&ordering=-priority",
+            "due_after=2023-07-01&created_after=2023-07-01",
+        ):
+            with self.assertRaises(ValidationError, msg=query):
+                TaskFilter(QueryDict(query), today=self.today)
+        # With the priority fixed, -priority orders by due date.
+        TaskFilter(QueryDict("overdue=1&priority=high&ordering=-priority"))
+
+    def test_split_statuses(self):
+        """
+        Test that several statuses are read with one index range each.
+        """
+        self.assertEqual(len(list(self.get_querysets("status__in=new,completed"))), 2)
+        self.assertEqual(len(list(self.get_querysets("overdue=1"))), 2)
@@ -0,0 +1,165 @@
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+from ..renderers import ColumnarRenderer
+from ..serializers import TaskSerializer
+
+COLUMNAR = "application/vnd.tms.columnar+json"
+
+
+def decode_table(table):
+    """
+    Turn a columnar table back into the list of dicts it encodes.
+    """
+    dictionaries = table["dictionaries"]
+    items = []
+    for row in table["rows"]:
+        item = dict(zip(table["columns"], row))
+        for name, values in dictionaries.items():
+            if isinstance(item[name], int):
+                item[name] = values[item[name]]
+        items.append(item)
+    return items
+
+
+class ColumnarRendererTest(TestCase):
+    """
+    Test cases for the ColumnarRenderer.
+    """
+
+    def setUp(self):
+        self.rows = [
+            {"id": 1, "title": "Task 1", "status": "new", "priority": "high"},
+            {"id": 2, "title": "Task 2", "status": "pending", "priority": "low"},
+        ]
+
+    def test_render_list(self):
+        """
+        Test that lists become a table with dictionary encoded choices.
+        """
+        table = json.loads(ColumnarRenderer().render(self.rows))
+
+        self.assertEqual(table["columns"], ["id", "title", "status", "priority"])
+        self.assertEqual(table["dictionaries"]["status"][0], "new")
+        self.assertEqual(
+            table["rows"], [[1, "Task 1", 0, 2], [2, "Task 2", "pending", 0]]
+        )
+        self.assertEqual(decode_table(table), self.rows)
+
+    def test_render_paginated_and_other_data(self):
+        """
+        Test that only the results of a page are tabulated.
+        """
+        page = {"next": "http://testserver/?cursor=x", "results": self.rows}
+        data = json.loads(ColumnarRenderer().render(page))
+
+        self.assertEqual(data["next"], page["next"])
+        self.assertEqual(decode_table(data["results"]), self.rows)
+        self.assertEqual(
+            json.loads(ColumnarRenderer().render({"detail": "Not found."})),
+            {"detail": "Not found."},
+        )
+
+    def test_render_stream(self):
+        """
+        Test that streaming yields the same table as rendering at once.
+        """
+        renderer = ColumnarRenderer()
+
+        self.assertEqual(
+            b"".join(renderer.render_stream(iter(self.rows))),
+            renderer.render(self.rows),
+        )
+        self.assertEqual(
+            json.loads(b"".join(renderer.render_stream([]))),
+            {"columns": [], "dictionaries": {}, "rows": []},
+        )
+
+
+class TaskColumnarAPITest(APITestCase):
+    """
+    Test cases for the columnar format of the task list and export.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        for i in range(3):
+            Task.objects.create(
+                title=f"Task {i}",
+                status="new" if i % 2 else "completed",
+                priority="high",
+                description="task description",
+                due_date="2023-07-01",
+            )
+        self.list_url = reverse("tasks:task_list_create_api_view")
+        self.export_url = reverse("tasks:task_export_api_view")
+
+    def test_list_columnar(self):
+        """
+        Test that the list negotiates the columnar format by query or Accept.
+        """
+        expected = json.loads(
+            json.dumps(TaskSerializer(Task.objects.all(), many=True).data)
+        )
+        for kwargs in ({"data": {"format": "columnar"}}, {"HTTP_ACCEPT": COLUMNAR}):
+            response = self.client.get(self.list_url, **kwargs)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], COLUMNAR)
+            data = json.loads(response.content)
+            self.assertEqual(
+                data["results"]["columns"], list(TaskSerializer.Meta.fields)
+            )
+            self.assertEqual(decode_table(data["results"]), expected)
+
+    def test_list_columnar_from_cache(self):
+        """
+        Test that a cached page is rendered in the negotiated format, with
+        an ETag of its own.
+        """
+        response = self.client.get(self.list_url)
+        self.assertEqual(response["Vary"], "Accept")
+
+        columnar = self.client.get(self.list_url, HTTP_ACCEPT=COLUMNAR)
+        self.assertEqual(columnar["X-Cache"], "HIT")
+        self.assertIn("rows", json.loads(columnar.content)["results"])
+        self.assertNotEqual(columnar["ETag"], response["ETag"])
+
+        not_modified = self.client.get(
+            self.list_url, HTTP_ACCEPT=COLUMNAR, HTTP_IF_NONE_MATCH=columnar["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        other = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=columnar["ETag"])
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+    def test_export_columnar(self):
+        """
+        Test exporting all tasks as a streamed columnar table.
+        """
+        response = self.client.get(self.export_url, {"format": "columnar"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        table = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            [task["title"] for task in decode_table(table)],
+            ["Task 0", "Task 1", "Task 2"],
+        )
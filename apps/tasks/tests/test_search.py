@@ -0,0 +1,186 @@
+import logging
+import unittest
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+from ..search import get_search_backend, get_terms
+
+
+def create_task(title, description="task description", **kwargs):
+    data = {
+        "status": "new",
+        "priority": "medium",
+        "due_date": "2023-07-01",
+    }
+    data.update(kwargs)
+    return Task.objects.create(title=title, description=description, **data)
+
+
+class TaskSearchTest(APITestCase):
+    """
+    Test cases for the full-text search of tasks.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_list_create_api_view")
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def titles(self, response):
+        return [task["title"] for task in response.data["results"]]
+
+    def test_get_terms(self):
+        """
+        Test that queries are reduced to word terms.
+        """
+        self.assertEqual(
+            get_terms('fix "login" -bug* OR'), ["fix", "login", "bug", "OR"]
+        )
+        self.assertEqual(get_terms("!!!"), [])
+
+    def test_search_ranks_matches(self):
+        """
+        Test that only matching tasks are returned, best match first.
+        """
+        create_task("Quarterly report", "numbers for the board")
+        create_task("Call the bank", "ask about the quarterly report fees")
+        create_task("Buy milk")
+
+        response = self.search("report")
+
+        self.assertEqual(self.titles(response), ["Quarterly report", "Call the bank"])
+
+    def test_search_terms_and_prefixes(self):
+        """
+        Test that every term must match, as a word prefix.
+        """
+        create_task("Deploy the backend", "release notes")
+        create_task("Deploy the frontend")
+
+        self.assertEqual(
+            self.titles(self.search("deploy back")), ["Deploy the backend"]
+        )
+        self.assertEqual(len(self.search("deploy").data["results"]), 2)
+        self.assertEqual(self.titles(self.search("RELEASE")), ["Deploy the backend"])
+        self.assertEqual(self.titles(self.search('"; DROP TABLE')), [])
+
+    def test_search_with_filters_and_pagination(self):
+        """
+        Test that search combines with filters and walks every match once.
+        """
+        for i in range(5):
+            create_task(f"Report {i}", "report " * i, priority="high")
+        create_task("Report low", priority="low")
+
+        titles, response = [], self.search("report", priority="high", page_size=2)
+        while True:
+            titles.extend(self.titles(response))
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(sorted(titles), [f"Report {i}" for i in range(5)])
+        # Pages follow the relevance order of the unpaginated search.
+        cache.clear()
+        self.assertEqual(titles, self.titles(self.search("report", priority="high")))
+
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual(len(previous.data["results"]), 2)
+
+    def test_index_follows_writes(self):
+        """
+        Test that updates and deletes through every write path are searchable.
+        """
+        task = create_task("Old title")
+        task.title = "New title"
+        task.save()
+        self.assertEqual(self.titles(self.search("new")), ["New title"])
+        self.assertEqual(self.titles(self.search("old")), [])
+
+        Task.objects.filter(pk=task.pk).update(description="renamed in bulk")
+        Task.objects.bulk_create(
+            [
+                Task(
+                    title="Bulk",
+                    description="created",
+                    status="new",
+                    priority="low",
+                    due_date="2023-07-01",
+                )
+            ]
+        )
+        cache.clear()
+        self.assertEqual(self.titles(self.search("renamed")), ["New title"])
+        self.assertEqual(self.titles(self.search("created")), ["Bulk"])
+
+        Task.objects.all().delete()
+        cache.clear()
+        self.assertEqual(self.titles(self.search("title")), [])
+
+    def test_admin_search(self):
+        """
+        Test that the admin search box uses the text index.
+        """
+        create_task("Quarterly report")
+        create_task("Buy milk")
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse("admin:tasks_task_changelist"), {"q": "quart"}
+        )
+
+        self.assertContains(response, "Quarterly report")
+        self.assertNotContains(response, "Buy milk")
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite FTS5 index")
+class SQLiteSearchBackendTest(APITestCase):
+    """
+    Test cases for the FTS5 search backend.
+    """
+
+    def test_triggers_installed(self):
+        """
+        Test that the triggers keeping the index in sync exist.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'tasks_task'"
+            )
+            triggers = {name for name, in cursor.fetchall()}
+
+        self.assertEqual(
+            triggers,
+            {"tasks_task_fts_insert", "tasks_task_fts_delete", "tasks_task_fts_update"},
+        )
+
+    def test_search_uses_index(self):
+        """
+        Test that matches are looked up in the FTS index, not by a scan.
+        """
+        backend = get_search_backend()
+        plan = backend.search(Task.objects.all(), "report").explain()
+
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertNotIn("SCAN tasks_task\n", plan + "\n")
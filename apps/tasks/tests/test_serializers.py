@@ -1,6 +1,11 @@
+import datetime
+
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
-from ..serializers import TaskSerializer
+from ..choices import PriorityChoices, StatusChoices
+from ..models import Task
+from ..serializers import FastTaskSerializer, TaskSerializer
 
 
 class TaskSerializerTest(TestCase):
@@ -80,5 +85,84 @@ class TaskSerializerTest(TestCase):
         task = serializer.save()
 
         self.assertEqual(task.title, "New Task")
-        self.assertEqual(task.status, "new")
-        self.assertEqual(task.priority, "high")
+        self.assertEqual(task.status, StatusChoices.NEW)
+        self.assertEqual(task.priority, PriorityChoices.HIGH)
+
+    def test_task_serializer_labels(self):
+        """
+        Test that tasks stored as numbers are read and written as labels.
+        """
+        task = Task.objects.create(
+            title="New Task",
+            status="in progress",
+            priority="low",
+            description="task description",
+            due_date="2023-07-01",
+        )
+
+        self.assertEqual(Task.objects.values_list("status", "priority").get(), (2, 1))
+        self.assertEqual(Task.objects.filter(status="in progress").get(), task)
+        data = TaskSerializer(task).data
+        self.assertEqual((data["status"], data["priority"]), ("in progress", "low"))
+
+        for value in (2, "2", "IN_PROGRESS"):
+            serializer = TaskSerializer(task, data={"status": value}, partial=True)
+            self.assertFalse(serializer.is_valid(), value)
+
+
+class FastTaskSerializerTest(TestCase):
+    """
+    Test cases for the FastTaskSerializer.
+    """
+
+    def setUp(self):
+        self.serializer = FastTaskSerializer()
+        rows = [
+            ("New Task", "new", "high", "task description", "2023-07-01"),
+            ("Задача ✓", "in progress", "low", "", "1999-12-31"),
+            ('Quote " and \\ backslash', "completed", "medium", "a\nb", "2024-02-29"),
+            # Numbers outside the choices have no label and must pass through.
+            ("Legacy", 9, 7, "task description", "2023-07-01"),
+        ]
+        for title, status, priority, description, due_date in rows:
+            Task.objects.create(
+                title=title,
+                status=status,
+                priority=priority,
+                description=description,
+                due_date=due_date,
+            )
+
+    def assertRendersIdentically(self, queryset):
+        expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+        rows = self.serializer.get_queryset(queryset)
+        actual = JSONRenderer().render(self.serializer.to_representation(rows))
+        self.assertEqual(actual, expected)
+
+    def test_fast_serializer_matches_task_serializer(self):
+        """
+        Test that the fast path renders byte-identical output.
+        """
+        self.assertRendersIdentically(Task.objects.all())
+        self.assertRendersIdentically(Task.objects.filter(status="completed"))
+        self.assertRendersIdentically(Task.objects.none())
+
+    def test_fast_serializer_field_order(self):
+        """
+        Test that items have the TaskSerializer fields in the same order.
+        """
+        data = self.serializer.to_representation(
+            self.serializer.get_queryset(Task.objects.all())
+        )
+        self.assertEqual(list(data[0]), list(TaskSerializer.Meta.fields))
+        self.assertEqual(data[0]["created_at"], datetime.date.today().isoformat())
+
+    def test_fast_serializer_extra_columns(self):
+        """
+        Test that extra columns are fetched but not serialized.
+        """
+        rows = list(self.serializer.get_queryset(Task.objects.all(), "updated_at"))
+
+        self.assertTrue(all(row.updated_at for row in rows))
+        data = self.serializer.to_representation(rows)
+        self.assertNotIn("updated_at", data[0])
@@ -0,0 +1,240 @@
+import datetime
+import logging
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F, Value
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..choices import PriorityChoices, StatusChoices
+from ..models import Task, TaskCounter, TaskDueDateCounter
+from ..stats import get_task_stats, rebuild_task_stats
+from .utils import task_data
+
+
+class TaskStatsTest(APITestCase):
+    """
+    Test cases for the task counters and the TaskStatsAPIView.
+    """
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        self.url = reverse("tasks:task_stats_api_view")
+        self.today = timezone.localdate()
+
+    def days(self, n):
+        return (self.today + datetime.timedelta(days=n)).isoformat()
+
+    def assertCountersMatch(self):
+        self.assertEqual(rebuild_task_stats(dry_run=True), 0)
+
+    def test_stats_endpoint(self):
+        """
+        Test the counts returned by the statistics endpoint.
+        """
+        Task.objects.create(**task_data(priority="high", due_date=self.days(-1)))
+        Task.objects.create(**task_data(status="completed", due_date=self.days(-1)))
+        Task.objects.create(**task_data(status="in progress", due_date=self.days(0)))
+        Task.objects.create(**task_data(due_date=self.days(7)))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(
+            response.data["status"], {"new": 2, "in progress": 1, "completed": 1}
+        )
+        self.assertEqual(response.data["priority"], {"low": 0, "medium": 3, "high": 1})
+        self.assertEqual(response.data["status_priority"]["new"]["high"], 1)
+        self.assertEqual(response.data["status_priority"]["completed"]["medium"], 1)
+        self.assertEqual(response.data["overdue"], 1)
+        self.assertEqual(response.data["due_this_week"], 1)
+
+    def test_stats_endpoint_reads_only_counters(self):
+        """
+        Test that the statistics do not query the tasks table.
+        """
+        Task.objects.create(**task_data())
+
+        with self.assertNumQueries(2):
+            stats = get_task_stats()
+        self.assertEqual(stats["total"], 1)
+
+    def test_stats_requires_authentication(self):
+        """
+        Test that the statistics are not available to anonymous users.
+        """
+        self.client.credentials()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_single_task_writes(self):
+        """
+        Test that save() and delete() keep the counters exact.
+        """
+        task = Task.objects.create(**task_data())
+        self.assertCountersMatch()
+
+        task.status = "completed"
+        task.due_date = self.days(3)
+        task.save()
+        self.assertCountersMatch()
+
+        # A stale instance still moves the counts of the stored row.
+        stale = Task.objects.get(pk=task.pk)
+        Task.objects.filter(pk=task.pk).update(priority="low")
+        stale.title = "Renamed"
+        stale.save()
+        self.assertCountersMatch()
+
+        task.delete()
+        self.assertCountersMatch()
+        self.assertEqual(get_task_stats()["total"], 0)
+
+    def test_single_task_writes_lock_without_group_by(self):
+        """
+        Test that save() and delete() read the stored row of the task without
+        a GROUP BY, which PostgreSQL does not allow with FOR UPDATE.
+        """
+        task = Task.objects.create(**task_data())
+
+        with CaptureQueriesContext(connection) as queries:
+            task.status = "completed"
+            task.save()
+            task.delete()
+
+        self.assertFalse(any("GROUP BY" in query["sql"] for query in queries))
+        self.assertCountersMatch()
+
+    def test_api_writes(self):
+        """
+        Test that the create, update, delete and bulk endpoints keep the
+        counters exact.
+        """
+        list_url = reverse("tasks:task_list_create_api_view")
+        response = self.client.post(list_url, task_data(), format="json")
+        detail_url = reverse("tasks:task_detail_api_view", args=[response.data["id"]])
+        self.client.put(detail_url, task_data(status="completed"), format="json")
+        self.assertCountersMatch()
+
+        self.client.post(
+            reverse("tasks:task_bulk_create_api_view"),
+            [task_data(f"Task {i}", priority="low") for i in range(4)],
+            format="json",
+        )
+        self.client.patch(
+            reverse("tasks:task_bulk_update_api_view"),
+            {"filter": {"priority": "low"}, "set": {"status": "in progress"}},
+            format="json",
+        )
+        self.assertCountersMatch()
+
+        tasks = Task.objects.filter(priority="low").order_by("pk")
+        self.client.patch(
+            reverse("tasks:task_bulk_update_api_view"),
+            [
+                {"id": tasks[0].pk, "status": "completed"},
+                {"id": tasks[1].pk, "due_date": self.days(1)},
+            ],
+            format="json",
+        )
+        self.assertCountersMatch()
+
+        self.client.post(
+            reverse("tasks:task_bulk_delete_api_view"),
+            {"status": "in progress"},
+            format="json",
+        )
+        self.client.delete(detail_url)
+        self.assertCountersMatch()
+        self.assertEqual(get_task_stats()["total"], 1)
+
+    def test_queryset_writes(self):
+        """
+        Test that queryset bulk writes, including expression updates, keep
+        the counters exact.
+        """
+        Task.objects.bulk_create([Task(**task_data(f"Task {i}")) for i in range(6)])
+        self.assertCountersMatch()
+
+        Task.objects.filter(title="Task 0").update(status="completed")
+        Task.objects.filter(title="Task 1").update(priority=Value(PriorityChoices.HIGH))
+        Task.objects.filter(title="Task 2").update(due_date=F("created_at"))
+        Task.objects.bulk_update(
+            [Task(pk=task.pk, status="in progress") for task in Task.objects.all()[:3]],
+            ["status"],
+        )
+        self.assertCountersMatch()
+
+        list(Task.objects.filter(status="new").delete_in_batches(2))
+        Task.objects.filter(title="Task 0").delete()
+        self.assertCountersMatch()
+
+    def test_admin_writes(self):
+        """
+        Test that adding, changing and deleting tasks in the admin keeps the
+        counters exact.
+        """
+        self.client.force_login(self.user)
+        # The admin forms post the stored numbers of the choices.
+        data = task_data(
+            due_date=self.days(0),
+            status=StatusChoices.NEW,
+            priority=PriorityChoices.MEDIUM,
+        )
+        self.client.post(reverse("admin:tasks_task_add"), data)
+        task = Task.objects.get()
+        self.client.post(
+            reverse("admin:tasks_task_change", args=[task.pk]),
+            {**data, "status": StatusChoices.COMPLETED},
+        )
+        self.assertCountersMatch()
+        self.assertEqual(get_task_stats()["status"]["completed"], 1)
+
+        Task.objects.create(**task_data())
+        self.client.post(
+            reverse("admin:tasks_task_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": Task.objects.values_list("pk", flat=True),
+                "post": "yes",
+            },
+        )
+        self.assertFalse(Task.objects.exists())
+        self.assertCountersMatch()
+
+    def test_rebuild_task_stats_command(self):
+        """
+        Test that the command reports and fixes counters that drifted.
+        """
+        Task.objects.create(**task_data(due_date=self.days(-1)))
+        TaskCounter.objects.update(count=5)
+        TaskDueDateCounter.objects.create(due_date=self.days(1), count=2)
+        out = StringIO()
+
+        call_command("rebuild_task_stats", "--dry-run", stdout=out)
+        self.assertIn("2 counters are out of date.", out.getvalue())
+        self.assertEqual(get_task_stats()["total"], 5)
+
+        call_command("rebuild_task_stats", stdout=out)
+        self.assertIn("Corrected 2 counters.", out.getvalue())
+        self.assertCountersMatch()
+        stats = get_task_stats()
+        self.assertEqual((stats["total"], stats["overdue"]), (1, 1))
@@ -0,0 +1,93 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..models import Task
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@override_settings(TASKS_TIMING_SAMPLE_RATE=1, TASKS_SLOW_REQUEST_MS=10**6)
+class ServerTimingMiddlewareTest(APITestCase):
+    """
+    Test cases for the ServerTimingMiddleware.
+    """
+
+    url = reverse("tasks:task_list_create_api_view")
+
+    def setUp(self):
+        logger = logging.getLogger("django.request")
+        logger.setLevel(logging.ERROR)
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer " + str(AccessToken.for_user(self.user))
+        )
+        Task.objects.create(
+            title="Task 1",
+            status="new",
+            priority="high",
+            description="task description",
+            due_date="2023-07-01",
+        )
+
+    def test_server_timing_header(self):
+        """
+        Test that sampled requests report the time of every phase.
+        """
+        with self.assertLogs("apps.tasks.timing", "INFO") as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(list(metrics), ["auth", "db", "serialize", "render", "total"])
+        # The user lookup and the page.
+        self.assertEqual(metrics["db"]["desc"], '"2 queries"')
+        for name in ("auth", "serialize", "render"):
+            self.assertGreater(float(metrics[name]["dur"]), 0)
+
+        [record] = logs.records
+        self.assertEqual(record.levelname, "INFO")
+        self.assertEqual(record.getMessage(), f"request GET {self.url}")
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, 2)
+        self.assertFalse(hasattr(record, "slowest_queries"))
+
+    @override_settings(TASKS_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        """
+        Test that requests are not instrumented with a zero sample rate.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(TASKS_SLOW_REQUEST_MS=0)
+    def test_slow_request_logs_queries(self):
+        """
+        Test that slow requests are logged with their slowest queries.
+        """
+        with self.assertLogs("apps.tasks.timing", "WARNING") as logs:
+            self.client.get(self.url)
+
+        [record] = logs.records
+        self.assertEqual(len(record.slowest_queries), 2)
+        self.assertTrue(
+            any('"tasks_task"' in query["sql"] for query in record.slowest_queries)
+        )
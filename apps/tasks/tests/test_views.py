@@ -6,6 +6,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import AccessToken
 
+from ..choices import PriorityChoices, StatusChoices
 from ..models import Task
 
 
@@ -25,7 +26,7 @@ class TaskListCreateAPIViewTest(APITestCase):
 
         self.task1 = Task.objects.create(
             title="Task 1",
-            status="pending",
+            status="new",
             priority="high",
             description="task description",
             due_date="2023-07-01",
@@ -50,7 +51,7 @@ class TaskListCreateAPIViewTest(APITestCase):
         response = self.client.get(url, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_get_tasks_with_status_filter(self):
         """
@@ -58,11 +59,11 @@ class TaskListCreateAPIViewTest(APITestCase):
         """
         self.authenticate()
         url = reverse("tasks:task_list_create_api_view")
-        response = self.client.get(url + "?status=pending", format="json")
+        response = self.client.get(url + "?status=new", format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], self.task1.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], self.task1.title)
 
     def test_get_tasks_with_priority_filter(self):
         """
@@ -73,8 +74,8 @@ class TaskListCreateAPIViewTest(APITestCase):
         response = self.client.get(url + "?priority=low", format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], self.task2.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], self.task2.title)
 
     def test_create_task_with_valid_data(self):
         """
@@ -93,7 +94,9 @@ class TaskListCreateAPIViewTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Task.objects.count(), 3)
-        self.assertEqual(Task.objects.get(title="New Task").priority, "medium")
+        self.assertEqual(
+            Task.objects.get(title="New Task").priority, PriorityChoices.MEDIUM
+        )
 
     def test_create_task_with_invalid_data(self):
         """
@@ -161,7 +164,7 @@ class TaskDetailAPIViewTest(APITestCase):
 
         self.task = Task.objects.create(
             title="Existing Task",
-            status="pending",
+            status="new",
             priority="high",
             description="task description",
             due_date="2023-07-01",
@@ -198,7 +201,9 @@ class TaskDetailAPIViewTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(Task.objects.get(pk=self.task.pk).title, "Updated Task")
-        self.assertEqual(Task.objects.get(pk=self.task.pk).status, "completed")
+        self.assertEqual(
+            Task.objects.get(pk=self.task.pk).status, StatusChoices.COMPLETED
+        )
 
     def test_update_task_with_invalid_data(self):
         """
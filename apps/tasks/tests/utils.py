@@ -0,0 +1,14 @@
+def task_data(title="Task", **overrides):
+    """
+    Valid task fields, as sent to the API or passed to ``Task.objects``,
+    with ``overrides`` applied.
+    """
+    data = {
+        "title": title,
+        "status": "new",
+        "priority": "medium",
+        "description": "task description",
+        "due_date": "2023-07-01",
+    }
+    data.update(overrides)
+    return data
@@ -0,0 +1,231 @@
+import asyncio
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Timings of the current request, None when it is not instrumented. Being a
+# context variable, it follows the request into executor threads that run
+# with a copy of its context.
+current_timings = ContextVar("current_timings", default=None)
+# Query counter of the current request, None when its queries are not
+# counted. Counting is cheap enough for every request, unlike timing.
+current_queries = ContextVar("current_queries", default=None)
+
+# Slowest queries listed in the log line of a slow request.
+SLOW_REQUEST_QUERIES = 10
+
+
+class RequestTimings:
+    """
+    Time spent by one request in each instrumented phase, and its queries.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations = {"auth": 0.0, "db": 0.0, "serialize": 0.0, "render": 0.0}
+        self.queries = []
+
+    def add(self, name, duration):
+        self.durations[name] += duration
+
+    def add_query(self, sql, duration):
+        self.durations["db"] += duration
+        self.queries.append((sql, duration))
+
+    def get_header(self, total):
+        metrics = [
+            f"{name};dur={duration * 1000:.3f}"
+            + (f';desc="{len(self.queries)} queries"' if name == "db" else "")
+            for name, duration in self.durations.items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(metrics)
+
+    def get_log_fields(self, request, response, total):
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 3),
+            "queries": len(self.queries),
+        }
+        for name, duration in self.durations.items():
+            fields[f"{name}_ms"] = round(duration * 1000, 3)
+        return fields
+
+
+@contextmanager
+def request_timings():
+    """
+    Instrument the request running in the block, unless an outer middleware
+    already does, and yield its timings.
+    """
+    timings = current_timings.get()
+    if timings is not None:
+        yield timings
+        return
+    timings = RequestTimings()
+    token = current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        current_timings.reset(token)
+
+
+class QueryCount:
+    """
+    Number of queries made by one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+@contextmanager
+def query_count():
+    """
+    Count the queries of the request running in the block, and yield the
+    count.
+    """
+    counter = QueryCount()
+    token = current_queries.set(counter)
+    try:
+        yield counter
+    finally:
+        current_queries.reset(token)
+
+
+@contextmanager
+def timer(name):
+    """
+    Add the time spent in the block to the ``name`` phase of the current
+    request, if it is instrumented.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """
+    Decorator adding the time spent in the function to the ``name`` phase.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper counting the queries of the requests counted,
+    and timing those of instrumented requests.
+    """
+    counter = current_queries.get()
+    if counter is not None:
+        counter.count += 1
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - start)
+
+
+def install_query_timer(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class ServerTimingMiddleware:
+    """
+    Instrument a sample of the requests: their time in authentication, SQL,
+    serialization and rendering is sent in a ``Server-Timing`` header and
+    logged with the timings as extra fields.
+
+    TASKS_TIMING_SAMPLE_RATE is the share of requests instrumented (0 turns
+    it off). Instrumented requests slower than TASKS_SLOW_REQUEST_MS are
+    logged as a warning with their slowest queries.
+
+    The middleware is natively async as well, so Django serves the requests
+    going through it under ASGI without a thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Mark the instance as a coroutine function for Django.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        with request_timings() as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        with request_timings() as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings)
+
+    def process_template_response(self, request, response):
+        timings = current_timings.get()
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: timings.add("render", time.perf_counter() - start)
+            )
+        return response
+
+    def is_sampled(self):
+        rate = settings.TASKS_TIMING_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def finish(self, request, response, timings):
+        total = time.perf_counter() - timings.start
+        response["Server-Timing"] = timings.get_header(total)
+
+        fields = timings.get_log_fields(request, response, total)
+        if total * 1000 >= settings.TASKS_SLOW_REQUEST_MS:
+            slowest = sorted(timings.queries, key=lambda query: -query[1])
+            fields["slowest_queries"] = [
+                {"sql": sql, "ms": round(duration * 1000, 3)}
+                for sql, duration in slowest[:SLOW_REQUEST_QUERIES]
+            ]
+            logger.warning(
+                "slow request %s %s", request.method, request.path, extra=fields
+            )
+        else:
+            logger.info("request %s %s", request.method, request.path, extra=fields)
+        return response
@@ -6,5 +6,22 @@ app_name = "tasks"
 
 urlpatterns = [
     path("", views.TaskListCreateAPIView.as_view(), name="task_list_create_api_view"),
+    path(
+        "bulk/", views.TaskBulkCreateAPIView.as_view(), name="task_bulk_create_api_view"
+    ),
+    path(
+        "bulk/update/",
+        views.TaskBulkUpdateAPIView.as_view(),
+        name="task_bulk_update_api_view",
+    ),
+    path(
+        "bulk/delete/",
+        views.TaskBulkDeleteAPIView.as_view(),
+        name="task_bulk_delete_api_view",
+    ),
+    path("export/", views.TaskExportAPIView.as_view(), name="task_export_api_view"),
+    path("changes/", views.TaskChangesAPIView.as_view(), name="task_changes_api_view"),
+    path("events/", views.TaskEventsAPIView.as_view(), name="task_events_api_view"),
+    path("stats/", views.TaskStatsAPIView.as_view(), name="task_stats_api_view"),
     path("<int:pk>/", views.TaskDetailAPIView.as_view(), name="task_detail_api_view"),
 ]
@@ -1,19 +1,140 @@
 import logging
 
-from django.http import Http404
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView, Response
 
-from .models import Task
-from .serializers import TaskSerializer
+from .cache import task_cache
+from .changes import lock_task_writes
+from .conditional import (
+    evaluate_preconditions,
+    get_page_etag,
+    get_task_etag,
+    get_task_last_modified,
+    get_validator_headers,
+    get_variant_etag,
+    has_preconditions,
+)
+from .events import TaskEventStreamResponse, TaskEventSubscription
+from .filters import ORDERINGS, TaskFilter, filter_tasks
+from .models import Task, TaskArchive, TaskTombstone
+from .pagination import (
+    TaskChangesPagination,
+    TaskCursorPagination,
+    TaskSearchPagination,
+)
+from .renderers import (
+    ColumnarRenderer,
+    EventStreamRenderer,
+    NDJSONRenderer,
+    StreamingJSONRenderer,
+)
+from .serializers import (
+    FastTaskSerializer,
+    TaskBulkFilterSerializer,
+    TaskBulkSetUpdateSerializer,
+    TaskSerializer,
+    get_sparse_fields,
+)
+from .stats import get_task_stats
 
 # intializing logger instance
 logger = logging.getLogger(__name__)
 
+CACHE_HIT = {"X-Cache": "HIT"}
+CACHE_MISS = {"X-Cache": "MISS"}
+
+# Columns the list pagination and page ETags need, selected even when the
+# requested fields leave them out.
+ROW_COLUMNS = ("id", "created_at", "updated_at")
+
+FILTER_PARAMETERS = [
+    openapi.Parameter(
+        "status",
+        openapi.IN_QUERY,
+        description="Status Filter",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "status__in",
+        openapi.IN_QUERY,
+        description="Comma-separated statuses",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "priority",
+        openapi.IN_QUERY,
+        description="Priority Filter",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "due_after",
+        openapi.IN_QUERY,
+        description="Due on or after (YYYY-MM-DD)",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATE,
+    ),
+    openapi.Parameter(
+        "due_before",
+        openapi.IN_QUERY,
+        description="Due on or before (YYYY-MM-DD)",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATE,
+    ),
+    openapi.Parameter(
+        "created_after",
+        openapi.IN_QUERY,
+        description="Created on or after (YYYY-MM-DD)",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATE,
+    ),
+    openapi.Parameter(
+        "overdue",
+        openapi.IN_QUERY,
+        description="Only open tasks due before today",
+        type=openapi.TYPE_BOOLEAN,
+    ),
+    openapi.Parameter(
+        "q",
+        openapi.IN_QUERY,
+        description="Full-text search in title and description",
+        type=openapi.TYPE_STRING,
+    ),
+]
+
+FIELDS_PARAMETERS = [
+    openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description="Comma-separated fields to return (default: all)",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "exclude",
+        openapi.IN_QUERY,
+        description="Comma-separated fields to leave out",
+        type=openapi.TYPE_STRING,
+    ),
+]
+
+
+def get_fields_etag(etag, fields):
+    """
+    ETag of the representation of ``etag`` restricted to ``fields``.
+    """
+    if fields is None:
+        return etag
+    return get_variant_etag(etag, ".".join(fields))
+
 
 class TaskListCreateAPIView(APIView):
     """
@@ -21,54 +142,163 @@ class TaskListCreateAPIView(APIView):
     """
 
     permission_classes = (IsAuthenticated,)
+    pagination_class = TaskCursorPagination
+    search_pagination_class = TaskSearchPagination
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarRenderer)
+    list_serializer = FastTaskSerializer()
 
     @swagger_auto_schema(
         manual_parameters=[
+            *FILTER_PARAMETERS,
             openapi.Parameter(
-                "status",
+                "ordering",
                 openapi.IN_QUERY,
-                description="Status Filter",
+                description="Sort order (not with q)",
                 type=openapi.TYPE_STRING,
+                enum=list(ORDERINGS),
             ),
             openapi.Parameter(
-                "priority",
+                "include_archived",
                 openapi.IN_QUERY,
-                description="Priority Filter",
+                description="Also list archived tasks (1 or true)",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Opaque pagination cursor taken from next/previous",
                 type=openapi.TYPE_STRING,
             ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Number of tasks per page",
+                type=openapi.TYPE_INTEGER,
+            ),
+            *FIELDS_PARAMETERS,
         ],
     )
     def get(self, request, format=None):
         """
-        Retrieve a list of tasks based on optional filters.
+        Retrieve a page of tasks based on optional filters.
+
+        Tasks are ordered newest first (soonest due first with a due date
+        filter, best match first when searching) unless ``?ordering=`` picks
+        another indexed order, and paginated with an opaque keyset cursor;
+        follow the ``next``/``previous`` links to walk the list.
+        Archived tasks are only listed with ``?include_archived=1``, merged
+        into the same ordering; they cannot be searched.
+        ``?fields=`` / ``?exclude=`` restrict the returned fields; the other
+        columns are not even read from the database.
+        Pages are served from the response cache until the next task write.
+        The compact columnar format is available with ``?format=columnar``
+        or ``Accept: application/vnd.tms.columnar+json``.
 
         Parameters:
         - status: Filters tasks based on status.
+        - status__in: Comma-separated statuses.
         - priority: Filters tasks based on priority.
+        - due_after, due_before: Due date range, inclusive.
+        - created_after: Created on or after a date.
+        - overdue: Only open tasks due before today.
+        - q: Full-text search in title and description.
+        - ordering: -created_at, created_at, due_date, -due_date or
+          -priority (most urgent first, soonest due first within a
+          priority); by default -created_at, or due_date with a due date
+          filter. The due date and created_after ranges need an ordering
+          on their own field.
+        - include_archived: Also list archived tasks.
+        - cursor: Pagination cursor.
+        - page_size: Number of tasks per page, capped at TASKS_MAX_PAGE_SIZE.
+        - fields: Comma-separated fields to return.
+        - exclude: Comma-separated fields to leave out.
 
         Returns:
         - 200: Successful retrieval of tasks.
+        - 304: The page matches the If-None-Match ETag.
+        - 400: Invalid filters or fields, a range filter on another field
+          than the ordering, or ordering or include_archived combined with
+          q.
+        - 404: Invalid pagination cursor.
         - 500: Internal server error occurred.
         """
         try:
-            tasks = Task.objects.all()
-            task_status = request.query_params.get("status", None)
-            task_priority = request.query_params.get("priority", None)
+            fields = get_sparse_fields(request.query_params)
+            if fields is not None:
+                self.list_serializer = FastTaskSerializer(fields=fields)
+            cache_key = task_cache.make_key(request, "list")
+            cached = task_cache.get(cache_key)
+            cache_status = CACHE_HIT
+            if cached is None:
+                cache_status = CACHE_MISS
+                include_archived = self.include_archived(request)
+                task_filter = TaskFilter(request.query_params)
+                if task_filter.search:
+                    rows = self.list_serializer.get_queryset(
+                        task_filter.filter(Task.objects.all()), *ROW_COLUMNS, "rank"
+                    )
+                    paginator = self.search_pagination_class()
+                    page = paginator.paginate_queryset(rows, request, view=self)
+                else:
+                    querysets = task_filter.split(Task.objects.all())
+                    if include_archived:
+                        querysets += task_filter.split(TaskArchive.objects.all())
+                    paginator = self.pagination_class()
+                    paginator.ordering = task_filter.ordering
+                    columns = [*ROW_COLUMNS, *paginator.get_position_fields()]
+                    page = paginator.paginate_querysets(
+                        [
+                            self.list_serializer.get_queryset(queryset, *columns)
+                            for queryset in querysets
+                        ],
+                        request,
+                        view=self,
+                    )
+                etag = get_page_etag(page, paginator.has_next, paginator.has_previous)
+                cached = {"etag": get_fields_etag(etag, fields), "data": None}
 
-            if task_status:
-                tasks = tasks.filter(status=task_status)
+            # Deletes do not advance any timestamp, so lists only get an ETag.
+            etag = cached["etag"]
+            if isinstance(request.accepted_renderer, ColumnarRenderer):
+                etag = get_variant_etag(etag, ColumnarRenderer.format)
+            not_modified = evaluate_preconditions(request, etag)
+            if not_modified is not None:
+                not_modified["Vary"] = "Accept"
+                return not_modified
 
-            if task_priority:
-                tasks = tasks.filter(priority=task_priority)
-
-            serializer = TaskSerializer(tasks, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            if cached["data"] is None:
+                data = self.list_serializer.to_representation(page)
+                cached["data"] = paginator.get_paginated_data(data)
+                task_cache.set(cache_key, cached)
+            return Response(
+                cached["data"],
+                status=status.HTTP_200_OK,
+                headers={
+                    **cache_status,
+                    **get_validator_headers(etag),
+                    "Vary": "Accept",
+                },
+            )
+        except APIException:
+            raise
         except Exception as e:
             logger.error(
-                f"Something went wrong during GET method of {str(self.__class__.__name__)}: {str(e)}"
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
             )
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def include_archived(self, request):
+        value = request.query_params.get("include_archived", "")
+        if value.lower() not in ("1", "true"):
+            return False
+        if request.query_params.get("q"):
+            raise ValidationError(
+                {"include_archived": ["Archived tasks cannot be searched."]}
+            )
+        return True
+
     @swagger_auto_schema(request_body=TaskSerializer)
     def post(self, request, format=None):
         """
@@ -90,7 +320,510 @@ class TaskListCreateAPIView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(
-                f"Something went wrong during the POST method of {str(self.__class__.__name__)}: {str(e)}"
+                "Something went wrong during the POST method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaskBulkCreateAPIView(APIView):
+    """
+    API endpoint for creating many tasks in one request.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    modes = ("atomic", "partial")
+
+    @swagger_auto_schema(
+        request_body=TaskSerializer(many=True),
+        manual_parameters=[
+            openapi.Parameter(
+                "mode",
+                openapi.IN_QUERY,
+                description="atomic (default): create nothing if any item is "
+                "invalid; partial: create the valid items and report the rest",
+                type=openapi.TYPE_STRING,
+                enum=list(modes),
+            ),
+        ],
+    )
+    def post(self, request, format=None):
+        """
+        Create a list of tasks.
+
+        Every item is validated with the task serializer and the valid ones
+        are inserted with batched bulk inserts inside a single transaction.
+        The response reports the outcome of every item, in request order.
+        Created ids are null on database backends that cannot return the
+        keys of bulk inserted rows.
+
+        Parameters:
+        - request: The request object containing a JSON array of tasks.
+        - mode: ``atomic`` (default) or ``partial``.
+
+        Returns:
+        - 201: All tasks created successfully.
+        - 207: Partial mode, some of the tasks were invalid and skipped.
+        - 400: Bad request, invalid data provided; nothing was created.
+        - 500: Internal server error occurred.
+        """
+        mode = request.query_params.get("mode", "atomic")
+        if mode not in self.modes:
+            return Response(
+                {"mode": [f"Must be one of: {', '.join(self.modes)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            serializer = TaskSerializer(
+                data=request.data,
+                many=True,
+                context={"partial_success": mode == "partial"},
+            )
+            if not serializer.is_valid():
+                item_errors = getattr(serializer, "item_errors", None)
+                if item_errors is None:
+                    # The payload itself is unusable (not a list, too long...).
+                    return Response(
+                        serializer.errors, status=status.HTTP_400_BAD_REQUEST
+                    )
+                return Response(
+                    self.get_results(item_errors, []),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            with transaction.atomic():
+                tasks = serializer.save()
+
+            results = self.get_results(serializer.item_errors, tasks)
+            if results["failed"]:
+                return Response(results, status=status.HTTP_207_MULTI_STATUS)
+            return Response(results, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            logger.error(
+                "Something went wrong during the POST method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_results(self, item_errors, tasks):
+        """
+        Build the per-item report; items are either created, invalid or, when
+        nothing was written, skipped.
+        """
+        created = iter(tasks)
+        results = []
+        for index, errors in enumerate(item_errors):
+            if errors:
+                results.append({"index": index, "status": "invalid", "errors": errors})
+            elif tasks:
+                results.append(
+                    {"index": index, "status": "created", "id": next(created).pk}
+                )
+            else:
+                results.append({"index": index, "status": "skipped"})
+        return {
+            "created": len(tasks),
+            "failed": sum(1 for errors in item_errors if errors),
+            "results": results,
+        }
+
+
+class TaskBulkUpdateAPIView(APIView):
+    """
+    API endpoint for updating many tasks in one request.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(request_body=TaskBulkSetUpdateSerializer)
+    def patch(self, request, format=None):
+        """
+        Update many tasks at once.
+
+        Two payload shapes are accepted:
+        - ``{"filter": {...}, "set": {...}}``: every task matching the filter
+          (status, priority, due_after, due_before) gets the values in
+          ``set``, in a single UPDATE statement.
+        - ``[{"id": 1, ...}, ...]``: each listed task gets its own partial
+          payload; the rows are written with batched bulk updates.
+
+        Parameters:
+        - request: The request object containing the update payload.
+
+        Returns:
+        - 200: Tasks updated successfully, with the number of updated rows.
+        - 400: Bad request, invalid data provided; nothing was updated.
+        - 500: Internal server error occurred.
+        """
+        try:
+            if isinstance(request.data, list):
+                return self.update_by_ids(request.data)
+            return self.update_by_filter(request.data)
+        except Exception as e:
+            logger.error(
+                "Something went wrong during the PATCH method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def update_by_filter(self, data):
+        serializer = TaskBulkSetUpdateSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = TaskBulkFilterSerializer.filter_queryset(
+            Task.objects.all(), serializer.validated_data["filter"]
+        )
+        updated = tasks.update(**serializer.validated_data["set"])
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+    def update_by_ids(self, data):
+        ids = [item.get("id") if isinstance(item, dict) else None for item in data]
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return Response(
+                {"non_field_errors": ["Every item requires an integer id."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(set(ids)) != len(ids):
+            return Response(
+                {"non_field_errors": ["Duplicate ids are not allowed."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            lock_task_writes(Task.objects.db)
+            tasks = Task.objects.select_for_update().in_bulk(ids)
+            not_found = [pk for pk in ids if pk not in tasks]
+            if not_found:
+                return Response(
+                    {"not_found": not_found}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            serializer = TaskSerializer(
+                [tasks[pk] for pk in ids], data=data, many=True, partial=True
+            )
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer.save()
+
+        return Response({"updated": len(ids)}, status=status.HTTP_200_OK)
+
+
+class TaskBulkDeleteAPIView(APIView):
+    """
+    API endpoint for deleting every task matching a filter.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(request_body=TaskBulkFilterSerializer)
+    def post(self, request, format=None):
+        """
+        Delete the tasks matching a filter.
+
+        Matching tasks are deleted in primary key ranges of at most
+        TASKS_BULK_BATCH_SIZE rows, each range committed separately.
+
+        Parameters:
+        - request: The request object containing the filter (status,
+          priority, due_after, due_before).
+
+        Returns:
+        - 200: Tasks deleted successfully, with the number of deleted rows.
+        - 400: Bad request, invalid filter provided.
+        - 500: Internal server error occurred.
+        """
+        try:
+            serializer = TaskBulkFilterSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            tasks = TaskBulkFilterSerializer.filter_queryset(
+                Task.objects.all(), serializer.validated_data
+            )
+            deleted = 0
+            for deleted in tasks.delete_in_batches(settings.TASKS_BULK_BATCH_SIZE):
+                pass
+            return Response({"deleted": deleted}, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(
+                "Something went wrong during the POST method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaskExportAPIView(APIView):
+    """
+    API endpoint for streaming every task matching the list filters.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (NDJSONRenderer, StreamingJSONRenderer, ColumnarRenderer)
+    list_serializer = FastTaskSerializer()
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            *FILTER_PARAMETERS,
+            *FIELDS_PARAMETERS,
+        ],
+    )
+    def get(self, request, format=None):
+        """
+        Stream all tasks as NDJSON (default), a JSON array or a columnar table.
+
+        Rows are read with a chunked server-side iterator and written as they
+        are serialized, so memory use does not grow with the table size. The
+        output format is negotiated from the Accept header or ``?format=``
+        (``ndjson``, ``json`` or ``columnar``).
+
+        Parameters:
+        - status, status__in, priority, due_after, due_before,
+          created_after, overdue: Filters, as for the task list.
+        - q: Full-text search in title and description.
+        - fields: Comma-separated fields to return.
+        - exclude: Comma-separated fields to leave out.
+
+        Returns:
+        - 200: Streaming export of the tasks.
+        - 400: Invalid filters or fields.
+        - 500: Internal server error occurred.
+        """
+        try:
+            fields = get_sparse_fields(request.query_params)
+            if fields is not None:
+                self.list_serializer = FastTaskSerializer(fields=fields)
+            tasks = filter_tasks(Task.objects.order_by("pk"), request.query_params)
+            rows = self.serialize_rows(
+                self.list_serializer.get_queryset(tasks).iterator(
+                    chunk_size=settings.TASKS_EXPORT_CHUNK_SIZE
+                )
+            )
+            renderer = request.accepted_renderer
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            return StreamingHttpResponse(
+                renderer.render_stream(rows, self.get_renderer_context()),
+                content_type=content_type,
+            )
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def serialize_rows(self, tasks):
+        """
+        Lazily serialize ``tasks``, logging errors raised mid-stream.
+        """
+        try:
+            yield from self.list_serializer.iter_representation(tasks)
+        except Exception as e:
+            logger.error(
+                "Something went wrong while streaming %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            raise
+
+
+class TaskChangesAPIView(APIView):
+    """
+    API endpoint for syncing clients: the tasks changed and removed since a
+    cursor.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    list_serializer = FastTaskSerializer()
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                openapi.IN_QUERY,
+                description="Cursor returned by the previous call (none at first)",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Number of changes per page",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ]
+    )
+    def get(self, request, format=None):
+        """
+        Retrieve the changes since ``?since=`` in change sequence order.
+
+        Every write gives the tasks it changes a new change sequence number
+        and leaves a tombstone for the tasks it deletes or archives, so a
+        page is one index range of the task and tombstone tables and the
+        cost of a sync depends on the number of changes, not of tasks.
+        Without a cursor, all the tasks are listed. Keep calling with the
+        returned ``since`` until ``next`` is null; store it for the next
+        sync.
+
+        Parameters:
+        - since: Cursor returned by the previous call.
+        - page_size: Number of changes per page, capped at
+          TASKS_MAX_PAGE_SIZE.
+
+        Returns:
+        - 200: Page of changes: ``since`` (cursor to send next), ``next``
+          (link to the following page, or null), ``tasks`` (created or
+          updated tasks), ``deleted`` and ``archived`` (ids of the tasks
+          removed from the list).
+        - 404: Invalid cursor.
+        - 410: The cursor is older than the purged tombstones; sync again
+          without a cursor.
+        - 500: Internal server error occurred.
+        """
+        try:
+            paginator = TaskChangesPagination()
+            page = paginator.paginate_querysets(
+                [
+                    self.list_serializer.get_queryset(Task.objects.all(), "change_seq"),
+                    TaskTombstone.objects.values_list(
+                        "id", "change_seq", "archived", named=True
+                    ),
+                ],
+                request,
+                self,
+            )
+            # A page can hold a task and the tombstone of its id (see
+            # add_tombstones()): only the later change of the two is sent.
+            latest = {}
+            for row in page:
+                if row.id not in latest or latest[row.id].change_seq < row.change_seq:
+                    latest[row.id] = row
+            tasks = [
+                row
+                for row in page
+                if "archived" not in row._fields and latest[row.id] is row
+            ]
+            removed = [
+                row
+                for row in page
+                if "archived" in row._fields and latest[row.id] is row
+            ]
+            return paginator.get_paginated_response(
+                {
+                    "tasks": self.list_serializer.to_representation(tasks),
+                    "deleted": [row.id for row in removed if not row.archived],
+                    "archived": [row.id for row in removed if row.archived],
+                }
+            )
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaskEventsAPIView(APIView):
+    """
+    API endpoint streaming the task changes as Server-Sent Events.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (EventStreamRenderer, JSONRenderer)
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            *FILTER_PARAMETERS[:3],
+            openapi.Parameter(
+                "since",
+                openapi.IN_QUERY,
+                description="Change feed cursor to stream from",
+                type=openapi.TYPE_STRING,
+            ),
+        ]
+    )
+    def get(self, request, format=None):
+        """
+        Stream the task changes as they happen, as Server-Sent Events.
+
+        Events:
+        - task: A task was created or updated; data is the task.
+        - delete: data is ``{"id", "reason"}``, the reason being
+          ``deleted``, ``archived`` or ``filtered`` (the task no longer
+          matches the filters).
+        - resync: Events were missed; catch up with the change feed from
+          the ``since`` cursor of the data, or reload the tasks if it is
+          null.
+
+        Like the change feed, events carry the current state of a task, so
+        writes to it read together are sent as one event. Event ids are
+        change feed cursors, so reconnecting clients resume from their
+        ``Last-Event-ID``. The stream stays open under ASGI, with
+        a heartbeat comment every TASKS_EVENTS_HEARTBEAT seconds; under WSGI
+        it sends the events since the client's position and ends, and the
+        client reconnects.
+
+        Parameters:
+        - status, status__in, priority: Filters, as for the task list.
+        - since: Change feed cursor to stream from, for the first
+          connection; otherwise the stream starts from the current changes.
+
+        Returns:
+        - 200: The event stream.
+        - 500: Internal server error occurred.
+        """
+        try:
+            return TaskEventStreamResponse(TaskEventSubscription.from_request(request))
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
+            )
+            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaskStatsAPIView(APIView):
+    """
+    API endpoint for task statistics.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, format=None):
+        """
+        Retrieve task counts by status, priority and status × priority, plus
+        the number of overdue tasks and of tasks due this week.
+
+        The counts are read from counter tables that every task write keeps
+        up to date, so the cost does not depend on the number of tasks.
+        Overdue and due this week only count tasks that are not completed.
+
+        Returns:
+        - 200: Successful retrieval of the statistics.
+        - 500: Internal server error occurred.
+        """
+        try:
+            return Response(get_task_stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
             )
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -102,43 +835,100 @@ class TaskDetailAPIView(APIView):
 
     permission_classes = (IsAuthenticated,)
 
-    def get_task_object(self, pk):
+    def get_task_object(
+        self, pk, for_update=False, include_archived=False, fields=None
+    ):
         """
         Get the task object based on the provided pk.
 
         Parameters:
         - pk: Primary key of the task.
+        - for_update: Lock the task writes, then the row, until the end of
+          the transaction.
+        - include_archived: Fall back to the archived tasks.
+        - fields: Only load these fields (plus the ones ETags need).
 
         Returns:
-        - Task object.
+        - Task (or TaskArchive) object.
 
         Raises:
         - Http404: Task does not exist.
         """
+        tasks = Task.objects.all()
+        if for_update:
+            lock_task_writes(tasks.db)
+            tasks = tasks.select_for_update()
+        archived_tasks = TaskArchive.objects.all()
+        if fields is not None:
+            tasks = tasks.only(*fields, "updated_at")
+            archived_tasks = archived_tasks.only(*fields, "updated_at")
         try:
-            return Task.objects.get(pk=pk)
+            return tasks.get(pk=pk)
         except Task.DoesNotExist:
-            raise Http404
+            pass
+        if include_archived:
+            try:
+                return archived_tasks.get(pk=pk)
+            except TaskArchive.DoesNotExist:
+                pass
+        raise Http404
 
+    @swagger_auto_schema(manual_parameters=FIELDS_PARAMETERS)
     def get(self, request, pk, format=None):
         """
-        Retrieve a specific task.
+        Retrieve a specific task, from the response cache when possible.
+
+        Archived tasks are retrieved as well, but cannot be updated or
+        deleted. ``?fields=`` / ``?exclude=`` restrict the returned fields.
 
         Parameters:
         - request: The request object.
         - pk: Primary key of the task.
+        - fields: Comma-separated fields to return.
+        - exclude: Comma-separated fields to leave out.
 
         Returns:
         - 200: Successful retrieval of the task.
+        - 304: The task matches If-None-Match / If-Modified-Since.
+        - 400: Unknown fields.
         - 500: Internal server error occurred.
         """
-        task = self.get_task_object(pk=pk)
+        fields = get_sparse_fields(request.query_params)
+        cache_key = task_cache.make_key(request, "detail")
+        cached = task_cache.get(cache_key)
+        cache_status = CACHE_HIT
+        if cached is None:
+            cache_status = CACHE_MISS
+            task = self.get_task_object(pk=pk, include_archived=True, fields=fields)
+            cached = {
+                "etag": get_fields_etag(get_task_etag(task), fields),
+                "last_modified": get_task_last_modified(task),
+                "data": None,
+            }
+
+        not_modified = evaluate_preconditions(
+            request, cached["etag"], cached["last_modified"]
+        )
+        if not_modified is not None:
+            return not_modified
+
         try:
-            serializer = TaskSerializer(task)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            if cached["data"] is None:
+                cached["data"] = TaskSerializer(task, fields=fields).data
+                task_cache.set(cache_key, cached)
+            return Response(
+                cached["data"],
+                status=status.HTTP_200_OK,
+                headers={
+                    **cache_status,
+                    **get_validator_headers(cached["etag"], cached["last_modified"]),
+                },
+            )
         except Exception as e:
             logger.error(
-                f"Something went wrong during GET method of {str(self.__class__.__name__)}: {str(e)}"
+                "Something went wrong during GET method of %s: %s",
+                self.__class__.__name__,
+                e,
             )
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -147,6 +937,9 @@ class TaskDetailAPIView(APIView):
         """
         Update a specific task.
 
+        Send the task's ETag in If-Match to update it only if nobody changed
+        it since it was read.
+
         Parameters:
         - request: The request object containing updated task data.
         - pk: Primary key of the task.
@@ -154,18 +947,41 @@ class TaskDetailAPIView(APIView):
         Returns:
         - 200: Task updated successfully.
         - 400: Bad request, invalid data provided.
+        - 412: The task no longer matches If-Match / If-Unmodified-Since.
         - 500: Internal server error occurred.
         """
-        task = self.get_task_object(pk=pk)
+        if not has_preconditions(request):
+            return self.update_task(request, self.get_task_object(pk=pk))
+
+        # The validators are checked and the task written with the write
+        # lock held, so nobody can change the task in between.
+        with transaction.atomic():
+            task = self.get_task_object(pk=pk, for_update=True)
+            precondition_failed = evaluate_preconditions(
+                request, get_task_etag(task), get_task_last_modified(task)
+            )
+            if precondition_failed is not None:
+                return precondition_failed
+            return self.update_task(request, task)
+
+    def update_task(self, request, task):
         try:
             serializer = TaskSerializer(task, data=request.data)
             if serializer.is_valid():
                 serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return Response(
+                    serializer.data,
+                    status=status.HTTP_200_OK,
+                    headers=get_validator_headers(
+                        get_task_etag(task), get_task_last_modified(task)
+                    ),
+                )
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(
-                f"Something went wrong during the PUT method of {str(self.__class__.__name__)}: {str(e)}"
+                "Something went wrong during the PUT method of %s: %s",
+                self.__class__.__name__,
+                e,
             )
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -173,20 +989,38 @@ class TaskDetailAPIView(APIView):
         """
         Delete a specific task.
 
+        Send the task's ETag in If-Match to delete it only if nobody changed
+        it since it was read.
+
         Parameters:
         - request: The request object.
         - pk: Primary key of the task.
 
         Returns:
         - 204: Task deleted successfully.
+        - 412: The task no longer matches If-Match / If-Unmodified-Since.
         - 500: Internal server error occurred.
         """
-        task = self.get_task_object(pk=pk)
+        if not has_preconditions(request):
+            return self.delete_task(self.get_task_object(pk=pk))
+
+        with transaction.atomic():
+            task = self.get_task_object(pk=pk, for_update=True)
+            precondition_failed = evaluate_preconditions(
+                request, get_task_etag(task), get_task_last_modified(task)
+            )
+            if precondition_failed is not None:
+                return precondition_failed
+            return self.delete_task(task)
+
+    def delete_task(self, task):
         try:
             task.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
             logger.error(
-                f"Somthing went wrong during the DELETE method of {str(self.__class__.__name__)}: {str(e)}"
+                "Something went wrong during the DELETE method of %s: %s",
+                self.__class__.__name__,
+                e,
             )
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
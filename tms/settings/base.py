@@ -57,6 +57,8 @@ THIRD_PARTIES = [
 INSTALLED_APPS = BASE_APPS + LOCAL_APPS + THIRD_PARTIES
 
 MIDDLEWARE = [
+    "apps.tasks.metrics.MetricsMiddleware",
+    "apps.tasks.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -76,7 +78,7 @@ SWAGGER_SETTINGS = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.tasks.authentication.CachedJWTAuthentication",
     ],
     # 'EXCEPTION_HANDLER': 'apps.tasks.exceptions.system_general_exception_handler',
 }
@@ -107,6 +109,11 @@ WSGI_APPLICATION = "tms.wsgi.application"
 
 DATABASES = {"default": env.db()}
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -126,32 +133,95 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Tasks API
+TASKS_PAGE_SIZE = env.int("TASKS_PAGE_SIZE", default=50)
+TASKS_MAX_PAGE_SIZE = env.int("TASKS_MAX_PAGE_SIZE", default=500)
+TASKS_EXPORT_CHUNK_SIZE = env.int("TASKS_EXPORT_CHUNK_SIZE", default=2000)
+TASKS_BULK_MAX_ITEMS = env.int("TASKS_BULK_MAX_ITEMS", default=10000)
+TASKS_BULK_BATCH_SIZE = env.int("TASKS_BULK_BATCH_SIZE", default=500)
+TASKS_CACHE_ALIAS = env("TASKS_CACHE_ALIAS", default="default")
+TASKS_CACHE_TIMEOUT = env.int("TASKS_CACHE_TIMEOUT", default=300)
+# Threads (and so database connections) handling the task requests under
+# ASGI, through MIDDLEWARE as under WSGI (see apps.tasks.asgi).
+TASKS_ASYNC_WORKERS = env.int("TASKS_ASYNC_WORKERS", default=16)
+# Task event stream: events a stream may fall behind by before resyncing,
+# seconds between heartbeats, and between reads of the writes of other
+# processes.
+TASKS_EVENTS_QUEUE_SIZE = env.int("TASKS_EVENTS_QUEUE_SIZE", default=1000)
+TASKS_EVENTS_HEARTBEAT = env.float("TASKS_EVENTS_HEARTBEAT", default=15.0)
+TASKS_EVENTS_POLL_INTERVAL = env.float("TASKS_EVENTS_POLL_INTERVAL", default=5.0)
+# In-process cache of the users of JWT-authenticated requests.
+TASKS_AUTH_CACHE_SIZE = env.int("TASKS_AUTH_CACHE_SIZE", default=1024)
+TASKS_AUTH_CACHE_TTL = env.int("TASKS_AUTH_CACHE_TTL", default=60)
+# Build request users from the token claims, without a database lookup.
+TASKS_AUTH_TRUST_TOKEN_CLAIMS = env.bool("TASKS_AUTH_TRUST_TOKEN_CLAIMS", default=False)
+# Share of requests sent with a Server-Timing header and logged with timings.
+TASKS_TIMING_SAMPLE_RATE = env.float("TASKS_TIMING_SAMPLE_RATE", default=0.0)
+# Sampled requests slower than this are logged with their slowest queries.
+TASKS_SLOW_REQUEST_MS = env.int("TASKS_SLOW_REQUEST_MS", default=500)
+# Directory of the metrics files shared by the worker processes; empty to
+# keep the metrics in memory, for single-process servers.
+TASKS_METRICS_DIR = env("TASKS_METRICS_DIR", default="")
+# Addresses or networks allowed to read /metrics; the metrics must not be
+# public. Behind a proxy, REMOTE_ADDR is the proxy's address.
+TASKS_METRICS_ALLOWED_IPS = env.list(
+    "TASKS_METRICS_ALLOWED_IPS", default=["127.0.0.1", "::1"]
+)
+
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
 }
 
 
+# Loggers only queue their records; a background thread formats them as
+# JSON and writes them to the console and the file.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "apps.tasks.logs.JSONFormatter",
+        },
+    },
+    "filters": {
+        "rate_limit": {
+            "()": "apps.tasks.logs.RateLimitFilter",
+            "rate": env.int("LOGS_RATE_LIMIT", default=10),
+            "per": env.int("LOGS_RATE_LIMIT_PERIOD", default=60),
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
+            "formatter": "json",
         },
         "file": {
             "class": "logging.FileHandler",
             "filename": env("LOGS_FILE_NAME"),
+            "formatter": "json",
+        },
+        "queue": {
+            "()": "apps.tasks.logs.QueueListenerHandler",
+            "handlers": ["console", "file"],
+            "maxsize": env.int("LOGS_QUEUE_SIZE", default=10000),
+            "filters": ["rate_limit"],
         },
     },
     "root": {
-        "handlers": ["console", "file"],
+        "handlers": ["queue"],
         "level": "ERROR",
     },
     "loggers": {
         "": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "ERROR",
         },
+        "apps.tasks.timing": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -5,6 +5,8 @@ from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework_simplejwt import views as jwt_views
 
+from apps.tasks.metrics import metrics_view
+
 # Create a schema view for API documentation
 schema_view = get_schema_view(
     openapi.Info(
@@ -32,6 +34,9 @@ urlpatterns = [
         "api/token/refresh/", jwt_views.TokenRefreshView.as_view(), name="token_refresh"
     ),
     
+    # Prometheus metrics
+    path("metrics", metrics_view, name="metrics"),
+
     # Swagger API documentation URLs
     re_path(
         r"^swagger(?P<format>\.json|\.yaml)$",